@@ -0,0 +1,270 @@
+"""
+Agregações de minutos usadas pelas abas do dashboard.
+
+O cubo de minutos é montado uma única vez no carregamento, no grão
+(Campeonato, Ano, Clube Revelador, país revelador, Clube Atual, país atual).
+Filtros globais e agregações das abas são respondidos fazendo rollup do
+cubo, cujo tamanho depende do número de grupos e não do número de linhas
+jogador-temporada.
+"""
+
+import pandas as pd
+
+
+DIMENSOES_CUBO = [
+    "Campeonato",
+    "Ano",
+    "Clube Revelador",
+    "pais_clube_revelador",
+    "Clube Atual",
+    "pais_clube_atual",
+]
+
+
+# =========================================================
+# CUBO DE MINUTOS
+# =========================================================
+def construir_cubo(df_all: pd.DataFrame) -> pd.DataFrame:
+    """
+    Soma os minutos no grão DIMENSOES_CUBO. Chaves nulas (ex.: país não
+    encontrado) são mantidas para que os filtros "(Todos)" continuem
+    enxergando essas linhas.
+    """
+    cubo = (
+        df_all.groupby(DIMENSOES_CUBO, dropna=False, observed=True)
+        .agg(Minutos=("Minutos", "sum"), Registros=("Minutos", "size"))
+        .reset_index()
+    )
+    # Soma em 64 bits: os minutos podem vir em int32 (modo compacto)
+    cubo["Minutos"] = cubo["Minutos"].astype("int64")
+    return cubo
+
+
+def atualizar_cubo(cubo: pd.DataFrame, df_novas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Soma ao cubo existente as linhas novas de df_all, agregando primeiro
+    só o delta e depois reagrupando no nível do cubo (custo proporcional
+    ao número de grupos, não ao histórico de linhas).
+    """
+    cubo_novas = construir_cubo(df_novas)
+    cubo = (
+        pd.concat([cubo, cubo_novas], ignore_index=True)
+        .groupby(DIMENSOES_CUBO, dropna=False, observed=True)[["Minutos", "Registros"]]
+        .sum()
+        .reset_index()
+    )
+    return cubo
+
+
+def rollup(cubo: pd.DataFrame, por) -> pd.DataFrame:
+    """
+    Agrega o cubo (já filtrado) nas dimensões `por`, devolvendo
+    `por` + Minutos. Grupos com chave nula são descartados, como no
+    groupby padrão sobre as linhas originais.
+    """
+    return (
+        cubo.groupby(por, observed=True)["Minutos"]
+        .sum()
+        .reset_index()
+    )
+
+
+# =========================================================
+# RANKINGS DE CLUBES REVELADORES
+# =========================================================
+def ranking_clubes_reveladores(cubo: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ranking de clubes reveladores por minutos para todos os
+    (Campeonato, Ano) de uma vez, com:
+    - Posição: posição no ano (empates resolvidos pelo nome do clube)
+    - Pos_ant: posição no ano anterior disponível do mesmo campeonato
+    - Δ Posição: Pos_ant - Posição (positivo = subiu)
+    - Clube Revelador (País): rótulo para exibição
+    """
+    chave = ["Campeonato", "Ano"]
+
+    ranking = rollup(cubo, chave + ["Clube Revelador"])
+    ranking = ranking.sort_values(
+        chave + ["Minutos", "Clube Revelador"],
+        ascending=[True, True, False, True],
+        kind="stable"
+    ).reset_index(drop=True)
+    ranking["Posição"] = (ranking.groupby(chave, observed=True).cumcount() + 1).astype("Int64")
+
+    # Ano anterior cronológico de cada campeonato (entre os anos presentes)
+    anos = ranking[chave].drop_duplicates()
+    anos["Ano_ant"] = anos.groupby("Campeonato", observed=True)["Ano"].shift()
+    ranking = ranking.merge(anos, on=chave, how="left")
+
+    anterior = ranking[chave + ["Clube Revelador", "Posição"]].rename(
+        columns={"Ano": "Ano_ant", "Posição": "Pos_ant"}
+    )
+    ranking = ranking.merge(anterior, on=["Campeonato", "Ano_ant", "Clube Revelador"], how="left")
+    ranking["Δ Posição"] = (ranking["Pos_ant"] - ranking["Posição"]).astype("Int64")
+
+    # País do clube e rótulo "Clube (País)"
+    club_pais = cubo[["Campeonato", "Clube Revelador", "pais_clube_revelador"]].drop_duplicates()
+    ranking = ranking.merge(club_pais, on=["Campeonato", "Clube Revelador"], how="left")
+
+    nome = ranking["Clube Revelador"].astype(str)
+    pais = ranking["pais_clube_revelador"]
+    ranking["Clube Revelador (País)"] = nome.where(
+        pais.isna(), nome + " (" + pais.astype(str) + ")"
+    )
+
+    return ranking.drop(columns=["Ano_ant"])
+
+
+def ranking_por_campeonato(cubo: pd.DataFrame) -> dict:
+    """
+    Separa o resultado de `ranking_clubes_reveladores` em um dicionário
+    campeonato -> ranking, para consulta direta por campeonato.
+    """
+    ranking = ranking_clubes_reveladores(cubo)
+    return {
+        camp: df.reset_index(drop=True)
+        for camp, df in ranking.groupby("Campeonato", observed=True)
+    }
+
+
+def posicoes_do_clube(rankings: dict, clube: str) -> pd.DataFrame:
+    """
+    Posição de um clube revelador em cada (Campeonato, Ano) dos rankings
+    de `ranking_por_campeonato`, com medalha para o pódio, ordenada do ano
+    mais recente para o mais antigo.
+    """
+    colunas = ["Campeonato", "Ano", "Posição"]
+    partes = [df.loc[df["Clube Revelador"] == clube, colunas] for df in rankings.values()]
+    if not partes:
+        return pd.DataFrame(columns=colunas)
+    df_pos = pd.concat(partes, ignore_index=True)
+
+    pos = df_pos["Posição"].astype(int)
+    medalha = pos.map({1: "🥇 ", 2: "🥈 ", 3: "🥉 "}).fillna("")
+    df_pos["Posição"] = medalha + pos.astype(str)
+    df_pos["Campeonato"] = df_pos["Campeonato"].astype(str)
+
+    return df_pos.sort_values(["Ano", "Campeonato"], ascending=[False, True]).reset_index(drop=True)
+
+
+# =========================================================
+# TOP K CONSOLIDADO POR CAMPEONATO / ANO
+# =========================================================
+def _formatar_milhar(valores: pd.Series) -> pd.Series:
+    """Formata inteiros com ponto como separador de milhar (ex.: 12.345)."""
+    return valores.astype("int64").astype(str).str.replace(r"\B(?=(\d{3})+(?!\d))", ".", regex=True)
+
+
+def top_k_consolidado(cubo: pd.DataFrame, k: int = 5) -> dict:
+    """
+    Monta, em uma única passada agrupada, as tabelas consolidadas dos
+    k maiores clubes reveladores por (Campeonato, Ano).
+
+    Retorna campeonato -> DataFrame com as colunas
+    Ano, 🥇 Top 1, 🥈 Top 2, 🥉 Top 3, Top 4.., Top k e "% Top k / Total",
+    com os anos do mais recente para o mais antigo.
+    """
+    chave = ["Campeonato", "Ano"]
+    nomes_top = ["🥇 Top 1", "🥈 Top 2", "🥉 Top 3"] + [f"Top {i}" for i in range(4, k + 1)]
+    nomes_top = nomes_top[:k]
+    col_perc = f"% Top {k} / Total"
+
+    camp_ano = rollup(cubo, chave + ["Clube Revelador"])
+    if camp_ano.empty:
+        return {}
+
+    camp_ano = camp_ano.sort_values(
+        chave + ["Minutos", "Clube Revelador"],
+        ascending=[True, True, False, True],
+        kind="stable"
+    )
+    camp_ano["pos"] = camp_ano.groupby(chave, observed=True).cumcount()
+
+    total = camp_ano.groupby(chave, observed=True)["Minutos"].sum()
+
+    top = camp_ano[camp_ano["pos"] < k].copy()
+    top["celula"] = (
+        top["Clube Revelador"].astype(str) + " (" + _formatar_milhar(top["Minutos"]) + ")"
+    )
+
+    tabela = top.pivot(index=chave, columns="pos", values="celula")
+    tabela = tabela.reindex(columns=range(k)).fillna("—")
+    tabela.columns = nomes_top
+
+    soma_top = top.groupby(chave, observed=True)["Minutos"].sum()
+    perc = (soma_top / total.where(total > 0) * 100).fillna(0).reindex(tabela.index)
+    tabela[col_perc] = perc.round(1).astype(str) + "%"
+
+    tabela = tabela.reset_index()
+    tabela["Ano"] = tabela["Ano"].astype(int)
+    tabela["Campeonato"] = tabela["Campeonato"].astype(str)
+    tabela = tabela.sort_values(["Campeonato", "Ano"], ascending=[True, False])
+
+    return {
+        camp: df.drop(columns="Campeonato").reset_index(drop=True)
+        for camp, df in tabela.groupby("Campeonato", sort=True)
+    }
+
+
+# =========================================================
+# PERFIS DE CLUBES REVELADORES
+# =========================================================
+def perfis_clubes_reveladores(cubo: pd.DataFrame, df_all: pd.DataFrame, ranking: pd.DataFrame, clubes,
+                              detalhar: bool = True) -> dict:
+    """
+    Perfis de vários clubes reveladores em uma passada agrupada por tabela:
+    - resumo: país, minutos totais, jogadores formados, clubes onde atuaram
+    - minutos_por_ano: minutos dos formados por ano
+    - posicoes: posição em cada (Campeonato, Ano) de `ranking`
+      (saída de `ranking_clubes_reveladores`; None se ranking for None)
+    - clubes_atuais: minutos somados por clube onde atuaram
+    - jogadores_formados: minutos por jogador, ano, campeonato e clube atual
+      (só com `detalhar`; sem ela, df_all só precisa de "Clube Revelador"
+      e "ID Jogador")
+    Todas as tabelas têm a coluna "Clube Revelador".
+    """
+    clubes = list(clubes)
+    cubo_c = cubo[cubo["Clube Revelador"].isin(clubes)]
+    df_c = df_all[df_all["Clube Revelador"].isin(clubes)]
+
+    resumo = (
+        cubo_c.groupby("Clube Revelador", observed=True)
+        .agg(
+            pais_clube_revelador=("pais_clube_revelador", "first"),
+            Minutos=("Minutos", "sum"),
+            clubes_onde_atuaram=("Clube Atual", "nunique"),
+        )
+        .join(df_c.groupby("Clube Revelador", observed=True)["ID Jogador"].nunique().rename("jogadores_formados"))
+        .reset_index()
+    )
+
+    minutos_por_ano = rollup(cubo_c, ["Clube Revelador", "Ano"])
+
+    posicoes = None
+    if ranking is not None:
+        posicoes = ranking.loc[
+            ranking["Clube Revelador"].isin(clubes),
+            ["Clube Revelador", "Campeonato", "Ano", "Posição", "Minutos", "Δ Posição"]
+        ].sort_values(["Clube Revelador", "Ano", "Campeonato"], ascending=[True, False, True])
+
+    clubes_atuais = (
+        rollup(cubo_c, ["Clube Revelador", "Clube Atual"])
+        .sort_values(["Clube Revelador", "Minutos"], ascending=[True, False])
+    )
+
+    jogadores_formados = None
+    if detalhar:
+        jogadores_formados = (
+            df_c.groupby(["Clube Revelador", "Nome Jogador", "Ano", "Campeonato", "Clube Atual"], observed=True)["Minutos"]
+            .sum()
+            .reset_index()
+            .sort_values(["Clube Revelador", "Ano", "Minutos"], ascending=[True, True, False])
+        )
+
+    return {
+        "resumo": resumo,
+        "minutos_por_ano": minutos_por_ano,
+        "posicoes": posicoes,
+        "clubes_atuais": clubes_atuais,
+        "jogadores_formados": jogadores_formados,
+    }
@@ -1,6 +1,19 @@
+import os
+from typing import NamedTuple
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+
+import banco
+import dados
+import instrumentacao
+from armazem import Armazem, estimar_bytes
+from consultas import Consultas
+from instrumentacao import evento, instrumentar_visao, secao
+from paginacao import tabela_paginada
 
 
 # =========================================================
@@ -13,6 +26,9 @@ st.set_page_config(
 
 st.title("📊 Dashboard de Jogadores, Clubes e Minutagem")
 
+# Tempos por seção (opcional; ver instrumentacao.py)
+instrumentacao.iniciar_execucao()
+
 
 # =========================================================
 # FUNÇÃO: FONTE DOS DADOS
@@ -26,102 +42,93 @@ def fonte_dados():
 # =========================================================
 # FUNÇÃO: CARREGAMENTO E COMBINAÇÃO DE DADOS
 # =========================================================
-@st.cache_data
-def carregar_dados(path_jogadores: str, path_clubes: str, path_minutos: str):
+@st.cache_resource(max_entries=4)
+def carregar_dados(path_jogadores: str, path_clubes: str, path_minutos: str, versao: str,
+                   compacto: bool = True):
     """
-    Carrega as três bases CSV, renomeia colunas, junta tudo e retorna:
+    Carrega as três bases (via snapshot em disco quando disponível) e retorna:
     - df_all: dataset final combinando tudo
     - df_jogadores_clubes: tabela com jogador + clube revelador + país
     - df_clubes: tabela de clubes originais
-    """
+    - cubo: minutos pré-agregados por campeonato/ano/clubes/países
+    - memoria: uso de memória por coluna antes/depois do modo compacto
 
-    # Lê os CSVs
-    df_jog = pd.read_csv(path_jogadores)
-    df_clu = pd.read_csv(path_clubes)
-    df_min = pd.read_csv(path_minutos)
-
-    # Remove colunas de índice que possam ter sido salvas
-    df_jog = df_jog.loc[:, ~df_jog.columns.str.contains(r"^Unnamed")]
-    df_clu = df_clu.loc[:, ~df_clu.columns.str.contains(r"^Unnamed")]
-    df_min = df_min.loc[:, ~df_min.columns.str.contains(r"^Unnamed")]
-
-    # Renomeia colunas para uso interno
-    j = df_jog.rename(columns={
-        "Jogador": "nome_jogador",
-        "ID": "id_jogador",
-        "Clube Revelador": "clube_revelador"
-    })
-
-    c = df_clu.rename(columns={
-        "Clube": "clube",
-        "País": "pais"
-    })
-
-    m = df_min.rename(columns={
-        "Campeonato": "campeonato",
-        "Ano": "ano",
-        "Jogador": "nome_jogador",
-        "ID": "id_jogador",
-        "Clube": "clube_atual",
-        "Minutos": "minutos"
-    })
-
-    # Tipos
-    j["id_jogador"] = j["id_jogador"].astype(str)
-    m["id_jogador"] = m["id_jogador"].astype(str)
-    m["minutos"] = pd.to_numeric(m["minutos"], errors="coerce").fillna(0)
-
-    # Junta jogador + clube revelador + país
-    j_clubes = j.merge(
-        c,
-        how="left",
-        left_on="clube_revelador",
-        right_on="clube"
-    )
+    `versao` é a assinatura dos CSVs: entra na chave do cache para que
+    uma alteração em qualquer arquivo seja percebida sem reiniciar o app.
 
-    # Junta minutagem + dados do jogador
-    df_all = m.merge(
-        j_clubes,
-        how="left",
-        on="id_jogador",
-        suffixes=("", "_j")
+    Os DataFrames ficam em cache_resource, compartilhados por todas as
+    sessões sem cópia: devem ser tratados como somente leitura.
+    """
+    evento("cache carregar_dados", "miss")
+    return dados.carregar_dados(
+        path_jogadores, path_clubes, path_minutos, versao=versao, compacto=compacto
     )
 
-    # Junta país do clube atual
-    c2 = c.rename(columns={
-        "clube": "clube_atual_join",
-        "pais": "pais_clube_atual"
-    })
-
-    df_all = df_all.merge(
-        c2,
-        how="left",
-        left_on="clube_atual",
-        right_on="clube_atual_join"
-    )
 
-    # Renomeia finais
-    df_all = df_all.rename(columns={
-        "campeonato": "Campeonato",
-        "ano": "Ano",
-        "nome_jogador": "Nome Jogador",
-        "id_jogador": "ID Jogador",
-        "clube_atual": "Clube Atual",
-        "minutos": "Minutos",
-        "clube_revelador": "Clube Revelador",
-        "pais": "pais_clube_revelador"
-    })
+def _registrar_consulta(nome: str, acerto: bool):
+    evento(f"consulta {nome}", "hit" if acerto else "miss")
+
+
+LIMITE_CONSULTAS_MB = int(os.environ.get("DASH_CACHE_CONSULTAS_MB", "256"))
+AQUECER = os.environ.get("DASH_AQUECER", "1") == "1"
+
+
+@st.cache_resource
+def armazem_resultados() -> Armazem:
+    """
+    Resultados das consultas de todas as camadas (e versões dos dados),
+    compartilhados por todas as sessões do processo e limitados a
+    LIMITE_CONSULTAS_MB. Versões antigas saem pelo LRU.
+    """
+    return Armazem(LIMITE_CONSULTAS_MB * 1024 ** 2, estimar_bytes)
+
 
-    # Remove colunas auxiliares
-    for col in ["nome_jogador_j", "clube", "clube_atual_join"]:
-        if col in df_all.columns:
-            df_all = df_all.drop(columns=[col])
+def _preparar(consultas):
+    """Dispara o aquecimento da abertura do dashboard (filtros padrão)."""
+    if AQUECER:
+        consultas.aquecer_em_segundo_plano(consultas.spec([], [], [], []))
+    return consultas
+
+
+@st.cache_resource(max_entries=4)
+def camada_consultas(versao: str, compacto: bool, _df_all: pd.DataFrame, _cubo: pd.DataFrame):
+    """
+    Camada de consultas (índices de filtro, índice de jogadores e resultados
+    memoizados), montada uma vez por versão dos dados e compartilhada entre
+    sessões. As visões só acessam os dados por ela.
+    """
+    evento("cache camada_consultas", "miss")
+    return _preparar(Consultas(
+        f"{versao}:{compacto}", _df_all, _cubo,
+        armazem=armazem_resultados(), ao_consultar=_registrar_consulta
+    ))
+
+
+@st.cache_resource(max_entries=4)
+def camada_banco(path_jogadores: str, path_clubes: str, path_minutos: str, versao: str):
+    """
+    Camada de consultas sobre o banco SQLite em disco (carregado dos CSVs
+    só quando a versão muda). Nenhum DataFrame completo fica em memória:
+    os filtros e agrupamentos rodam no banco.
+    """
+    evento("cache camada_banco", "miss")
+    path_banco = banco.construir_banco(path_jogadores, path_clubes, path_minutos, versao=versao)
+    return _preparar(banco.ConsultasSQL(
+        path_banco, f"{versao}:sqlite", armazem=armazem_resultados(), ao_consultar=_registrar_consulta
+    ))
 
-    # Converte Ano para inteiro (sem casas decimais)
-    df_all["Ano"] = pd.to_numeric(df_all["Ano"], errors="coerce")
-    df_all["Ano"] = df_all["Ano"].round(0).astype("Int64")
 
-    return df_all, j_clubes, c
+LIMITE_FIGURAS_MB = int(os.environ.get("DASH_CACHE_FIGURAS_MB", "32"))
+
+
+@st.cache_resource
+def cache_figuras() -> Armazem:
+    """
+    Figuras Plotly já montadas, compartilhadas entre sessões e limitadas a
+    LIMITE_FIGURAS_MB (tamanho = JSON da figura). A chave inclui a versão
+    dos dados, então nada precisa ser invalidado.
+    """
+    return Armazem(LIMITE_FIGURAS_MB * 1024 ** 2, tamanho=lambda fig: len(fig.to_json()))
 
 
 # =========================================================
@@ -129,271 +136,373 @@ def carregar_dados(path_jogadores: str, path_clubes: str, path_minutos: str):
 # =========================================================
 st.sidebar.header("⚙️ Configuração dos arquivos")
 
+# Diretório padrão dos CSVs (ex.: bases sintéticas do teste de carga)
+DIR_DADOS = os.environ.get("DASH_DIR_DADOS", "")
+
 path_jogadores = st.sidebar.text_input(
     "CSV de jogadores",
-    "jogadores.csv"
+    os.path.join(DIR_DADOS, "jogadores.csv")
 )
 path_clubes = st.sidebar.text_input(
     "CSV de clubes",
-    "clubes.csv"
+    os.path.join(DIR_DADOS, "clubes.csv")
 )
 path_minutos = st.sidebar.text_input(
     "CSV de minutagem",
-    "minutos.csv"
+    os.path.join(DIR_DADOS, "minutos.csv")
+)
+ARMAZENAMENTOS = ["Memória", "Banco SQLite"]
+armazenamento = st.sidebar.radio(
+    "Armazenamento",
+    ARMAZENAMENTOS,
+    index=1 if os.environ.get("DASH_BACKEND") == "sqlite" else 0,
+    horizontal=True,
+    help="Banco SQLite: dados em disco, consultas em SQL (bases maiores que a RAM)."
+)
+modo_banco = armazenamento == "Banco SQLite"
+modo_compacto = st.sidebar.checkbox(
+    "Modo compacto (categorias e inteiros)",
+    value=True,
+    disabled=modo_banco,
+    help="Reduz a memória por sessão e acelera filtros e agrupamentos."
 )
 
 try:
-    df_all, df_jogadores_clubes, df_clubes = carregar_dados(
-        path_jogadores, path_clubes, path_minutos
-    )
+    with secao("carregamento"):
+        versao_dados = dados.assinatura_arquivos(path_jogadores, path_clubes, path_minutos)
+        if modo_banco:
+            evento("cache camada_banco", "hit")
+            consultas = camada_banco(path_jogadores, path_clubes, path_minutos, versao_dados)
+        else:
+            evento("cache carregar_dados", "hit")
+            df_all, df_jogadores_clubes, df_clubes, cubo, memoria = carregar_dados(
+                path_jogadores, path_clubes, path_minutos, versao_dados, modo_compacto
+            )
+            evento("cache camada_consultas", "hit")
+            consultas = camada_consultas(versao_dados, modo_compacto, df_all, cubo)
 except Exception as e:
     st.error(f"Erro ao carregar dados: {e}")
     st.stop()
 
+with st.sidebar.expander("💾 Memória do dataset"):
+    if modo_banco:
+        tamanho = os.path.getsize(consultas.path_banco) / 1024 ** 2
+        st.markdown(f"**Banco:** `{consultas.path_banco}` — {tamanho:.1f} MB em disco")
+    else:
+        mem_antes = memoria["Antes (bytes)"].sum() / 1024 ** 2
+        mem_depois = memoria["Depois (bytes)"].sum() / 1024 ** 2
+        st.markdown(f"**Antes:** {mem_antes:.1f} MB — **Depois:** {mem_depois:.1f} MB")
+        st.dataframe(memoria, use_container_width=True, hide_index=True)
+
+    for rotulo, armazem in [("resultados", armazem_resultados()), ("figuras", cache_figuras())]:
+        est = armazem.estatisticas()
+        st.caption(
+            f"Cache de {rotulo}: {est['itens']} itens, "
+            f"{est['bytes'] / 1024 ** 2:.1f} de {est['limite_bytes'] / 1024 ** 2:.0f} MB — "
+            f"acertos {est['acertos']}, falhas {est['falhas']}, descartes {est['descartes']}"
+        )
+
 
 # =========================================================
 # FILTROS LATERAIS
 # =========================================================
 st.sidebar.header("🔍 Filtros Globais")
 
-anos_disp = sorted(df_all["Ano"].dropna().unique())
-camp_disp = sorted(df_all["Campeonato"].dropna().unique())
-pais_rev_disp = sorted(df_all["pais_clube_revelador"].dropna().unique())
-pais_at_disp = sorted(df_all["pais_clube_atual"].dropna().unique())
+# Opções a partir dos dados completos (spec sem restrições)
+SEM_FILTRO = consultas.spec([], [], [], [])
+anos_disp = consultas.opcoes(SEM_FILTRO, "Ano")
+camp_disp = consultas.opcoes(SEM_FILTRO, "Campeonato")
+pais_rev_disp = consultas.opcoes(SEM_FILTRO, "pais_clube_revelador")
+pais_at_disp = consultas.opcoes(SEM_FILTRO, "pais_clube_atual")
 
 anos_sel = st.sidebar.multiselect("Ano", anos_disp, default=anos_disp)
 camp_sel = st.sidebar.multiselect("Campeonato", camp_disp, default=camp_disp)
 pais_rev_sel = st.sidebar.multiselect("País (clube revelador)", ["(Todos)"] + pais_rev_disp, default="(Todos)")
 pais_at_sel = st.sidebar.multiselect("País (clube atual)", ["(Todos)"] + pais_at_disp, default="(Todos)")
 
-df_filtrado = df_all.copy()
-if anos_sel:
-    df_filtrado = df_filtrado[df_filtrado["Ano"].isin(anos_sel)]
-if camp_sel:
-    df_filtrado = df_filtrado[df_filtrado["Campeonato"].isin(camp_sel)]
-if pais_rev_sel and "(Todos)" not in pais_rev_sel:
-    df_filtrado = df_filtrado[df_filtrado["pais_clube_revelador"].isin(pais_rev_sel)]
-if pais_at_sel and "(Todos)" not in pais_at_sel:
-    df_filtrado = df_filtrado[df_filtrado["pais_clube_atual"].isin(pais_at_sel)]
+# Seleção normalizada em uma tupla hashable: é a chave de todas as consultas
+with secao("filtros"):
+    spec_filtros = consultas.spec(anos_sel, camp_sel, pais_rev_sel, pais_at_sel)
 
 
-# =========================================================
-# ABAS PRINCIPAIS
-# =========================================================
-tab_geral, tab_jogadores, tab_clubes_rev, tab_campeonatos = st.tabs(
-    ["Visão Geral", "Jogadores", "Clubes reveladores", "Campeonatos"]
-)
+class Contexto(NamedTuple):
+    """Camada de consultas e seleção de filtros repassadas às visões."""
+    consultas: Consultas  # ou banco.ConsultasSQL (mesma interface)
+    spec_filtros: tuple
 
 
-# =========================================================
-# 1) VISÃO GERAL
-# =========================================================
-with tab_geral:
-    fonte_dados()
-    st.subheader("📈 Visão Geral das Bases (com filtros aplicados)")
+ctx = Contexto(consultas=consultas, spec_filtros=spec_filtros)
 
-    col1, col2, col3, col4, col5 = st.columns(5)
-    col1.metric("Jogadores únicos", df_filtrado["ID Jogador"].nunique())
-    col2.metric("Clubes atuais", df_filtrado["Clube Atual"].nunique())
-    col3.metric("Clubes reveladores", df_filtrado["Clube Revelador"].nunique())
-    col4.metric("Campeonatos", df_filtrado["Campeonato"].nunique())
-    col5.metric("Minutos totais", int(df_filtrado["Minutos"].sum()))
 
-    st.markdown("### 🏆 Top clubes reveladores por minutos dos seus formados")
+# =========================================================
+# GRÁFICOS
+# =========================================================
+def figura(ctx: Contexto, tipo: str, entidade, construir):
+    """
+    Figura `tipo` da `entidade` (jogador, clube...) para os filtros e a
+    versão dos dados de ctx. `construir()` só roda se ela não estiver no
+    cache de figuras.
+    """
+    chave = (tipo, entidade, ctx.spec_filtros, ctx.consultas.versao)
+    fig, acerto = cache_figuras().obter(chave, construir)
+    evento(f"figura {tipo}", "hit" if acerto else "miss")
+    return fig
 
-    top_rev = (
-        df_filtrado.groupby("Clube Revelador")["Minutos"]
-        .sum()
-        .reset_index()
-        .sort_values("Minutos", ascending=False)
-        .head(15)
-    )
 
-    fig_top = px.bar(
+def grafico_top_clubes(top_rev: pd.DataFrame):
+    fig = px.bar(
         top_rev,
         x="Minutos",
         y="Clube Revelador",
         orientation="h",
         title="Top 15 clubes reveladores"
     )
-    fig_top.update_layout(yaxis={'categoryorder': 'total ascending'})
-    st.plotly_chart(fig_top, use_container_width=True)
+    fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+    return fig
 
-    # ---------------------------------------------------------
-    # NOVA SEÇÃO — TOP 5 CONSOLIDADO POR CAMPEONATO / ANO
-    # ---------------------------------------------------------
-    st.markdown("### 🏅 Top 5 clubes reveladores por Campeonato/Ano (Tabela Consolidada)")
 
-    camp_ano = (
-        df_filtrado
-        .groupby(["Campeonato", "Ano", "Clube Revelador"])["Minutos"]
-        .sum()
-        .reset_index()
+def grafico_minutos_por_ano(por_ano: pd.DataFrame, titulo: str):
+    fig = px.bar(
+        por_ano,
+        x="Ano_str",
+        y="Minutos",
+        title=titulo,
+        labels={"Ano_str": "Ano"}
     )
+    fig.update_xaxes(type="category")  # força eixo categórico
+    return fig
+
+
+def grafico_trajetorias(tabela: pd.DataFrame, y: str, titulo: str):
+    """Uma linha por clube revelador ao longo dos anos; posições com o 1º no topo."""
+    fig = px.line(
+        tabela.astype({"Posição": "float64"}) if "Posição" in tabela else tabela,
+        x="Ano_str",
+        y=y,
+        color="Clube Revelador",
+        markers=True,
+        title=titulo,
+        labels={"Ano_str": "Ano"}
+    )
+    fig.update_xaxes(type="category")
+    if y == "Posição":
+        fig.update_yaxes(autorange="reversed")
+    return fig
+
+
+def grafico_sankey(fluxos: pd.DataFrame, titulo: str):
+    """Sankey dos fluxos: clubes reveladores à esquerda, clubes atuais à direita."""
+    origens = pd.Index(fluxos["Clube Revelador"].unique())
+    destinos = pd.Index(fluxos["Clube Atual"].unique())
+    fig = go.Figure(go.Sankey(
+        node={"label": list(origens) + list(destinos), "pad": 12},
+        link={
+            "source": origens.get_indexer(fluxos["Clube Revelador"]),
+            "target": len(origens) + destinos.get_indexer(fluxos["Clube Atual"]),
+            "value": fluxos["Minutos"],
+        },
+    ))
+    fig.update_layout(title=titulo)
+    return fig
+
+
+def grafico_fluxos_paises(matriz: pd.DataFrame, titulo: str):
+    fig = px.imshow(
+        matriz,
+        aspect="auto",
+        color_continuous_scale="Blues",
+        title=titulo,
+        labels={"x": "País do clube atual", "y": "País do clube revelador", "color": "Minutos"}
+    )
+    return fig
 
-    if camp_ano.empty:
-        st.info("Nenhum dado disponível para esta seção com os filtros atuais.")
-    else:
-        # Para cada campeonato, montar uma tabela única
-        for camp in sorted(camp_ano["Campeonato"].unique()):
-            st.markdown(f"## 📘 {camp}")
 
-            df_c = camp_ano[camp_ano["Campeonato"] == camp].copy()
+# =========================================================
+# 1) VISÃO GERAL
+# =========================================================
+@st.fragment
+@instrumentar_visao("Visão Geral")
+def visao_geral(ctx: Contexto):
+    """Visão Geral: métricas, top clubes reveladores e top 5 consolidado."""
+    consultas, spec_filtros = ctx
 
-            anos_camp = sorted(df_c["Ano"].dropna().unique(), reverse=True)
+    fonte_dados()
+    st.subheader("📈 Visão Geral das Bases (com filtros aplicados)")
 
-            tabela_linhas = []
+    with secao("Visão Geral: agregações"):
+        metricas = consultas.metricas_gerais(spec_filtros)
+        top_rev = consultas.top_clubes_reveladores(spec_filtros, n=15)
 
-            for ano in anos_camp:
-                df_ano = df_c[df_c["Ano"] == ano].copy()
-                total_ano = df_ano["Minutos"].sum()
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Jogadores únicos", metricas["jogadores"])
+    col2.metric("Clubes atuais", metricas["clubes_atuais"])
+    col3.metric("Clubes reveladores", metricas["clubes_reveladores"])
+    col4.metric("Campeonatos", metricas["campeonatos"])
+    col5.metric("Minutos totais", metricas["minutos"])
 
-                # Top 5
-                df_top = (
-                    df_ano.sort_values("Minutos", ascending=False)
-                    .head(5)
-                    .reset_index(drop=True)
-                )
+    st.markdown("### 🏆 Top clubes reveladores por minutos dos seus formados")
 
-                # Montar os 5 colunas (clube + minutos)
-                cols_top = []
-                for i in range(5):
-                    if i < len(df_top):
-                        row = df_top.iloc[i]
-                        clube = row["Clube Revelador"]
-                        mins = int(row["Minutos"])
-                        cols_top.append(f"{clube} ({mins:,})".replace(",", "."))
-                    else:
-                        cols_top.append("—")
-
-                perc = df_top["Minutos"].sum() / total_ano * 100 if total_ano > 0 else 0
-                perc_fmt = f"{perc:.1f}%"
-
-                tabela_linhas.append(
-                    [int(ano)] + cols_top + [perc_fmt]
-                )
+    with secao("Visão Geral: gráficos"):
+        fig_top = figura(ctx, "top_clubes", 15, lambda: grafico_top_clubes(top_rev))
+        st.plotly_chart(fig_top, use_container_width=True)
 
-            # Criar tabela final
-            df_final = pd.DataFrame(
-                tabela_linhas,
-                columns=["Ano", "🥇 Top 1", "🥈 Top 2", "🥉 Top 3", "Top 4", "Top 5", "% Top 5 / Total"]
-            )
+    # ---------------------------------------------------------
+    # NOVA SEÇÃO — TOP 5 CONSOLIDADO POR CAMPEONATO / ANO
+    # ---------------------------------------------------------
+    st.markdown("### 🏅 Top 5 clubes reveladores por Campeonato/Ano (Tabela Consolidada)")
 
-            st.dataframe(df_final.reset_index(drop=True), use_container_width=True)
+    with secao("Visão Geral: agregações"):
+        tabelas_top5 = consultas.top_k_consolidado(spec_filtros, k=5)
+
+    if not tabelas_top5:
+        st.info("Nenhum dado disponível para esta seção com os filtros atuais.")
+    else:
+        # Uma tabela única por campeonato
+        for camp, df_final in tabelas_top5.items():
+            st.markdown(f"## 📘 {camp}")
+            with secao("Visão Geral: tabelas"):
+                st.dataframe(df_final, use_container_width=True)
 
 
 # =========================================================
 # 2) VISÃO JOGADORES
 # =========================================================
-with tab_jogadores:
+@st.fragment
+@instrumentar_visao("Jogadores")
+def visao_jogadores(ctx: Contexto):
+    """Visão por jogador, com busca por nome (sem acento) ou ID."""
+    consultas, spec_filtros = ctx
+
     fonte_dados()
     st.subheader("🧑‍💼 Visão por Jogador")
 
-    df_players = (
-        df_filtrado[["Nome Jogador", "ID Jogador"]]
-        .dropna()
-        .drop_duplicates()
-        .sort_values(["Nome Jogador", "ID Jogador"])
+    consulta = st.text_input(
+        "Buscar jogador",
+        placeholder="Nome (com ou sem acento), início de sobrenome ou ID"
     )
 
-    if df_players.empty:
-        st.warning("Nenhum jogador disponível com os filtros atuais.")
-    else:
-        df_players["label"] = df_players["Nome Jogador"] + " (ID " + df_players["ID Jogador"].astype(str) + ")"
-        jogador_label = st.selectbox("Selecione o jogador", df_players["label"])
+    if not consulta.strip():
+        st.info("Digite parte do nome ou o ID do jogador para buscar.")
+        return
 
-        row_sel = df_players[df_players["label"] == jogador_label].iloc[0]
-        nome_sel = row_sel["Nome Jogador"]
-        id_sel = row_sel["ID Jogador"]
+    with secao("Jogadores: busca"):
+        ids_encontrados = consultas.buscar_jogadores(spec_filtros, consulta, limite=20)
+
+    if not ids_encontrados:
+        st.warning("Nenhum jogador encontrado com essa busca e os filtros atuais.")
+    else:
+        id_sel = st.selectbox(
+            "Selecione o jogador",
+            ids_encontrados,
+            format_func=consultas.indice.rotulo
+        )
+        nome_sel = consultas.indice.nomes[id_sel]
 
-        df_j = df_filtrado[df_filtrado["ID Jogador"] == id_sel].copy()
+        with secao("Jogadores: agregações"):
+            resumo = consultas.resumo_jogador(spec_filtros, id_sel)
 
         st.markdown(f"**Jogador:** {nome_sel}")
         st.markdown(f"**ID:** `{id_sel}`")
 
-        if not df_j.empty:
-            clube_rev = df_j["Clube Revelador"].iloc[0]
-            pais_rev = df_j["pais_clube_revelador"].iloc[0]
-            st.markdown(f"**Clube Revelador:** {clube_rev} ({pais_rev})")
+        if resumo is not None:
+            st.markdown(f"**Clube Revelador:** {resumo['clube_revelador']} ({resumo['pais_revelador']})")
 
-            st.metric("Minutos totais (filtro)", int(df_j["Minutos"].sum()))
+            st.metric("Minutos totais (filtro)", resumo["minutos"])
 
             st.markdown("### Minutos por ano")
-            by_ano = (
-                df_j.groupby("Ano")["Minutos"]
-                .sum()
-                .reset_index()
-            )
-            by_ano = by_ano.dropna(subset=["Ano"]).sort_values("Ano")
-
-            # eixo categórico de fato
-            by_ano["Ano_str"] = by_ano["Ano"].astype(int).astype(str)
-
-            fig_j = px.bar(
-                by_ano,
-                x="Ano_str",
-                y="Minutos",
-                title=f"Minutos por ano — {nome_sel}",
-                labels={"Ano_str": "Ano"}
-            )
-            fig_j.update_xaxes(type="category")  # força eixo categórico
-            st.plotly_chart(fig_j, use_container_width=True)
+            with secao("Jogadores: gráficos"):
+                fig_j = figura(
+                    ctx, "minutos_jogador", id_sel,
+                    lambda: grafico_minutos_por_ano(resumo["por_ano"], f"Minutos por ano — {nome_sel}")
+                )
+                st.plotly_chart(fig_j, use_container_width=True)
 
             st.markdown("### Detalhamento")
-            df_det = df_j[["Ano", "Campeonato", "Clube Atual", "Minutos"]] \
-                .sort_values(["Ano", "Campeonato"])
-            st.dataframe(df_det.reset_index(drop=True), use_container_width=True)
+            with secao("Jogadores: tabelas"):
+                st.dataframe(resumo["detalhe"], use_container_width=True)
 
 
 # =========================================================
 # 3) VISÃO CLUBES REVELADORES
 # =========================================================
-with tab_clubes_rev:
+@st.fragment
+@instrumentar_visao("Clubes reveladores")
+def visao_clubes_reveladores(ctx: Contexto):
+    """Visão por clube revelador."""
+    consultas, spec_filtros = ctx
+
     fonte_dados()
     st.subheader("🏟️ Visão por Clube Revelador")
 
     # Filtro por país do clube revelador
-    pais_rev_lst = sorted(df_filtrado["pais_clube_revelador"].dropna().unique())
+    pais_rev_lst = consultas.opcoes(spec_filtros, "pais_clube_revelador")
     pais_rev_filtro = st.selectbox("Filtrar por país do clube revelador", ["(Todos)"] + pais_rev_lst)
 
-    df_cr = df_filtrado.copy()
     if pais_rev_filtro != "(Todos)":
-        df_cr = df_cr[df_cr["pais_clube_revelador"] == pais_rev_filtro]
-
-    clubes_disp = sorted(df_cr["Clube Revelador"].dropna().unique())
+        clubes_disp = consultas.opcoes(spec_filtros, "Clube Revelador", pais_clube_revelador=pais_rev_filtro)
+    else:
+        clubes_disp = consultas.opcoes(spec_filtros, "Clube Revelador")
 
     if not clubes_disp:
         st.warning("Nenhum clube revelador disponível com os filtros atuais.")
+        return
+
+    modo = st.radio("Modo", ["Um clube", "Comparar clubes"], horizontal=True, key="modo_clube")
+    if modo == "Comparar clubes":
+        comparar_clubes_reveladores(ctx, clubes_disp, pais_rev_filtro)
     else:
         clube_sel = st.selectbox("Clube revelador", clubes_disp)
-        df_c = df_cr[df_cr["Clube Revelador"] == clube_sel].copy()
 
-        if df_c.empty:
+        with secao("Clubes reveladores: agregações"):
+            perfil = consultas.perfil_clube(spec_filtros, clube_sel, pais_rev_filtro)
+
+        if perfil is None:
             st.warning("Nenhum registro para esse clube com os filtros atuais.")
         else:
-            pais_clube = df_c["pais_clube_revelador"].iloc[0]
-            st.markdown(f"**País:** {pais_clube}")
+            st.markdown(f"**País:** {perfil['pais']}")
 
             col1, col2, col3 = st.columns(3)
-            col1.metric("Minutos totais", int(df_c["Minutos"].sum()))
-            col2.metric("Jogadores formados", df_c["ID Jogador"].nunique())
-            col3.metric("Clubes onde atuaram", df_c["Clube Atual"].nunique())
+            col1.metric("Minutos totais", perfil["minutos"])
+            col2.metric("Jogadores formados", perfil["jogadores"])
+            col3.metric("Clubes onde atuaram", perfil["clubes_atuais"])
 
             # Gráfico de minutos por ano (sem ano decimal)
             st.markdown("### Minutos ao longo dos anos")
-            by_ano = df_c.groupby("Ano")["Minutos"].sum().reset_index()
-            by_ano = by_ano.dropna(subset=["Ano"]).sort_values("Ano")
-            by_ano["Ano_str"] = by_ano["Ano"].astype(int).astype(str)
-
-            fig_cr = px.bar(
-                by_ano,
-                x="Ano_str",
-                y="Minutos",
-                title=f"Minutos por ano — formados em {clube_sel}",
-                labels={"Ano_str": "Ano"}
-            )
-            fig_cr.update_xaxes(type="category")  # força eixo categórico
-            st.plotly_chart(fig_cr, use_container_width=True)
+            serie = st.radio("Série", ["Por ano", "Janela móvel", "Acumulado"], horizontal=True, key="serie_clube")
+            if serie == "Janela móvel":
+                janela = st.number_input("Temporadas na janela", min_value=2, max_value=20, value=3, step=1)
+            elif serie == "Acumulado":
+                anos_clube = perfil["por_ano"]["Ano"].astype(int).tolist()
+                desde = st.selectbox("Acumulado desde", anos_clube)
+
+            with secao("Clubes reveladores: gráficos"):
+                if serie == "Por ano":
+                    fig_cr = figura(
+                        ctx, "minutos_clube", (clube_sel, pais_rev_filtro),
+                        lambda: grafico_minutos_por_ano(perfil["por_ano"], f"Minutos por ano — formados em {clube_sel}")
+                    )
+                elif serie == "Janela móvel":
+                    trajetoria = consultas.trajetorias(
+                        spec_filtros, None, int(janela), (clube_sel,), pais_rev=pais_rev_filtro
+                    )
+                    fig_cr = figura(
+                        ctx, "janela_clube", (clube_sel, pais_rev_filtro, int(janela)),
+                        lambda: grafico_trajetorias(
+                            trajetoria, "Minutos",
+                            f"Minutos nas últimas {int(janela)} temporadas — formados em {clube_sel}"
+                        )
+                    )
+                else:
+                    trajetoria = consultas.trajetorias(
+                        spec_filtros, None, 1, (clube_sel,), desde, pais_rev=pais_rev_filtro
+                    )
+                    fig_cr = figura(
+                        ctx, "acumulado_clube", (clube_sel, pais_rev_filtro, desde),
+                        lambda: grafico_trajetorias(
+                            trajetoria, "Acumulado", f"Minutos acumulados desde {desde} — formados em {clube_sel}"
+                        )
+                    )
+                st.plotly_chart(fig_cr, use_container_width=True)
 
             # ------------------------------------------
             # Posição do clube revelador nos campeonatos
@@ -401,108 +510,141 @@ with tab_clubes_rev:
             # ------------------------------------------
             st.markdown("### 🏅 Posição do clube revelador nos campeonatos")
 
-            rank_cr = (
-                df_cr.groupby(["Campeonato", "Ano", "Clube Revelador"])["Minutos"]
-                .sum()
-                .reset_index()
-            )
-
-            if rank_cr.empty:
+            df_pos = perfil["posicoes"]
+            if df_pos is None:
                 st.info("Não há dados suficientes para montar o ranking com os filtros atuais.")
+            elif df_pos.empty:
+                st.info("O clube selecionado não aparece nos rankings dos campeonatos com os filtros atuais.")
             else:
-                linhas = []
-
-                for (camp, ano), df_grp in rank_cr.groupby(["Campeonato", "Ano"]):
-                    df_grp = df_grp.sort_values("Minutos", ascending=False).reset_index(drop=True)
-                    df_grp["Posição"] = df_grp.index + 1
-
-                    linha_clube = df_grp[df_grp["Clube Revelador"] == clube_sel]
-                    if not linha_clube.empty:
-                        pos = int(linha_clube["Posição"].iloc[0])
-                        medalha = {1: "🥇", 2: "🥈", 3: "🥉"}.get(pos, "")
-                        pos_fmt = f"{medalha} {pos}" if medalha else str(pos)
-
-                        linhas.append({
-                            "Campeonato": camp,
-                            "Ano": int(ano) if pd.notna(ano) else ano,
-                            "Posição": pos_fmt
-                        })
-
-                if not linhas:
-                    st.info("O clube selecionado não aparece nos rankings dos campeonatos com os filtros atuais.")
-                else:
-                    df_pos = pd.DataFrame(linhas)
-                    df_pos = df_pos.sort_values(["Ano", "Campeonato"], ascending=[False, True])
-                    st.dataframe(df_pos.reset_index(drop=True), use_container_width=True)
+                with secao("Clubes reveladores: tabelas"):
+                    st.dataframe(df_pos, use_container_width=True)
 
             # Jogadores formados
             st.markdown("### Jogadores formados neste clube (com minutos, campeonato e ano)")
-            df_jogs = (
-                df_c.groupby(["Nome Jogador", "Ano", "Campeonato", "Clube Atual"])["Minutos"]
-                .sum()
-                .reset_index()
-                .sort_values(["Ano", "Minutos"], ascending=[True, False])
-            )
-            st.dataframe(df_jogs.reset_index(drop=True), use_container_width=True)
+            with secao("Clubes reveladores: tabelas"):
+                tabela_paginada(perfil["formados"], "formados")
 
             # Clubes onde atuaram
             st.markdown("### Clubes onde atuaram (minutos somados)")
-            by_atual = (
-                df_c.groupby("Clube Atual")["Minutos"]
-                .sum()
-                .reset_index()
-                .sort_values("Minutos", ascending=False)
+            with secao("Clubes reveladores: tabelas"):
+                st.dataframe(perfil["por_clube_atual"], use_container_width=True)
+
+
+def comparar_clubes_reveladores(ctx: Contexto, clubes_disp: list, pais_rev_filtro: str):
+    """Modo de comparação: vários clubes em gráficos sobrepostos e tabelas lado a lado."""
+    consultas, spec_filtros = ctx
+
+    clubes = st.multiselect(
+        "Clubes reveladores para comparar",
+        clubes_disp,
+        max_selections=10,
+        key="clubes_comparacao"
+    )
+    if len(clubes) < 2:
+        st.info("Selecione dois ou mais clubes para comparar.")
+        return
+
+    clubes = tuple(clubes)
+    with secao("Clubes reveladores: agregações"):
+        comparacao = consultas.comparar_clubes(spec_filtros, clubes, pais_rev_filtro)
+
+    if comparacao is None:
+        st.warning("Nenhum registro para esses clubes com os filtros atuais.")
+        return
+
+    sem_registro = [c for c in clubes if c not in set(comparacao["resumo"]["Clube Revelador"])]
+    if sem_registro:
+        st.caption(f"Sem registros com os filtros atuais: {', '.join(sem_registro)}")
+
+    with secao("Clubes reveladores: tabelas"):
+        st.dataframe(comparacao["resumo"], use_container_width=True, hide_index=True)
+
+    st.markdown("### Minutos e jogadores ao longo dos anos")
+    col1, col2 = st.columns(2)
+    with secao("Clubes reveladores: gráficos"):
+        fig_min = figura(
+            ctx, "comparacao_minutos", (clubes, pais_rev_filtro),
+            lambda: grafico_trajetorias(comparacao["por_ano"], "Minutos", "Minutos por ano dos formados")
+        )
+        col1.plotly_chart(fig_min, use_container_width=True)
+        fig_jog = figura(
+            ctx, "comparacao_jogadores", (clubes, pais_rev_filtro),
+            lambda: grafico_trajetorias(comparacao["por_ano"], "Jogadores", "Jogadores formados em atividade por ano")
+        )
+        col2.plotly_chart(fig_jog, use_container_width=True)
+
+    st.markdown("### 🏅 Posição nos campeonatos")
+    posicoes = comparacao["posicoes"]
+    if posicoes is None:
+        st.info("Não há dados suficientes para montar o ranking com os filtros atuais.")
+    elif posicoes.empty:
+        st.info("Os clubes selecionados não aparecem nos rankings dos campeonatos com os filtros atuais.")
+    else:
+        camp_pos = st.selectbox("Campeonato", sorted(posicoes["Campeonato"].unique()), key="comparacao_campeonato")
+        with secao("Clubes reveladores: gráficos"):
+            fig_pos = figura(
+                ctx, "comparacao_posicoes", (clubes, pais_rev_filtro, camp_pos),
+                lambda: grafico_trajetorias(
+                    posicoes[posicoes["Campeonato"] == camp_pos], "Posição", f"Posição por ano — {camp_pos}"
+                )
             )
-            st.dataframe(by_atual.reset_index(drop=True), use_container_width=True)
+            st.plotly_chart(fig_pos, use_container_width=True)
+        with secao("Clubes reveladores: tabelas"):
+            st.dataframe(comparacao["tabela_posicoes"], use_container_width=True, hide_index=True)
+
+    st.markdown("### Clubes onde atuaram (minutos somados por clube revelador)")
+    with secao("Clubes reveladores: tabelas"):
+        tabela_paginada(comparacao["destinos"], "comparacao_destinos")
 
 
 # =========================================================
 # 4) VISÃO CAMPEONATOS
 # =========================================================
-with tab_campeonatos:
+@st.fragment
+@instrumentar_visao("Campeonatos")
+def visao_campeonatos(ctx: Contexto):
+    """Visão por campeonato: rankings anuais e detalhamento."""
+    consultas, spec_filtros = ctx
+
     fonte_dados()
     st.subheader("🏆 Visão por Campeonato")
 
-    campeonatos = sorted(df_filtrado["Campeonato"].dropna().unique())
+    campeonatos = consultas.opcoes(spec_filtros, "Campeonato")
     if not campeonatos:
         st.warning("Nenhum campeonato encontrado com os filtros atuais.")
     else:
         camp_sel = st.selectbox("Selecione o campeonato", campeonatos)
 
-        df_camp_full = df_filtrado[df_filtrado["Campeonato"] == camp_sel].copy()
-        if df_camp_full.empty:
+        if consultas.resumo_campeonato(spec_filtros, camp_sel) is None:
             st.warning("Nenhum registro para esse campeonato com os filtros atuais.")
         else:
             # Filtro opcional por clube revelador
-            clubes_rev = sorted(df_camp_full["Clube Revelador"].dropna().unique())
+            clubes_rev = consultas.opcoes(spec_filtros, "Clube Revelador", Campeonato=camp_sel)
             clube_filtro = st.selectbox(
                 "Filtrar por clube revelador (opcional)",
                 ["(Todos)"] + clubes_rev
             )
 
-            df_camp = df_camp_full.copy()
-            if clube_filtro != "(Todos)":
-                df_camp = df_camp[df_camp["Clube Revelador"] == clube_filtro]
+            with secao("Campeonatos: agregações"):
+                resumo = consultas.resumo_campeonato(spec_filtros, camp_sel, clube_filtro)
 
             col1, col2, col3 = st.columns(3)
-            col1.metric("Minutos totais", int(df_camp["Minutos"].sum()))
-            col2.metric("Anos disponíveis", df_camp["Ano"].nunique())
-            col3.metric("Clubes reveladores", df_camp["Clube Revelador"].nunique())
-
-            # Função para destacar Δ Posição
-            def highlight_variation(val):
-                if pd.isna(val):
-                    return ""
-                if val > 0:   # melhorou (subiu posições)
-                    return "color: blue; font-weight: bold"
-                if val < 0:   # piorou (caiu posições)
-                    return "color: red; font-weight: bold"
-                return ""
+            col1.metric("Minutos totais", resumo["minutos"])
+            col2.metric("Anos disponíveis", resumo["anos"])
+            col3.metric("Clubes reveladores", resumo["clubes_reveladores"])
+
+            # Destaque de Δ Posição: azul se subiu, vermelho se caiu
+            def destacar_variacao(delta: pd.Series):
+                return np.select(
+                    [delta.gt(0).fillna(False), delta.lt(0).fillna(False)],
+                    ["color: blue; font-weight: bold", "color: red; font-weight: bold"],
+                    "",
+                )
 
             # Controle Top N
             st.markdown("## 📊 Rankings por Ano")
 
-            col_top_flag, col_top_n = st.columns([1, 1.5])
+            col_top_flag, col_top_n, col_janela = st.columns([1, 1.5, 1.5])
             with col_top_flag:
                 top_n_enabled = st.checkbox("Mostrar apenas o Top N por ano", value=False)
             top_n = None
@@ -515,50 +657,24 @@ with tab_campeonatos:
                         value=10,
                         step=1
                     )
-
-            # Ranking base (sempre usando df_camp_full para posições consistentes)
-            ranking = (
-                df_camp_full.groupby(["Ano", "Clube Revelador"])["Minutos"]
-                .sum()
-                .reset_index()
-            )
-
-            if ranking.empty:
+            with col_janela:
+                janela = int(st.number_input(
+                    "Temporadas somadas por ranking",
+                    min_value=1,
+                    max_value=20,
+                    value=1,
+                    step=1,
+                    help="Com N > 1, o ranking de cada ano soma as N temporadas terminadas nele."
+                ))
+
+            # Ranking base (sempre sobre o campeonato inteiro para posições consistentes)
+            with secao("Campeonatos: agregações"):
+                ranking_dict = consultas.ranking_janela(spec_filtros, camp_sel, janela)
+
+            if not ranking_dict:
                 st.info("Não há dados suficientes para rankings com os filtros atuais.")
             else:
-                # Mapa clube -> país para montar "Clube (País)"
-                club_pais = (
-                    df_camp_full[["Clube Revelador", "pais_clube_revelador"]]
-                    .drop_duplicates()
-                )
-
-                anos_ord = sorted(ranking["Ano"].dropna().unique(), reverse=True)
-
-                # função para gerar ranking de um ano
-                def ranking_ano(ano):
-                    df_r = ranking[ranking["Ano"] == ano].copy()
-                    df_r = df_r.sort_values("Minutos", ascending=False).reset_index(drop=True)
-                    df_r["Posição"] = df_r.index + 1
-                    df_r["Posição"] = df_r["Posição"].astype("Int64")
-
-                    # anexa país e cria coluna "Clube Revelador (País)"
-                    df_r = df_r.merge(club_pais, on="Clube Revelador", how="left")
-
-                    def make_name(row):
-                        if pd.notna(row["pais_clube_revelador"]):
-                            return f'{row["Clube Revelador"]} ({row["pais_clube_revelador"]})'
-                        else:
-                            return row["Clube Revelador"]
-
-                    df_r["Clube Revelador (País)"] = df_r.apply(make_name, axis=1)
-
-                    return df_r
-
-                # dicionário ano -> ranking com nome + país
-                ranking_dict = {ano: ranking_ano(ano) for ano in sorted(anos_ord)}
-
-                # ordem cronológica crescente para achar "ano anterior"
-                anos_cron = sorted(ranking["Ano"].dropna().unique())
+                anos_ord = sorted(ranking_dict, reverse=True)
 
                 # Exibir rankings ano a ano em layout 2 colunas
                 for i in range(0, len(anos_ord), 2):
@@ -568,22 +684,12 @@ with tab_campeonatos:
                             break
                         ano = anos_ord[i + j]
                         with cols[j]:
-                            st.markdown(f"### 🗓️ {ano}")
-
-                            df_r = ranking_dict[ano].copy()
-
-                            # Localiza ano anterior cronológico
-                            idx = anos_cron.index(ano)
-                            if idx > 0:
-                                ano_ant = anos_cron[idx - 1]
-                                df_prev = ranking_dict[ano_ant][["Clube Revelador", "Posição"]].copy()
-                                df_prev = df_prev.rename(columns={"Posição": "Pos_ant"})
-                                df_r = df_r.merge(df_prev, on="Clube Revelador", how="left")
-                                df_r["Δ Posição"] = df_r["Pos_ant"] - df_r["Posição"]
-                                df_r["Δ Posição"] = df_r["Δ Posição"].astype("Int64")
+                            if janela > 1:
+                                st.markdown(f"### 🗓️ {ano - janela + 1}–{ano}")
                             else:
-                                df_r["Pos_ant"] = pd.NA
-                                df_r["Δ Posição"] = pd.Series([pd.NA] * len(df_r), dtype="Int64")
+                                st.markdown(f"### 🗓️ {ano}")
+
+                            df_r = ranking_dict[ano]
 
                             # Se filtro de clube estiver ativo, manter só ele (mas posição continua do ranking completo)
                             if clube_filtro != "(Todos)":
@@ -591,26 +697,216 @@ with tab_campeonatos:
                             else:
                                 # aplicar Top N só quando não filtramos um clube específico
                                 if top_n is not None:
-                                    df_r = df_r.sort_values("Posição").head(int(top_n))
+                                    df_r = df_r.head(int(top_n))
 
-                            df_r = df_r[["Posição", "Clube Revelador (País)", "Minutos", "Δ Posição"]]
                             df_r = df_r.reset_index(drop=True)
 
-                            st.dataframe(
-                                df_r.style.applymap(highlight_variation, subset=["Δ Posição"]),
-                                use_container_width=True
-                            )
+                            with secao("Campeonatos: tabelas"):
+                                tabela_paginada(
+                                    df_r,
+                                    f"ranking_{ano}",
+                                    colunas=["Posição", "Clube Revelador (País)", "Minutos", "Δ Posição"],
+                                    estilo=lambda sty: sty.apply(destacar_variacao, subset=["Δ Posição"]),
+                                )
 
             # --------------------------------------------------------
             # DETALHAMENTO FINAL DO CAMPEONATO
             # --------------------------------------------------------
             st.markdown("### 📄 Detalhamento do Campeonato")
 
-            df_det = (
-                df_camp[["Ano", "Clube Revelador", "Clube Atual", "Nome Jogador", "Minutos"]]
-                .sort_values(["Ano", "Clube Revelador", "Clube Atual", "Nome Jogador"])
+            with secao("Campeonatos: tabelas"):
+                tabela_paginada(resumo["detalhe"], "detalhe_campeonato")
+
+
+# =========================================================
+# 5) VISÃO TENDÊNCIAS
+# =========================================================
+@st.fragment
+@instrumentar_visao("Tendências")
+def visao_tendencias(ctx: Contexto):
+    """Tendências plurianuais: ranking por intervalo, janelas móveis e acumulados."""
+    consultas, spec_filtros = ctx
+
+    fonte_dados()
+    st.subheader("📉 Tendências dos Clubes Reveladores")
+
+    campeonatos = consultas.opcoes(spec_filtros, "Campeonato")
+    camp_sel = st.selectbox("Campeonato", ["(Todos)"] + campeonatos, key="tendencias_campeonato")
+    campeonato = None if camp_sel == "(Todos)" else camp_sel
+
+    with secao("Tendências: agregações"):
+        anos = consultas.tendencias(spec_filtros).anos_presentes(campeonato).tolist()
+
+    if not anos:
+        st.warning("Nenhum registro com os filtros atuais.")
+        return
+
+    # Ranking sobre um intervalo de anos qualquer
+    st.markdown("### 🏆 Ranking no intervalo")
+    if len(anos) > 1:
+        ano_ini, ano_fim = st.select_slider("Anos", anos, value=(anos[0], anos[-1]), key="tendencias_intervalo")
+    else:
+        ano_ini = ano_fim = anos[0]
+
+    with secao("Tendências: agregações"):
+        ranking = consultas.ranking_intervalo(spec_filtros, campeonato, ano_ini, ano_fim)
+
+    with secao("Tendências: tabelas"):
+        tabela_paginada(ranking, "ranking_intervalo", colunas=["Posição", "Clube Revelador (País)", "Minutos"])
+
+    # Trajetórias dos clubes escolhidos
+    st.markdown("### 📈 Trajetórias")
+    clubes = st.multiselect(
+        "Clubes reveladores",
+        ranking["Clube Revelador"].tolist(),
+        default=ranking["Clube Revelador"].head(5).tolist(),
+        key="tendencias_clubes"
+    )
+    col_janela, col_desde = st.columns(2)
+    janela = int(col_janela.number_input(
+        "Temporadas na janela móvel", min_value=1, max_value=20, value=3, step=1, key="tendencias_janela"
+    ))
+    desde = col_desde.selectbox("Acumulado desde", anos, key="tendencias_desde")
+
+    if not clubes:
+        st.info("Escolha ao menos um clube revelador.")
+        return
+
+    with secao("Tendências: agregações"):
+        trajetorias = consultas.trajetorias(spec_filtros, campeonato, janela, tuple(clubes), desde)
+
+    entidade = (campeonato, janela, desde, tuple(clubes))
+    with secao("Tendências: gráficos"):
+        fig_pos = figura(ctx, "trajetoria_posicoes", entidade, lambda: grafico_trajetorias(
+            trajetorias, "Posição", f"Posição no ranking das últimas {janela} temporadas"
+        ))
+        st.plotly_chart(fig_pos, use_container_width=True)
+
+        fig_jan = figura(ctx, "trajetoria_janela", entidade, lambda: grafico_trajetorias(
+            trajetorias, "Minutos", f"Minutos nas últimas {janela} temporadas"
+        ))
+        st.plotly_chart(fig_jan, use_container_width=True)
+
+        fig_acum = figura(ctx, "trajetoria_acumulado", entidade, lambda: grafico_trajetorias(
+            trajetorias[trajetorias["Ano"] >= desde], "Acumulado", f"Minutos acumulados desde {desde}"
+        ))
+        st.plotly_chart(fig_acum, use_container_width=True)
+
+
+# =========================================================
+# 6) VISÃO FLUXOS
+# =========================================================
+@st.fragment
+@instrumentar_visao("Fluxos")
+def visao_fluxos(ctx: Contexto):
+    """Fluxos de talentos: maiores fluxos, fluxos entre países e clube a clube."""
+    consultas, spec_filtros = ctx
+
+    fonte_dados()
+    st.subheader("🔀 Fluxos de talentos entre clubes")
+
+    col_camp, col_ano = st.columns(2)
+    camp_sel = col_camp.selectbox(
+        "Campeonato", ["(Todos)"] + consultas.opcoes(spec_filtros, "Campeonato"), key="fluxos_campeonato"
+    )
+    ano_sel = col_ano.selectbox("Ano", ["(Todos)"] + consultas.opcoes(spec_filtros, "Ano"), key="fluxos_ano")
+    campeonato = None if camp_sel == "(Todos)" else camp_sel
+    ano = None if ano_sel == "(Todos)" else int(ano_sel)
+    fatia = " — ".join(str(v) for v in (campeonato, ano) if v is not None)
+
+    with secao("Fluxos: agregações"):
+        rede = consultas.rede_fluxos(spec_filtros)
+
+    if not len(rede):
+        st.warning("Nenhum registro com os filtros atuais.")
+        return
+
+    # Maiores fluxos
+    st.markdown("### 🔝 Maiores fluxos entre clubes")
+    col_k, col_mesmo = st.columns([1, 2])
+    k = int(col_k.number_input("Quantidade de fluxos", min_value=5, max_value=100, value=20, step=5, key="fluxos_k"))
+    mesmo_clube = col_mesmo.checkbox("Incluir quem atua no próprio clube revelador", value=False, key="fluxos_mesmo_clube")
+
+    with secao("Fluxos: agregações"):
+        top = consultas.principais_fluxos(spec_filtros, k, campeonato, ano, mesmo_clube)
+
+    if top.empty:
+        st.info("Nenhum fluxo nesta fatia.")
+    else:
+        with secao("Fluxos: gráficos"):
+            fig_sankey = figura(
+                ctx, "sankey_fluxos", (k, campeonato, ano, mesmo_clube),
+                lambda: grafico_sankey(top, f"Top {k} fluxos de minutos {fatia}".strip())
             )
+            st.plotly_chart(fig_sankey, use_container_width=True)
+        with secao("Fluxos: tabelas"):
+            st.dataframe(top, use_container_width=True)
+
+    # País x país
+    st.markdown("### 🌍 Fluxos entre países")
+    with secao("Fluxos: agregações"):
+        matriz = consultas.fluxos_paises(spec_filtros, campeonato, ano)
 
-            st.dataframe(df_det.reset_index(drop=True), use_container_width=True)
+    if matriz.empty:
+        st.info("Nenhum fluxo com país conhecido nesta fatia.")
+    else:
+        with secao("Fluxos: gráficos"):
+            fig_paises = figura(
+                ctx, "fluxos_paises", (campeonato, ano),
+                lambda: grafico_fluxos_paises(matriz, f"Minutos por país revelador e país do clube atual {fatia}".strip())
+            )
+            st.plotly_chart(fig_paises, use_container_width=True)
+
+    # Linha (destinos) ou coluna (origens) de um clube
+    st.markdown("### 🏟️ Clube a clube")
+    sentido = st.radio(
+        "Consulta", ["Onde atuam os formados do clube", "De onde vêm os jogadores do clube"],
+        horizontal=True, key="fluxos_sentido"
+    )
+    destinos = sentido == "Onde atuam os formados do clube"
+    coluna = "Clube Revelador" if destinos else "Clube Atual"
+    clubes = consultas.opcoes(spec_filtros, coluna)
+    if not clubes:
+        st.info("Nenhum clube disponível com os filtros atuais.")
+        return
+    clube = st.selectbox(coluna, clubes, key=f"fluxos_{'revelador' if destinos else 'atual'}")
+
+    with secao("Fluxos: agregações"):
+        if destinos:
+            tabela = consultas.destinos_clube(spec_filtros, clube, campeonato, ano)
+        else:
+            tabela = consultas.origens_clube(spec_filtros, clube, campeonato, ano)
+
+    if tabela.empty:
+        st.info("Nenhum fluxo desse clube nesta fatia.")
+    else:
+        with secao("Fluxos: tabelas"):
+            tabela_paginada(tabela, "fluxos_clube")
+
+
+# =========================================================
+# VISÕES PRINCIPAIS
+# =========================================================
+# Só a visão ativa é calculada e renderizada. Cada visão é um fragmento:
+# uma interação com widgets dentro dela reexecuta apenas a própria visão.
+VISOES = {
+    "Visão Geral": visao_geral,
+    "Jogadores": visao_jogadores,
+    "Clubes reveladores": visao_clubes_reveladores,
+    "Campeonatos": visao_campeonatos,
+    "Tendências": visao_tendencias,
+    "Fluxos": visao_fluxos,
+}
+
+visao_sel = st.radio(
+    "Visão",
+    list(VISOES),
+    horizontal=True,
+    key="visao",
+    label_visibility="collapsed"
+)
 
+VISOES[visao_sel](ctx)
 
+instrumentacao.finalizar_execucao()
+instrumentacao.painel()
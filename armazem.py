@@ -0,0 +1,125 @@
+"""
+Armazém LRU limitado por memória, seguro entre threads.
+
+Guarda resultados derivados (figuras Plotly já montadas, resultados das
+consultas) que podem ser compartilhados por todas as sessões do processo.
+Cada item entra com o seu tamanho em bytes, medido uma vez; quando o
+total passa do limite, os itens usados há mais tempo saem primeiro. Os
+contadores de acertos, falhas e descartes ficam expostos para a
+instrumentação.
+
+Uma chave em cálculo não é recalculada por outra thread: quem pede a
+mesma chave espera o resultado (ex.: a primeira sessão espera o
+aquecimento em vez de repetir o trabalho).
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def estimar_bytes(valor) -> int:
+    """
+    Bytes aproximados de um resultado: DataFrames, Series e arrays pelo
+    conteúdo; dicionários, listas e tuplas somando os itens.
+    """
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=True).sum())
+    if isinstance(valor, (pd.Series, pd.Index)):
+        return int(valor.memory_usage(deep=True))
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(estimar_bytes(k) + estimar_bytes(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return sys.getsizeof(valor) + sum(estimar_bytes(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+class Armazem:
+    """
+    LRU por bytes. `tamanho(valor)` estima os bytes de cada item; o valor
+    guardado é devolvido sem cópia e deve ser tratado como somente leitura.
+    """
+
+    def __init__(self, limite_bytes: int, tamanho):
+        self.limite_bytes = limite_bytes
+        self.tamanho = tamanho
+        self.bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self._itens = OrderedDict()  # chave -> (valor, bytes)
+        self._em_calculo = {}        # chave -> Event sinalizado ao terminar
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def obter(self, chave, calcular):
+        """
+        Valor guardado em `chave` ou, na falta, o resultado de `calcular()`
+        (executado fora do lock), que passa a ser guardado. Se outra thread
+        já está calculando a mesma chave, espera por ela.
+        Retorna (valor, acerto).
+        """
+        while True:
+            with self._lock:
+                item = self._itens.get(chave)
+                if item is not None:
+                    self._itens.move_to_end(chave)
+                    self.acertos += 1
+                    return item[0], True
+                pronto = self._em_calculo.get(chave)
+                if pronto is None:
+                    self._em_calculo[chave] = threading.Event()
+                    self.falhas += 1
+                    break
+            # Se o cálculo da outra thread falhar (ou não couber), a
+            # próxima volta do laço calcula aqui
+            pronto.wait()
+
+        try:
+            valor = calcular()
+            self.guardar(chave, valor)
+        finally:
+            with self._lock:
+                self._em_calculo.pop(chave).set()
+        return valor, False
+
+    def guardar(self, chave, valor):
+        """Guarda `valor` em `chave`; itens maiores que o limite inteiro não entram."""
+        tamanho = self.tamanho(valor)
+        if tamanho > self.limite_bytes:
+            return
+        with self._lock:
+            anterior = self._itens.pop(chave, None)
+            if anterior is not None:
+                self.bytes -= anterior[1]
+            self._itens[chave] = (valor, tamanho)
+            self.bytes += tamanho
+            while self.bytes > self.limite_bytes:
+                _, (_, liberado) = self._itens.popitem(last=False)
+                self.bytes -= liberado
+                self.descartes += 1
+
+    def limpar(self, condicao=None):
+        """Descarta todos os itens, ou só aqueles cuja chave satisfaz `condicao(chave)`."""
+        with self._lock:
+            for chave in [c for c in self._itens if condicao is None or condicao(c)]:
+                _, liberado = self._itens.pop(chave)
+                self.bytes -= liberado
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                "itens": len(self._itens),
+                "bytes": self.bytes,
+                "limite_bytes": self.limite_bytes,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "descartes": self.descartes,
+            }
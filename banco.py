@@ -0,0 +1,446 @@
+"""
+Modo de armazenamento em banco SQLite, para bases maiores que a RAM.
+
+Os CSVs são carregados uma única vez (a minutagem em lotes) em um
+arquivo SQLite com:
+- minutos: linhas no formato de df_all, com índices por jogador, clubes,
+  campeonato e ano
+- cubo: minutos pré-agregados nas DIMENSOES_CUBO (mesmo papel do cubo
+  em memória)
+- jogadores: ID e nome de cada jogador, para o índice de busca
+- meta: versão dos dados que gerou o arquivo
+
+ConsultasSQL expõe a mesma interface de consultas.Consultas: cada
+consulta vira SQL com filtros e agrupamentos no banco, e só o resultado
+(pequeno) volta para o pandas. Vários processos do Streamlit podem
+compartilhar o mesmo arquivo, aberto somente leitura.
+
+Uso (pré-carregar o banco fora do app):
+    python banco.py --saida .cache_dados/dados.sqlite
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+import pandas as pd
+
+import dados
+from agregacoes import DIMENSOES_CUBO
+from armazem import Armazem
+from consultas import TODOS, ConsultasBase, montar_comparacao, montar_perfil, resumir_jogador
+from filtros import COLUNAS_FILTRO, normalizar_selecao
+from indice_jogadores import IndiceJogadores
+
+
+# Formato do banco: incrementar quando o esquema ou a carga mudarem
+VERSAO_BANCO = 2
+
+PATH_BANCO = os.environ.get("DASH_BANCO", os.path.join(dados.DIR_SNAPSHOT, "dados.sqlite"))
+
+# Linhas de minutagem lidas por lote na carga
+TAMANHO_LOTE = 200_000
+
+# Coluna de df_all -> coluna no banco
+COLUNAS = {
+    "Campeonato": "campeonato",
+    "Ano": "ano",
+    "Nome Jogador": "nome_jogador",
+    "ID Jogador": "id_jogador",
+    "Clube Atual": "clube_atual",
+    "Minutos": "minutos",
+    "Clube Revelador": "clube_revelador",
+    "pais_clube_revelador": "pais_revelador",
+    "pais_clube_atual": "pais_atual",
+}
+
+DIMENSOES_SQL = ["campeonato", "ano", "clube_revelador", "pais_revelador", "clube_atual", "pais_atual"]
+
+INDICES = {
+    "minutos": [
+        ["id_jogador"],
+        ["clube_revelador"],
+        ["clube_atual"],
+        ["campeonato", "ano"],
+        ["ano"],
+    ],
+    "cubo": [
+        ["campeonato", "ano"],
+        ["clube_revelador"],
+        ["ano"],
+    ],
+}
+
+
+def _selecionar(colunas) -> str:
+    """Lista de colunas do banco com alias para os nomes de df_all."""
+    return ", ".join(f'{COLUNAS[c]} AS "{c}"' for c in colunas)
+
+
+# =========================================================
+# CARGA
+# =========================================================
+def versao_do_banco(path_banco: str):
+    """Versão dos dados gravada no banco, ou None se ele não existir."""
+    if not os.path.exists(path_banco):
+        return None
+    try:
+        with closing(sqlite3.connect(f"file:{path_banco}?mode=ro", uri=True)) as con:
+            linha = con.execute("SELECT valor FROM meta WHERE chave = 'versao'").fetchone()
+    except sqlite3.Error:
+        return None
+    return linha[0] if linha else None
+
+
+def construir_banco(path_jogadores: str, path_clubes: str, path_minutos: str,
+                    path_banco: str = PATH_BANCO, versao: str = None) -> str:
+    """
+    Carrega os CSVs em `path_banco`, se ele ainda não corresponder à
+    `versao` dos dados. O arquivo é montado em um temporário e trocado
+    atomicamente, então leitores nunca veem uma carga pela metade.
+    """
+    if versao is None:
+        versao = dados.assinatura_arquivos(path_jogadores, path_clubes, path_minutos)
+    chave = f"{versao}:b{VERSAO_BANCO}"
+    if versao_do_banco(path_banco) == chave:
+        return path_banco
+
+    os.makedirs(os.path.dirname(os.path.abspath(path_banco)), exist_ok=True)
+    tmp = f"{path_banco}.{os.getpid()}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+
+    j_clubes, c = dados.preparar_dimensoes(
+        dados.ler_csv_tipado(path_jogadores, "jogadores"), dados.ler_csv_tipado(path_clubes, "clubes")
+    )
+
+    con = sqlite3.connect(tmp)
+    try:
+        con.execute("PRAGMA journal_mode = OFF")
+        con.execute("PRAGMA synchronous = OFF")
+        con.execute(
+            "CREATE TABLE minutos (campeonato TEXT, ano INTEGER, nome_jogador TEXT, id_jogador INTEGER, "
+            "clube_atual TEXT, minutos INTEGER, clube_revelador TEXT, pais_revelador TEXT, pais_atual TEXT)"
+        )
+        for lote in dados.ler_minutos_em_lotes(path_minutos, TAMANHO_LOTE):
+            df = dados.enriquecer_minutos(lote, j_clubes, c)
+            df = df[list(COLUNAS)].rename(columns=COLUNAS)
+            df["minutos"] = df["minutos"].astype("int64")
+            df.to_sql("minutos", con, if_exists="append", index=False)
+
+        dims = ", ".join(DIMENSOES_SQL)
+        con.execute(
+            f"CREATE TABLE cubo AS SELECT {dims}, SUM(minutos) AS minutos, COUNT(*) AS registros "
+            f"FROM minutos GROUP BY {dims}"
+        )
+        # Nome de cada jogador na primeira linha em que aparece (como em IndiceJogadores)
+        con.execute(
+            "CREATE TABLE jogadores AS SELECT id_jogador, nome_jogador, MIN(rowid) AS primeira "
+            "FROM minutos GROUP BY id_jogador"
+        )
+        for tabela, indices in INDICES.items():
+            for colunas in indices:
+                nome = f"ix_{tabela}_{'_'.join(colunas)}"
+                con.execute(f"CREATE INDEX {nome} ON {tabela} ({', '.join(colunas)})")
+
+        con.execute("CREATE TABLE meta (chave TEXT PRIMARY KEY, valor TEXT)")
+        con.execute("INSERT INTO meta VALUES ('versao', ?)", (chave,))
+        con.execute("ANALYZE")
+        con.commit()
+    finally:
+        con.close()
+
+    os.replace(tmp, path_banco)
+    return path_banco
+
+
+# =========================================================
+# CONSULTAS
+# =========================================================
+class ConsultasSQL(ConsultasBase):
+    """
+    Mesma interface de consultas.Consultas, calculada no banco. Cada
+    thread usa a própria conexão somente leitura.
+    """
+
+    def __init__(self, path_banco: str, versao: str, armazem: Armazem = None, ao_consultar=None):
+        super().__init__(versao, armazem, ao_consultar)
+        self.path_banco = path_banco
+        self._local = threading.local()
+
+        # Valores de cada coluna filtrável (para normalizar a seleção)
+        self._valores, self._tem_nulos = {}, {}
+        for col in COLUNAS_FILTRO:
+            valores = self._sql(f"SELECT DISTINCT {COLUNAS[col]} AS v FROM cubo")["v"]
+            self._valores[col] = set(valores.dropna().tolist())
+            self._tem_nulos[col] = bool(valores.isna().any())
+
+        jogadores = self._sql(
+            f'SELECT {_selecionar(["ID Jogador", "Nome Jogador"])} FROM jogadores ORDER BY primeira'
+        )
+        self.indice = IndiceJogadores(jogadores)
+
+    def _conexao(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(f"file:{self.path_banco}?mode=ro", uri=True, check_same_thread=False)
+            self._local.con = con
+        return con
+
+    def _sql(self, consulta: str, params=()) -> pd.DataFrame:
+        return pd.read_sql_query(consulta, self._conexao(), params=list(params))
+
+    @staticmethod
+    def _onde(spec: tuple, pais_rev: str = TODOS, **igualdades):
+        """Cláusula WHERE (e parâmetros) para `spec` e igualdades extras."""
+        condicoes, params = ["1 = 1"], []
+        for col, valores in zip(COLUNAS_FILTRO, spec):
+            if valores is None:
+                continue
+            valores = [v.item() if hasattr(v, "item") else v for v in valores]
+            if not valores:
+                condicoes.append("0 = 1")
+                continue
+            condicoes.append(f"{COLUNAS[col]} IN ({', '.join('?' * len(valores))})")
+            params.extend(valores)
+        if pais_rev != TODOS:
+            igualdades["pais_clube_revelador"] = pais_rev
+        for col, valor in igualdades.items():
+            condicoes.append(f"{COLUNAS[col]} = ?")
+            params.append(valor.item() if hasattr(valor, "item") else valor)
+        return " AND ".join(condicoes), params
+
+    # -----------------------------------------------------
+    # Filtros
+    # -----------------------------------------------------
+    def spec(self, anos_sel, camp_sel, pais_rev_sel, pais_at_sel) -> tuple:
+        """Seleção da barra lateral -> spec hashable (ver filtros.normalizar_selecao)."""
+        return normalizar_selecao(
+            (anos_sel, camp_sel, pais_rev_sel, pais_at_sel), self._valores, self._tem_nulos
+        )
+
+    def cubo_ranking(self, spec: tuple, pais_rev: str = TODOS) -> pd.DataFrame:
+        def calcular():
+            onde, params = self._onde(spec, pais_rev)
+            return self._sql(
+                f'SELECT {_selecionar(["Campeonato", "Ano", "Clube Revelador", "pais_clube_revelador"])}, '
+                f'SUM(minutos) AS "Minutos" FROM cubo WHERE {onde} '
+                f"GROUP BY campeonato, ano, clube_revelador, pais_revelador",
+                params,
+            )
+
+        return self._memo("cubo_ranking", spec, (pais_rev,), calcular)
+
+    def cubo_fluxos(self, spec: tuple) -> pd.DataFrame:
+        onde, params = self._onde(spec)
+        return self._sql(
+            f'SELECT {_selecionar(DIMENSOES_CUBO)}, minutos AS "Minutos" FROM cubo WHERE {onde}',
+            params,
+        )
+
+    def opcoes(self, spec: tuple, coluna: str, **restricoes) -> list:
+        """
+        Valores distintos e ordenados de `coluna` no cubo filtrado, com
+        restrições extras de igualdade (ex.: Campeonato="Premier League").
+        """
+        def calcular():
+            onde, params = self._onde(spec, **restricoes)
+            col = COLUNAS[coluna]
+            return self._sql(
+                f"SELECT DISTINCT {col} AS v FROM cubo WHERE {onde} AND {col} IS NOT NULL ORDER BY {col}",
+                params,
+            )["v"].tolist()
+
+        return self._memo("opcoes", spec, (coluna, tuple(sorted(restricoes.items()))), calcular)
+
+    # -----------------------------------------------------
+    # Visão Geral
+    # -----------------------------------------------------
+    def metricas_gerais(self, spec: tuple) -> dict:
+        def calcular():
+            onde, params = self._onde(spec)
+            cubo = self._sql(
+                "SELECT COUNT(DISTINCT clube_atual) AS clubes_atuais, "
+                "COUNT(DISTINCT clube_revelador) AS clubes_reveladores, "
+                "COUNT(DISTINCT campeonato) AS campeonatos, COALESCE(SUM(minutos), 0) AS minutos "
+                f"FROM cubo WHERE {onde}",
+                params,
+            ).iloc[0]
+            jogadores = self._sql(
+                f"SELECT COUNT(DISTINCT id_jogador) AS n FROM minutos WHERE {onde}", params
+            )["n"].iloc[0]
+            return {
+                "jogadores": int(jogadores),
+                "clubes_atuais": int(cubo["clubes_atuais"]),
+                "clubes_reveladores": int(cubo["clubes_reveladores"]),
+                "campeonatos": int(cubo["campeonatos"]),
+                "minutos": int(cubo["minutos"]),
+            }
+
+        return self._memo("metricas_gerais", spec, (), calcular)
+
+    def top_clubes_reveladores(self, spec: tuple, n: int = 15) -> pd.DataFrame:
+        """Clubes reveladores com mais minutos dos seus formados."""
+        def calcular():
+            onde, params = self._onde(spec)
+            return self._sql(
+                f'SELECT {_selecionar(["Clube Revelador"])}, SUM(minutos) AS "Minutos" FROM cubo '
+                f"WHERE {onde} AND clube_revelador IS NOT NULL GROUP BY clube_revelador "
+                f"ORDER BY SUM(minutos) DESC, clube_revelador LIMIT ?",
+                params + [n],
+            )
+
+        return self._memo("top_clubes_reveladores", spec, (n,), calcular)
+
+    # -----------------------------------------------------
+    # Jogadores
+    # -----------------------------------------------------
+    def buscar_jogadores(self, spec: tuple, consulta: str, limite: int = 20) -> list:
+        """IDs de jogadores para a busca, apenas os que têm linhas nos filtros."""
+        def calcular():
+            if all(valores is None for valores in spec):
+                return self.indice.buscar(consulta, limite=limite)
+
+            # Mesmo critério do backend em memória: o índice descarta, ao
+            # percorrer os candidatos, quem não tem linhas nos filtros
+            nos_filtros = self._ids_nos_filtros(spec)
+            return self.indice.buscar(consulta, limite=limite, aceitar=nos_filtros.__contains__)
+
+        return self._memo("buscar_jogadores", spec, (consulta.strip(), limite), calcular)
+
+    def _ids_nos_filtros(self, spec: tuple) -> frozenset:
+        """IDs dos jogadores com linhas nos filtros."""
+        def calcular():
+            onde, params = self._onde(spec)
+            ids = self._sql(f"SELECT DISTINCT id_jogador AS id FROM minutos WHERE {onde}", params)["id"]
+            return frozenset(ids.dropna().astype("int64").tolist())
+
+        return self._memo("ids_nos_filtros", spec, (), calcular)
+
+    def resumo_jogador(self, spec: tuple, id_jog) -> dict:
+        """
+        Resumo de um jogador nos filtros: clube revelador, minutos totais,
+        minutos por ano e detalhamento. None se não houver linhas.
+        """
+        def calcular():
+            onde, params = self._onde(spec, **{"ID Jogador": id_jog})
+            df_j = self._sql(f"SELECT {_selecionar(COLUNAS)} FROM minutos WHERE {onde} ORDER BY rowid", params)
+            if df_j.empty:
+                return None
+            return resumir_jogador(self.indice.nomes[id_jog], df_j)
+
+        return self._memo("resumo_jogador", spec, (id_jog,), calcular)
+
+    # -----------------------------------------------------
+    # Clubes reveladores
+    # -----------------------------------------------------
+    def perfil_clube(self, spec: tuple, clube: str, pais_rev: str = TODOS) -> dict:
+        """
+        Perfil de um clube revelador nos filtros: país, métricas, minutos
+        por ano, posição nos campeonatos (None se não há ranking), jogadores
+        formados e clubes onde atuaram. None se não houver registros.
+        """
+        def calcular():
+            onde, params = self._onde(spec, pais_rev, **{"Clube Revelador": clube})
+            cubo_c = self._sql(
+                f"SELECT {_selecionar(['Ano', 'Clube Atual', 'pais_clube_revelador'])}, "
+                f'minutos AS "Minutos" FROM cubo WHERE {onde}',
+                params,
+            )
+            if cubo_c.empty:
+                return None
+
+            n_jogadores = self._sql(
+                f"SELECT COUNT(DISTINCT id_jogador) AS n FROM minutos WHERE {onde}", params
+            )["n"].iloc[0]
+            formados = self._sql(
+                f"SELECT {_selecionar(['Nome Jogador', 'Ano', 'Campeonato', 'Clube Atual'])}, "
+                f'SUM(minutos) AS "Minutos" FROM minutos WHERE {onde} '
+                "AND nome_jogador IS NOT NULL AND ano IS NOT NULL AND campeonato IS NOT NULL "
+                "AND clube_atual IS NOT NULL "
+                "GROUP BY nome_jogador, ano, campeonato, clube_atual",
+                params,
+            )
+            return montar_perfil(cubo_c, int(n_jogadores), formados, self.rankings(spec, pais_rev), clube)
+
+        return self._memo("perfil_clube", spec, (clube, pais_rev), calcular)
+
+    def comparar_clubes(self, spec: tuple, clubes: tuple, pais_rev: str = TODOS) -> dict:
+        """
+        Comparação de vários clubes reveladores nos filtros, calculada para
+        todos de uma vez (ver consultas.montar_comparacao). None se nenhum
+        tiver registros.
+        """
+        def calcular():
+            onde, params = self._onde(spec, pais_rev)
+            onde += f" AND clube_revelador IN ({', '.join('?' * len(clubes))})"
+            params = params + list(clubes)
+            cubo_c = self._sql(
+                f"SELECT {_selecionar(['Ano', 'Clube Revelador', 'pais_clube_revelador', 'Clube Atual'])}, "
+                f'minutos AS "Minutos" FROM cubo WHERE {onde}',
+                params,
+            )
+            if cubo_c.empty:
+                return None
+
+            pares = self._sql(
+                f"SELECT DISTINCT {_selecionar(['Clube Revelador', 'Ano', 'ID Jogador'])} "
+                f"FROM minutos WHERE {onde}",
+                params,
+            )
+            return montar_comparacao(cubo_c, pares, self.rankings(spec, pais_rev), clubes)
+
+        return self._memo("comparar_clubes", spec, (tuple(clubes), pais_rev), calcular)
+
+    # -----------------------------------------------------
+    # Campeonatos
+    # -----------------------------------------------------
+    def resumo_campeonato(self, spec: tuple, campeonato: str, clube: str = TODOS) -> dict:
+        """
+        Métricas e detalhamento de um campeonato, opcionalmente só dos
+        formados em `clube`. None se não houver registros.
+        """
+        def calcular():
+            igualdades = {"Campeonato": campeonato}
+            if clube != TODOS:
+                igualdades["Clube Revelador"] = clube
+            onde, params = self._onde(spec, **igualdades)
+
+            metricas = self._sql(
+                'SELECT COUNT(*) AS n, COALESCE(SUM(minutos), 0) AS "minutos", '
+                "COUNT(DISTINCT ano) AS anos, COUNT(DISTINCT clube_revelador) AS clubes_reveladores "
+                f"FROM cubo WHERE {onde}",
+                params,
+            ).iloc[0]
+            if metricas["n"] == 0:
+                return None
+
+            detalhe = self._sql(
+                f"SELECT {_selecionar(['Ano', 'Clube Revelador', 'Clube Atual', 'Nome Jogador', 'Minutos'])} "
+                f"FROM minutos WHERE {onde} "
+                "ORDER BY ano NULLS LAST, clube_revelador NULLS LAST, clube_atual NULLS LAST, "
+                "nome_jogador NULLS LAST",
+                params,
+            )
+            return {
+                "minutos": int(metricas["minutos"]),
+                "anos": int(metricas["anos"]),
+                "clubes_reveladores": int(metricas["clubes_reveladores"]),
+                "detalhe": detalhe,
+            }
+
+        return self._memo("resumo_campeonato", spec, (campeonato, clube), calcular)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Carrega os CSVs no banco SQLite do dashboard.")
+    parser.add_argument("--jogadores", default="jogadores.csv")
+    parser.add_argument("--clubes", default="clubes.csv")
+    parser.add_argument("--minutos", default="minutos.csv")
+    parser.add_argument("--saida", default=PATH_BANCO, help="arquivo do banco")
+    args = parser.parse_args()
+
+    print(construir_banco(args.jogadores, args.clubes, args.minutos, path_banco=args.saida))
@@ -0,0 +1,187 @@
+"""
+Benchmark das computações do dashboard fora do navegador.
+
+Para cada base (real ou sintética, ver dados_sinteticos.py) mede tempo e
+pico de memória de:
+- carregar_dados sem snapshot (frio) e com snapshot
+- bloco de filtros globais (construção do índice, filtro padrão e restrito)
+- consultas de cada visão (consultas.Consultas), sem memoização, e a
+  mesma consulta já memoizada
+
+O tempo é a mediana de `--repeticoes` execuções; o pico de memória vem de
+uma execução extra com tracemalloc (alocações Python e NumPy).
+
+Uso:
+    python benchmark.py --linhas 27290 1000000 --dir bench
+    python benchmark.py --reais
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import time
+import tracemalloc
+
+import dados
+import dados_sinteticos
+from agregacoes import rollup
+from consultas import Consultas
+from filtros import MotorFiltros
+from indice_jogadores import IndiceJogadores
+
+
+def medir(func, repeticoes: int, preparar=None) -> dict:
+    """Mediana do tempo (s) e pico de memória (MB) de `func()`."""
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - inicio)
+
+    if preparar is not None:
+        preparar()
+    tracemalloc.start()
+    func()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"tempo_s": statistics.median(tempos), "pico_mb": pico / 1024 ** 2}
+
+
+def rodar(paths: tuple, repeticoes: int = 3, dir_snapshot: str = None) -> list:
+    """Executa todas as seções para uma base e retorna uma linha por seção."""
+    dir_snapshot = dir_snapshot or os.path.join(os.path.dirname(os.path.abspath(paths[2])), ".cache_bench")
+    resultados = []
+
+    def secao(nome, func, preparar=None):
+        res = medir(func, repeticoes, preparar)
+        resultados.append({"secao": nome, **res})
+        print(f"  {nome:<40} {res['tempo_s'] * 1000:10.1f} ms {res['pico_mb']:10.1f} MB")
+
+    # Carregamento
+    limpar = lambda: shutil.rmtree(dir_snapshot, ignore_errors=True)
+    carregar = lambda: dados.carregar_dados(*paths, dir_snapshot=dir_snapshot)
+    secao("carregar_dados (sem snapshot)", carregar, preparar=limpar)
+    carregar()
+    secao("carregar_dados (snapshot)", carregar)
+
+    df_all, _, _, cubo, _ = carregar()
+    resultados.append({"secao": "linhas", "tempo_s": 0.0, "pico_mb": 0.0, "n": len(df_all), "grupos_cubo": len(cubo)})
+
+    # Filtros globais
+    motor_linhas, motor_cubo = MotorFiltros(df_all), MotorFiltros(cubo)
+    anos = sorted(cubo["Ano"].dropna().unique())
+    camps = sorted(cubo["Campeonato"].dropna().unique())
+    spec_padrao = motor_linhas.normalizar(anos, camps, ["(Todos)"], ["(Todos)"])
+    spec_restrita = motor_linhas.normalizar(anos[len(anos) // 2:], camps[:3], ["(Todos)"], ["(Todos)"])
+
+    secao("filtros: índice (linhas + cubo)", lambda: (MotorFiltros(df_all), MotorFiltros(cubo)))
+    secao("filtros: padrão", lambda: (motor_linhas.aplicar(df_all, spec_padrao), motor_cubo.aplicar(cubo, spec_padrao)))
+
+    def limpar_memo():
+        motor_linhas._cache.clear()
+        motor_cubo._cache.clear()
+
+    secao(
+        "filtros: restrito",
+        lambda: (motor_linhas.aplicar(df_all, spec_restrita), motor_cubo.aplicar(cubo, spec_restrita)),
+        preparar=limpar_memo,
+    )
+    # Consultas das visões (memo limpo antes de cada repetição)
+    secao("jogadores: índice", lambda: IndiceJogadores(df_all))
+    consultas = Consultas("bench", df_all, cubo)
+    spec = spec_padrao
+    limpar_consultas = consultas.limpar
+
+    secao("visão geral: métricas + top_rev", lambda: (
+        consultas.metricas_gerais(spec), consultas.top_clubes_reveladores(spec, n=15)
+    ), preparar=limpar_consultas)
+    secao("visão geral: top 5 consolidado", lambda: consultas.top_k_consolidado(spec, k=5),
+          preparar=limpar_consultas)
+
+    nome_busca = str(df_all["Nome Jogador"].iloc[len(df_all) // 2])[:6]
+
+    def visao_jogador():
+        ids = consultas.buscar_jogadores(spec, nome_busca, limite=20)
+        return consultas.resumo_jogador(spec, ids[0])
+
+    secao("jogadores: busca + resumo", visao_jogador, preparar=limpar_consultas)
+
+    clube = rollup(cubo, ["Clube Revelador"]).sort_values("Minutos").iloc[-1]["Clube Revelador"]
+    camp = consultas.opcoes(spec, "Campeonato")[0]
+    secao("campeonatos: rankings (todos)", lambda: consultas.rankings(spec), preparar=limpar_consultas)
+    secao("campeonatos: ranking + resumo", lambda: (
+        consultas.ranking_campeonato(spec, camp), consultas.resumo_campeonato(spec, camp)
+    ), preparar=limpar_consultas)
+    secao("clubes: perfil", lambda: consultas.perfil_clube(spec, clube), preparar=limpar_consultas)
+
+    # Comparação: uma passada para todos os clubes (rankings já calculados)
+    maiores = tuple(rollup(cubo, ["Clube Revelador"]).nlargest(10, "Minutos")["Clube Revelador"].astype(str))
+    for clubes in [maiores[:2], maiores]:
+        secao(f"clubes: comparação ({len(clubes)})", lambda: consultas.comparar_clubes(spec, clubes),
+              preparar=lambda: consultas.armazem.limpar(lambda chave: chave[1] != "rankings"))
+
+    # Tendências: o índice é montado uma vez; janelas e intervalos são O(clubes)
+    secao("tendências: índice", lambda: consultas.tendencias(spec), preparar=limpar_consultas)
+    secao("tendências: janela 3 + intervalo", lambda: (
+        consultas.ranking_janela(spec, camp, 3),
+        consultas.ranking_intervalo(spec, None, int(anos[0]), int(anos[-1])),
+    ), preparar=lambda: consultas.armazem.limpar(lambda chave: chave[1] != "tendencias"))
+
+    # Fluxos: a rede esparsa é montada uma vez; linhas, colunas e top k a consultam
+    secao("fluxos: rede", lambda: consultas.rede_fluxos(spec), preparar=limpar_consultas)
+    secao("fluxos: destinos + origens + top 20 + países", lambda: (
+        consultas.destinos_clube(spec, clube), consultas.origens_clube(spec, clube),
+        consultas.principais_fluxos(spec, 20), consultas.fluxos_paises(spec),
+    ), preparar=lambda: consultas.armazem.limpar(lambda chave: chave[1] != "rede_fluxos"))
+
+    consultas.perfil_clube(spec, clube)
+    secao("clubes: perfil (memoizado)", lambda: consultas.perfil_clube(spec, clube))
+
+    # Abertura do dashboard: custo do aquecimento e da abertura já aquecida
+    secao("aquecimento (filtros padrão)", lambda: consultas.aquecer(spec), preparar=limpar_consultas)
+    secao("abertura aquecida", lambda: consultas.aquecer(spec))
+
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das computações do dashboard.")
+    parser.add_argument("--linhas", type=int, nargs="*", default=[27_290, 1_000_000],
+                        help="tamanhos das bases sintéticas (linhas de minutagem)")
+    parser.add_argument("--reais", action="store_true", help="usar os CSVs reais do diretório atual")
+    parser.add_argument("--dir", default="bench", help="diretório das bases sintéticas")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--json", help="grava os resultados em JSON lines neste arquivo")
+    args = parser.parse_args(argv)
+
+    bases = []
+    if args.reais:
+        bases.append(("reais", ("jogadores.csv", "clubes.csv", "minutos.csv")))
+    else:
+        for n in args.linhas:
+            saida = os.path.join(args.dir, f"linhas_{n}")
+            paths = tuple(os.path.join(saida, f) for f in ("jogadores.csv", "clubes.csv", "minutos.csv"))
+            if not all(os.path.exists(p) for p in paths):
+                print(f"Gerando base sintética com {n:,} linhas em {saida} ...")
+                paths = dados_sinteticos.gravar_bases(n, saida)
+            bases.append((f"sintetica_{n}", paths))
+
+    todos = []
+    for nome, paths in bases:
+        print(f"\n=== {nome} ===")
+        for linha in rodar(paths, args.repeticoes):
+            todos.append({"base": nome, **linha})
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            for linha in todos:
+                f.write(json.dumps(linha, ensure_ascii=False, default=str) + "\n")
+
+
+if __name__ == "__main__":
+    main()
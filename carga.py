@@ -0,0 +1,404 @@
+"""
+Teste de carga do dashboard com várias sessões simultâneas.
+
+Cada sessão é um AppTest (streamlit.testing) do app2.py, sem navegador,
+em uma thread do mesmo processo: como as sessões de um servidor
+Streamlit, elas compartilham os st.cache_resource (dados, camada de
+consultas, armazéns de resultados e figuras) e cada uma guarda o próprio
+session_state. Cada sessão segue um roteiro de interações de um scout:
+troca de filtros, troca de visão, busca e seleção de jogador, seleção de
+clube e Top N dos rankings.
+
+O AppTest usa um runtime global do processo, então as execuções do
+script das várias sessões entram em fila (uma por vez). As sessões se
+intercalam como usuários simultâneos em um processo do servidor; a
+latência de cada interação é espera na fila + execução, e a execução
+aparece também em separado.
+
+Os números vêm dessas sessões AppTest em processo, não de um servidor
+real: ficam de fora o websocket, a serialização das mensagens para o
+navegador e a renderização. Servem para comparar versões do app entre
+si, não como latência absoluta vista pelo usuário. Para compilar o
+script uma vez só, o teste substitui o ScriptCache interno do AppTest
+(ver `compilar_uma_vez`); se uma versão do Streamlit mudar esses
+internos, o teste para com um erro explícito.
+
+Antes das sessões, uma sessão inicial carrega os dados (o tempo dela é
+relatado à parte). O relatório traz:
+- latência por interação: p50/p90/p99 e máximo (ms)
+- RSS do processo: após o carregamento, pico, final e crescimento por sessão
+- acertos dos armazéns de resultados e figuras durante as sessões
+- acertos por consulta/figura, pelos eventos da instrumentação
+
+Uso:
+    python carga.py --reais --sessoes 8
+    python carga.py --linhas 1000000 --sessoes 16 --ciclos 2 --backend sqlite
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import dados_sinteticos
+
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app2.py")
+
+PADRAO_CACHE = re.compile(
+    r"Cache de (\w+): (\d+) itens, ([\d.]+) de (\d+) MB — acertos (\d+), falhas (\d+), descartes (\d+)"
+)
+
+
+def silenciar_streamlit():
+    """Avisos do Streamlit a cada execução (ex.: depreciações) poluem o relatório."""
+    import streamlit.logger
+    from streamlit import config
+
+    config.set_option("logger.level", "error")
+    streamlit.logger.set_log_level("error")
+
+
+def compilar_uma_vez():
+    """
+    Um servidor Streamlit compila o script uma vez, em um ScriptCache
+    compartilhado pelas sessões; o AppTest cria um cache (e recompila) a
+    cada execução. Todas as sessões passam a usar um único cache, para
+    que a latência medida não inclua a compilação.
+
+    Depende de internos do Streamlit (app_test.ScriptCache e
+    local_script_runner.ScriptCache): levanta RuntimeError se eles não
+    existirem mais, em vez de medir em silêncio com a recompilação.
+    """
+    try:
+        from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+        from streamlit.testing.v1 import app_test, local_script_runner
+    except ImportError as erro:
+        raise RuntimeError(
+            f"Internos do AppTest não encontrados nesta versão do Streamlit ({erro}); "
+            "ajuste carga.compilar_uma_vez"
+        ) from erro
+
+    ausentes = [
+        f"{modulo.__name__}.ScriptCache"
+        for modulo in (app_test, local_script_runner)
+        if not hasattr(modulo, "ScriptCache")
+    ]
+    if ausentes:
+        raise RuntimeError(
+            f"Internos do AppTest ausentes nesta versão do Streamlit: {', '.join(ausentes)}; "
+            "ajuste carga.compilar_uma_vez"
+        )
+
+    compartilhado = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: compartilhado
+
+
+def rss_mb() -> float:
+    """RSS atual do processo (MB): psutil quando instalado, senão /proc (Linux)."""
+    try:
+        import psutil
+    except ImportError:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    return psutil.Process().memory_info().rss / 1024 ** 2
+
+
+class MonitorRSS:
+    """Amostra o RSS em uma thread enquanto ativo e guarda o pico."""
+
+    def __init__(self, intervalo: float = 0.05):
+        self.intervalo = intervalo
+        self.pico = rss_mb()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._amostrar, daemon=True)
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            self.pico = max(self.pico, rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._parar.set()
+        self._thread.join()
+        self.pico = max(self.pico, rss_mb())
+
+
+# =========================================================
+# SESSÃO SIMULADA
+# =========================================================
+def _widget(widgets, rotulo: str):
+    """Widget com o rótulo dado (ou None, se não está na tela)."""
+    return next((w for w in widgets if w.label == rotulo), None)
+
+
+def estatisticas_caches(at) -> dict:
+    """Contadores dos armazéns lidos da barra lateral: rótulo -> estatísticas."""
+    caches = {}
+    for caption in at.caption:
+        achado = PADRAO_CACHE.search(caption.value)
+        if achado:
+            caches[achado.group(1)] = {
+                "itens": int(achado.group(2)),
+                "acertos": int(achado.group(5)),
+                "falhas": int(achado.group(6)),
+                "descartes": int(achado.group(7)),
+            }
+    return caches
+
+
+class Sessao:
+    """
+    Uma sessão do dashboard. `interagir(nome, acao)` executa a ação sobre
+    o AppTest, roda o script e registra a latência da interação.
+    """
+
+    # Uma execução do script por vez no processo (ver docstring do módulo)
+    _fila = threading.Lock()
+
+    def __init__(self, timeout: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.latencias = []  # (interação, ms total, ms de execução)
+        self.erros = []
+
+    def interagir(self, nome: str, acao=None):
+        inicio = time.perf_counter()
+        with self._fila:
+            inicio_execucao = time.perf_counter()
+            if acao is not None:
+                acao()
+            self.at.run()
+            fim = time.perf_counter()
+        self.latencias.append((nome, (fim - inicio) * 1000, (fim - inicio_execucao) * 1000))
+        if self.at.exception:
+            self.erros.append(f"{nome}: {self.at.exception[0].message}")
+
+    def visao(self, nome: str):
+        self.interagir(f"visão: {nome}", lambda: self.at.radio(key="visao").set_value(nome))
+
+    def roteiro(self, rng: random.Random, nomes_jogadores: list):
+        """Um ciclo de uso: filtros, jogador, clube, rankings, tendências e fluxos."""
+        at = self.at
+
+        # Filtro de anos: um intervalo aleatório e, no fim, de volta a todos
+        anos = _widget(at.sidebar.multiselect, "Ano")
+        todos_anos = list(anos.options)
+        ini = rng.randrange(len(todos_anos))
+        fim = rng.randrange(ini, len(todos_anos))
+        self.interagir("filtro: anos", lambda: anos.set_value(todos_anos[ini:fim + 1]))
+
+        self.visao("Jogadores")
+        nome = rng.choice(nomes_jogadores)
+        self.interagir("busca de jogador", lambda: _widget(at.text_input, "Buscar jogador").set_value(nome[:5]))
+        escolha = _widget(at.selectbox, "Selecione o jogador")
+        if escolha is not None and len(escolha.options) > 1:
+            self.interagir("seleção de jogador", lambda: escolha.set_value(rng.choice(escolha.options)))
+
+        self.visao("Clubes reveladores")
+        clube = _widget(at.selectbox, "Clube revelador")
+        if clube is not None and clube.options:
+            self.interagir("seleção de clube", lambda: clube.set_value(rng.choice(clube.options)))
+
+        self.visao("Campeonatos")
+        top_n = _widget(at.checkbox, "Mostrar apenas o Top N por ano")
+        if top_n is not None:
+            self.interagir("Top N: ligar", lambda: top_n.set_value(not top_n.value))
+            valor_n = _widget(at.number_input, "Valor de N (Top N)")
+            if valor_n is not None:
+                self.interagir("Top N: valor", lambda: valor_n.set_value(rng.randint(3, 20)))
+
+        self.visao("Tendências")
+        self.visao("Fluxos")
+        self.interagir("filtro: anos", lambda: _widget(at.sidebar.multiselect, "Ano").set_value(todos_anos))
+        self.visao("Visão Geral")
+
+    def eventos(self) -> list:
+        """Eventos de cache registrados pela instrumentação em cada execução."""
+        if "_instrumentacao_buffer" not in self.at.session_state:
+            return []
+        return [registro["eventos"] for registro in self.at.session_state["_instrumentacao_buffer"]]
+
+
+# =========================================================
+# EXECUÇÃO
+# =========================================================
+def percentis(latencias: list) -> pd.DataFrame:
+    """p50/p90/p99/máximo da latência e p50 da execução (ms), por interação."""
+    df = pd.DataFrame(latencias, columns=["Interação", "ms", "execucao"])
+    resumo = df.groupby("Interação").agg(
+        amostras=("ms", "size"),
+        p50=("ms", lambda v: np.percentile(v, 50)),
+        p90=("ms", lambda v: np.percentile(v, 90)),
+        p99=("ms", lambda v: np.percentile(v, 99)),
+        maximo=("ms", "max"),
+        p50_execucao=("execucao", lambda v: np.percentile(v, 50)),
+    )
+    return resumo.round(1).sort_values("p50", ascending=False).reset_index()
+
+
+def acertos_por_evento(eventos: list) -> pd.DataFrame:
+    """Acertos, falhas e taxa de acerto por evento de cache (consulta ou figura)."""
+    linhas = [(nome, valor) for registro in eventos for nome, valor in registro.items()]
+    df = pd.DataFrame(linhas, columns=["Evento", "Resultado"])
+    tabela = pd.crosstab(df["Evento"], df["Resultado"]).reindex(columns=["hit", "miss"], fill_value=0)
+    tabela["taxa de acerto (%)"] = (tabela["hit"] / (tabela["hit"] + tabela["miss"]) * 100).round(1)
+    return tabela.sort_values("miss", ascending=False).reset_index()
+
+
+def rodar(dir_dados: str, sessoes: int, ciclos: int = 1, backend: str = "memoria",
+          intervalo: float = 0.0, timeout: float = 600, seed: int = 0) -> dict:
+    """Roda a sessão inicial e `sessoes` sessões simultâneas; devolve as métricas."""
+    os.environ["DASH_DIR_DADOS"] = dir_dados
+    os.environ["DASH_INSTRUMENTACAO"] = "1"
+    if backend == "sqlite":
+        os.environ["DASH_BACKEND"] = "sqlite"
+
+    nomes = pd.read_csv(os.path.join(dir_dados, "jogadores.csv"), usecols=["Jogador"])["Jogador"]
+    nomes = nomes.dropna().astype(str).sample(min(len(nomes), 1000), random_state=seed).tolist()
+
+    silenciar_streamlit()
+    compilar_uma_vez()
+    rss_inicio = rss_mb()
+    inicial = Sessao(timeout)
+    inicial.interagir("carregamento")
+    if inicial.erros:
+        raise RuntimeError(f"Falha ao abrir o dashboard: {inicial.erros}")
+    # Espera o aquecimento em segundo plano terminar
+    for thread in threading.enumerate():
+        if thread.name.startswith("aquecimento"):
+            thread.join()
+    rss_carregado = rss_mb()
+    inicial.interagir("carregamento")
+    caches_antes = estatisticas_caches(inicial.at)
+
+    def executar(i: int) -> Sessao:
+        time.sleep(i * intervalo)
+        sessao = Sessao(timeout)
+        sessao.interagir("abertura")
+        rng = random.Random(seed * 1000 + i)
+        for _ in range(ciclos):
+            sessao.roteiro(rng, nomes)
+        return sessao
+
+    inicio = time.perf_counter()
+    with MonitorRSS() as monitor, ThreadPoolExecutor(max_workers=sessoes) as pool:
+        # As sessões continuam vivas (com o seu session_state) até a medição final
+        concluidas = list(pool.map(executar, range(sessoes)))
+    duracao = time.perf_counter() - inicio
+    rss_final = rss_mb()
+
+    inicial.interagir("carregamento")
+    caches_depois = estatisticas_caches(inicial.at)
+    caches = {
+        rotulo: {
+            chave: depois[chave] - caches_antes.get(rotulo, {}).get(chave, 0)
+            for chave in ("acertos", "falhas", "descartes")
+        } | {"itens": depois["itens"]}
+        for rotulo, depois in caches_depois.items()
+    }
+    for est in caches.values():
+        consultas = est["acertos"] + est["falhas"]
+        est["taxa_acerto"] = round(est["acertos"] / consultas * 100, 1) if consultas else None
+
+    latencias = [lat for sessao in concluidas for lat in sessao.latencias]
+    return {
+        "sessoes": sessoes,
+        "ciclos": ciclos,
+        "backend": backend,
+        "duracao_s": round(duracao, 2),
+        "interacoes": len(latencias),
+        "carregamento_ms": round(inicial.latencias[0][1], 1),
+        "latencias": percentis(latencias),
+        "rss_mb": {
+            "inicio": round(rss_inicio, 1),
+            "carregado": round(rss_carregado, 1),
+            "pico": round(monitor.pico, 1),
+            "final": round(rss_final, 1),
+            "por_sessao": round((rss_final - rss_carregado) / sessoes, 2),
+        },
+        "caches": caches,
+        "eventos": acertos_por_evento([ev for sessao in concluidas for ev in sessao.eventos()]),
+        "erros": [erro for sessao in concluidas for erro in sessao.erros],
+    }
+
+
+def imprimir(resultado: dict):
+    print(
+        f"{resultado['sessoes']} sessões x {resultado['ciclos']} ciclo(s) ({resultado['backend']}): "
+        f"{resultado['interacoes']} interações em {resultado['duracao_s']} s; "
+        f"carregamento inicial {resultado['carregamento_ms']:.0f} ms"
+    )
+    print("\nLatência por interação (ms)")
+    print(resultado["latencias"].to_string(index=False))
+
+    rss = resultado["rss_mb"]
+    print(
+        f"\nRSS (MB): início {rss['inicio']}, dados carregados {rss['carregado']}, "
+        f"pico {rss['pico']}, final {rss['final']} — {rss['por_sessao']} MB por sessão"
+    )
+
+    print("\nArmazéns durante as sessões")
+    for rotulo, est in resultado["caches"].items():
+        print(
+            f"  {rotulo:<11} acertos {est['acertos']}, falhas {est['falhas']}, "
+            f"descartes {est['descartes']}, taxa de acerto {est['taxa_acerto']}%"
+        )
+
+    print("\nAcertos por evento (instrumentação, um por execução)")
+    print(resultado["eventos"].to_string(index=False))
+
+    if resultado["erros"]:
+        print(f"\n{len(resultado['erros'])} interações com erro:")
+        for erro in resultado["erros"][:10]:
+            print(f"  {erro}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do dashboard com sessões simultâneas.")
+    parser.add_argument("--sessoes", type=int, default=8, help="sessões simultâneas")
+    parser.add_argument("--ciclos", type=int, default=1, help="repetições do roteiro por sessão")
+    parser.add_argument("--linhas", type=int, default=27_290, help="linhas da base sintética")
+    parser.add_argument("--reais", action="store_true", help="usar os CSVs reais do diretório atual")
+    parser.add_argument("--dir", default="bench", help="diretório das bases sintéticas")
+    parser.add_argument("--backend", choices=["memoria", "sqlite"], default="memoria")
+    parser.add_argument("--intervalo", type=float, default=0.0, help="segundos entre o início das sessões")
+    parser.add_argument("--timeout", type=float, default=600, help="timeout (s) de cada execução do script")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="grava o resultado em JSON neste arquivo")
+    args = parser.parse_args(argv)
+
+    if args.reais:
+        dir_dados = "."
+    else:
+        dir_dados = os.path.join(args.dir, f"linhas_{args.linhas}")
+        if not os.path.exists(os.path.join(dir_dados, "minutos.csv")):
+            print(f"Gerando base sintética com {args.linhas:,} linhas em {dir_dados} ...")
+            dados_sinteticos.gravar_bases(args.linhas, dir_dados)
+
+    resultado = rodar(
+        dir_dados, args.sessoes, args.ciclos, args.backend, args.intervalo, args.timeout, args.seed
+    )
+    imprimir(resultado)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {k: v.to_dict("records") if isinstance(v, pd.DataFrame) else v for k, v in resultado.items()},
+                f, ensure_ascii=False, indent=2, default=str,
+            )
+
+
+if __name__ == "__main__":
+    main()
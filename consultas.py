@@ -0,0 +1,560 @@
+"""
+Camada de consultas do dashboard, sem dependência do Streamlit.
+
+Cada consulta recebe a seleção de filtros normalizada (`spec`, a tupla
+hashable de MotorFiltros.normalizar) e parâmetros simples, e devolve
+DataFrames/dicionários prontos para exibição. Os resultados são
+memoizados por (versão, consulta, spec, parâmetros) em um armazém LRU
+limitado por memória (armazem.Armazem), que pode ser compartilhado por
+todas as instâncias do processo. Consultas idênticas de sessões e abas
+diferentes viram acertos de cache em vez de novos groupbys, e
+`aquecer_em_segundo_plano` pré-calcula as da abertura do dashboard.
+
+Os resultados são compartilhados: devem ser tratados como somente
+leitura.
+
+`Consultas` calcula sobre os DataFrames em memória; banco.ConsultasSQL
+oferece a mesma interface sobre um banco SQLite em disco.
+"""
+
+import abc
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+from agregacoes import (
+    perfis_clubes_reveladores, posicoes_do_clube, ranking_por_campeonato, rollup, top_k_consolidado,
+)
+from armazem import Armazem, estimar_bytes
+from filtros import MotorFiltros
+from fluxos import RedeFluxos
+from indice_jogadores import IndiceJogadores
+from tendencias import IndiceTendencias
+
+
+log = logging.getLogger(__name__)
+
+
+TODOS = "(Todos)"
+
+# Orçamento padrão do armazém de resultados
+LIMITE_MB = int(os.environ.get("DASH_CACHE_CONSULTAS_MB", "256"))
+
+
+def _ano_categorico(por_ano: pd.DataFrame, chaves: list = None, posicao=None) -> pd.DataFrame:
+    """
+    Ordena por ano (e pelas `chaves` seguintes, com ordenação estável) e
+    adiciona Ano_str (eixo categórico sem ano decimal). `posicao` dá a
+    ordem dos clubes reveladores quando "Clube Revelador" está nas chaves.
+    """
+    chaves = chaves or ["Ano"]
+    por_ano = por_ano.dropna(subset=["Ano"]).sort_values(
+        chaves, kind="stable",
+        key=lambda col: col.map(posicao) if posicao is not None and col.name == "Clube Revelador" else col,
+    )
+    por_ano["Ano_str"] = por_ano["Ano"].astype(int).astype(str)
+    return por_ano
+
+
+def resumir_jogador(nome: str, df_j: pd.DataFrame) -> dict:
+    """Resumo exibido na visão Jogadores a partir das linhas do jogador."""
+    return {
+        "nome": nome,
+        "clube_revelador": df_j["Clube Revelador"].iloc[0],
+        "pais_revelador": df_j["pais_clube_revelador"].iloc[0],
+        "minutos": int(df_j["Minutos"].sum()),
+        "por_ano": _ano_categorico(df_j.groupby("Ano")["Minutos"].sum().reset_index()),
+        "detalhe": df_j[["Ano", "Campeonato", "Clube Atual", "Minutos"]]
+        .sort_values(["Ano", "Campeonato"])
+        .reset_index(drop=True),
+    }
+
+
+def montar_perfil(cubo_c: pd.DataFrame, n_jogadores: int, formados: pd.DataFrame,
+                  rankings: dict, clube: str) -> dict:
+    """
+    Perfil exibido na visão Clubes reveladores a partir do cubo do clube,
+    do número de formados e da tabela de formados (Nome Jogador, Ano,
+    Campeonato, Clube Atual, Minutos).
+    """
+    return {
+        "pais": cubo_c["pais_clube_revelador"].iloc[0],
+        "minutos": int(cubo_c["Minutos"].sum()),
+        "jogadores": n_jogadores,
+        "clubes_atuais": cubo_c["Clube Atual"].nunique(),
+        "por_ano": _ano_categorico(rollup(cubo_c, ["Ano"])),
+        "posicoes": posicoes_do_clube(rankings, clube) if rankings else None,
+        "formados": formados
+        .sort_values(["Ano", "Minutos"], ascending=[True, False])
+        .reset_index(drop=True),
+        "por_clube_atual": rollup(cubo_c, ["Clube Atual"])
+        .sort_values("Minutos", ascending=False)
+        .reset_index(drop=True),
+    }
+
+
+def montar_comparacao(cubo_c: pd.DataFrame, pares: pd.DataFrame, rankings: dict, clubes) -> dict:
+    """
+    Comparação de vários clubes reveladores exibida na visão Clubes
+    reveladores, a partir do cubo dos clubes, dos pares distintos
+    (Clube Revelador, Ano, ID Jogador) e dos rankings por campeonato.
+    As agregações por clube vêm de perfis_clubes_reveladores; aqui ficam
+    a grade por ano, os pivôs e os rótulos:
+    - resumo: uma linha por clube (país, minutos, formados, clubes onde
+      atuaram, melhor posição e principal destino)
+    - por_ano: minutos e jogadores por clube e ano (zeros nos anos sem registro)
+    - posicoes: posição por clube, campeonato e ano (None se não há ranking)
+    - tabela_posicoes: campeonato e ano x clube, com a posição
+    - destinos: clube atual x clube revelador, com os minutos
+    Os clubes sem registros ficam de fora; os demais seguem a ordem de `clubes`.
+    """
+    cubo_c = cubo_c.astype({"Clube Revelador": str, "Clube Atual": str})
+    pares = pares.astype({"Clube Revelador": str})
+    presentes = set(cubo_c["Clube Revelador"].unique())
+    ordem = [c for c in dict.fromkeys(clubes) if c in presentes]
+    posicao = {c: i for i, c in enumerate(ordem)}
+
+    ranking = None
+    if rankings:
+        ranking = pd.concat(
+            [df[df["Clube Revelador"].isin(ordem)] for df in rankings.values()], ignore_index=True
+        ).astype({"Clube Revelador": str, "Campeonato": str})
+    perfis = perfis_clubes_reveladores(cubo_c, pares, ranking, ordem, detalhar=False)
+
+    posicoes = perfis["posicoes"]
+    if posicoes is not None:
+        posicoes = _ano_categorico(
+            posicoes[["Clube Revelador", "Campeonato", "Ano", "Posição", "Minutos"]],
+            ["Campeonato", "Ano", "Clube Revelador"], posicao,
+        )
+
+    destinos = perfis["clubes_atuais"]
+    principal = (
+        destinos.sort_values(["Minutos", "Clube Atual"], ascending=[False, True], kind="stable")
+        .drop_duplicates("Clube Revelador")
+        .set_index("Clube Revelador")["Clube Atual"]
+    )
+
+    resumo = perfis["resumo"].set_index("Clube Revelador").rename(columns={
+        "pais_clube_revelador": "País",
+        "jogadores_formados": "Jogadores formados",
+        "clubes_onde_atuaram": "Clubes onde atuaram",
+    })
+    resumo = resumo.assign(
+        **{
+            "Melhor posição": posicoes.groupby("Clube Revelador")["Posição"].min() if posicoes is not None else None,
+            "Principal destino": principal,
+        }
+    ).reindex(ordem)[["País", "Minutos", "Jogadores formados", "Clubes onde atuaram",
+                      "Melhor posição", "Principal destino"]]
+    resumo["Melhor posição"] = resumo["Melhor posição"].astype("Int64")
+    resumo.index.name = "Clube Revelador"
+
+    # Grade clube x ano completa: as linhas sobrepostas não saltam anos sem registro
+    por_ano = perfis["minutos_por_ano"].merge(
+        pares.groupby(["Clube Revelador", "Ano"]).size().rename("Jogadores").reset_index(),
+        on=["Clube Revelador", "Ano"], how="left",
+    )
+    grade = pd.MultiIndex.from_product(
+        [ordem, sorted(por_ano["Ano"].dropna().unique())], names=["Clube Revelador", "Ano"]
+    )
+    por_ano = por_ano.set_index(["Clube Revelador", "Ano"]).reindex(grade, fill_value=0).reset_index()
+    por_ano = _ano_categorico(por_ano.astype({"Jogadores": "int64"}), ["Ano", "Clube Revelador"], posicao)
+
+    tabela_posicoes = None
+    if posicoes is not None:
+        nos_rankings = set(posicoes["Clube Revelador"].unique())
+        tabela_posicoes = (
+            posicoes.pivot(index=["Campeonato", "Ano"], columns="Clube Revelador", values="Posição")
+            .reindex(columns=[c for c in ordem if c in nos_rankings])
+            .sort_index(ascending=[True, False])
+            .reset_index()
+        )
+        tabela_posicoes.columns.name = None
+
+    destinos = destinos.pivot(index="Clube Atual", columns="Clube Revelador", values="Minutos")
+    destinos = destinos.reindex(columns=ordem).fillna(0).astype("int64")
+    destinos["Total"] = destinos.sum(axis=1)
+    destinos = (
+        destinos.reset_index()
+        .sort_values(["Total", "Clube Atual"], ascending=[False, True], kind="stable")
+        .reset_index(drop=True)
+    )
+    destinos.columns.name = None
+
+    return {
+        "resumo": resumo.reset_index(),
+        "por_ano": por_ano.reset_index(drop=True),
+        "posicoes": posicoes,
+        "tabela_posicoes": tabela_posicoes,
+        "destinos": destinos,
+    }
+
+
+class ConsultasBase(abc.ABC):
+    """
+    Memoização e consultas comuns aos backends. As subclasses
+    implementam `cubo_ranking(spec, pais_rev)`: minutos por Campeonato,
+    Ano, Clube Revelador e pais_clube_revelador (ou um cubo mais fino), e
+    `cubo_fluxos(spec)`: minutos nas DIMENSOES_CUBO.
+
+    `armazem` guarda os resultados (padrão: um próprio, de LIMITE_MB);
+    passe o mesmo armazém a várias instâncias para um orçamento único.
+    `ao_consultar(nome, acerto)` é chamado a cada consulta, para
+    instrumentação.
+    """
+
+    def __init__(self, versao: str, armazem: Armazem = None, ao_consultar=None):
+        self.versao = versao
+        self.armazem = armazem if armazem is not None else Armazem(LIMITE_MB * 1024 ** 2, estimar_bytes)
+        self.ao_consultar = ao_consultar
+
+    # -----------------------------------------------------
+    # Memoização
+    # -----------------------------------------------------
+    def _memo(self, nome: str, spec: tuple, args: tuple, calcular):
+        resultado, acerto = self.armazem.obter((self.versao, nome, spec, args), calcular)
+        if self.ao_consultar is not None:
+            self.ao_consultar(nome, acerto)
+        return resultado
+
+    def limpar(self):
+        """Descarta os resultados desta versão dos dados."""
+        self.armazem.limpar(lambda chave: chave[0] == self.versao)
+
+    # -----------------------------------------------------
+    # Aquecimento
+    # -----------------------------------------------------
+    def aquecer(self, spec: tuple):
+        """
+        Calcula os resultados da abertura do dashboard para `spec`: tabelas
+        da Visão Geral e resumo e rankings de cada campeonato.
+        """
+        self.metricas_gerais(spec)
+        self.top_clubes_reveladores(spec, n=15)
+        self.top_k_consolidado(spec, k=5)
+        for campeonato in self.opcoes(spec, "Campeonato"):
+            self.resumo_campeonato(spec, campeonato)
+            self.ranking_campeonato(spec, campeonato)
+
+    def aquecer_em_segundo_plano(self, spec: tuple) -> threading.Thread:
+        """Roda `aquecer(spec)` em uma thread daemon; falhas só vão para o log."""
+        def executar():
+            inicio = time.perf_counter()
+            try:
+                self.aquecer(spec)
+            except Exception:
+                log.exception("Falha no aquecimento das consultas (%s)", self.versao)
+            else:
+                log.info("Consultas aquecidas em %.1f s (%s)", time.perf_counter() - inicio, self.versao)
+
+        thread = threading.Thread(target=executar, name=f"aquecimento {self.versao}", daemon=True)
+        thread.start()
+        return thread
+
+    @abc.abstractmethod
+    def cubo_ranking(self, spec: tuple, pais_rev: str = TODOS) -> pd.DataFrame:
+        """Minutos por Campeonato, Ano, Clube Revelador e pais_clube_revelador."""
+
+    @abc.abstractmethod
+    def cubo_fluxos(self, spec: tuple) -> pd.DataFrame:
+        """Minutos nas DIMENSOES_CUBO."""
+
+    # -----------------------------------------------------
+    # Rankings e Top k
+    # -----------------------------------------------------
+    def top_k_consolidado(self, spec: tuple, k: int = 5) -> dict:
+        """Campeonato -> tabela Top k por ano (ver agregacoes.top_k_consolidado)."""
+        return self._memo(
+            "top_k_consolidado", spec, (k,),
+            lambda: top_k_consolidado(self.cubo_ranking(spec), k=k),
+        )
+
+    def rankings(self, spec: tuple, pais_rev: str = TODOS) -> dict:
+        """Campeonato -> ranking anual de clubes reveladores com Δ Posição."""
+        return self._memo(
+            "rankings", spec, (pais_rev,),
+            lambda: ranking_por_campeonato(self.cubo_ranking(spec, pais_rev)),
+        )
+
+    def ranking_campeonato(self, spec: tuple, campeonato: str) -> dict:
+        """
+        Ano -> ranking do campeonato naquele ano (posições sempre sobre o
+        campeonato inteiro). Dicionário vazio se não houver dados.
+        """
+        def calcular():
+            ranking = self.rankings(spec).get(campeonato)
+            if ranking is None or ranking.empty:
+                return {}
+            return dict(tuple(ranking.groupby("Ano")))
+
+        return self._memo("ranking_campeonato", spec, (campeonato,), calcular)
+
+    # -----------------------------------------------------
+    # Tendências plurianuais
+    # -----------------------------------------------------
+    def tendencias(self, spec: tuple, pais_rev: str = TODOS) -> IndiceTendencias:
+        """Somas de prefixos por clube e ano (ver tendencias.IndiceTendencias)."""
+        return self._memo(
+            "tendencias", spec, (pais_rev,),
+            lambda: IndiceTendencias(self.cubo_ranking(spec, pais_rev)),
+        )
+
+    def ranking_janela(self, spec: tuple, campeonato: str, janela: int) -> dict:
+        """
+        Como `ranking_campeonato`, mas cada ano soma as `janela` temporadas
+        terminadas nele (janela 1 é o próprio ranking anual).
+        """
+        if janela <= 1:
+            return self.ranking_campeonato(spec, campeonato)
+        return self._memo(
+            "ranking_janela", spec, (campeonato, janela),
+            lambda: self.tendencias(spec).rankings_por_ano(campeonato, janela),
+        )
+
+    def ranking_intervalo(self, spec: tuple, campeonato, ano_ini: int, ano_fim: int) -> pd.DataFrame:
+        """Ranking por minutos entre ano_ini e ano_fim (campeonato None: todos)."""
+        return self._memo(
+            "ranking_intervalo", spec, (campeonato, ano_ini, ano_fim),
+            lambda: self.tendencias(spec).ranking(campeonato, ano_ini, ano_fim),
+        )
+
+    def trajetorias(self, spec: tuple, campeonato, janela: int, clubes: tuple,
+                    desde: int = None, pais_rev: str = TODOS) -> pd.DataFrame:
+        """
+        Minutos na janela móvel, posição e acumulado desde `desde`, ano a
+        ano, dos `clubes` (ver IndiceTendencias.trajetorias).
+        """
+        return self._memo(
+            "trajetorias", spec, (campeonato, janela, tuple(clubes), desde, pais_rev),
+            lambda: self.tendencias(spec, pais_rev).trajetorias(campeonato, janela, clubes, desde),
+        )
+
+    # -----------------------------------------------------
+    # Fluxos entre clubes
+    # -----------------------------------------------------
+    def rede_fluxos(self, spec: tuple) -> RedeFluxos:
+        """Matriz esparsa clube x clube dos filtros (ver fluxos.RedeFluxos)."""
+        return self._memo("rede_fluxos", spec, (), lambda: RedeFluxos(self.cubo_fluxos(spec)))
+
+    def destinos_clube(self, spec: tuple, clube: str, campeonato: str = None, ano: int = None) -> pd.DataFrame:
+        """Clubes onde atuam os formados em `clube`, por minutos."""
+        return self._memo(
+            "destinos_clube", spec, (clube, campeonato, ano),
+            lambda: self.rede_fluxos(spec).destinos(clube, campeonato, ano),
+        )
+
+    def origens_clube(self, spec: tuple, clube: str, campeonato: str = None, ano: int = None) -> pd.DataFrame:
+        """Clubes reveladores dos jogadores de `clube`, por minutos."""
+        return self._memo(
+            "origens_clube", spec, (clube, campeonato, ano),
+            lambda: self.rede_fluxos(spec).origens(clube, campeonato, ano),
+        )
+
+    def principais_fluxos(self, spec: tuple, k: int = 20, campeonato: str = None, ano: int = None,
+                          mesmo_clube: bool = True) -> pd.DataFrame:
+        """Os k maiores fluxos Clube Revelador -> Clube Atual."""
+        return self._memo(
+            "principais_fluxos", spec, (k, campeonato, ano, mesmo_clube),
+            lambda: self.rede_fluxos(spec).principais(k, campeonato, ano, mesmo_clube),
+        )
+
+    def fluxos_paises(self, spec: tuple, campeonato: str = None, ano: int = None) -> pd.DataFrame:
+        """Minutos por país revelador (linhas) e país do clube atual (colunas)."""
+        return self._memo(
+            "fluxos_paises", spec, (campeonato, ano),
+            lambda: self.rede_fluxos(spec).matriz_paises(campeonato, ano),
+        )
+
+
+class Consultas(ConsultasBase):
+    """
+    Consultas memoizadas sobre uma versão imutável dos dados em memória
+    (linhas originais e cubo). Pode ser compartilhada entre sessões.
+    """
+
+    def __init__(self, versao: str, df_all: pd.DataFrame, cubo: pd.DataFrame,
+                 armazem: Armazem = None, ao_consultar=None):
+        super().__init__(versao, armazem, ao_consultar)
+        self.df_all = df_all
+        self.cubo = cubo
+        self.motor_linhas = MotorFiltros(df_all)
+        self.motor_cubo = MotorFiltros(cubo)
+        self.indice = IndiceJogadores(df_all)
+
+    # -----------------------------------------------------
+    # Filtros
+    # -----------------------------------------------------
+    def spec(self, anos_sel, camp_sel, pais_rev_sel, pais_at_sel) -> tuple:
+        """Seleção da barra lateral -> spec hashable (ver MotorFiltros.normalizar)."""
+        return self.motor_linhas.normalizar(anos_sel, camp_sel, pais_rev_sel, pais_at_sel)
+
+    def linhas(self, spec: tuple) -> pd.DataFrame:
+        """Linhas originais que atendem a `spec` (o próprio df_all se nada restringe)."""
+        return self.motor_linhas.aplicar(self.df_all, spec)
+
+    def cubo_filtrado(self, spec: tuple, pais_rev: str = TODOS) -> pd.DataFrame:
+        cubo = self.motor_cubo.aplicar(self.cubo, spec)
+        if pais_rev != TODOS:
+            cubo = cubo[cubo["pais_clube_revelador"] == pais_rev]
+        return cubo
+
+    def cubo_ranking(self, spec: tuple, pais_rev: str = TODOS) -> pd.DataFrame:
+        return self.cubo_filtrado(spec, pais_rev)
+
+    def cubo_fluxos(self, spec: tuple) -> pd.DataFrame:
+        return self.cubo_filtrado(spec)
+
+    def opcoes(self, spec: tuple, coluna: str, **restricoes) -> list:
+        """
+        Valores distintos e ordenados de `coluna` no cubo filtrado, com
+        restrições extras de igualdade (ex.: Campeonato="Premier League").
+        """
+        def calcular():
+            cubo = self.cubo_filtrado(spec)
+            for col, valor in restricoes.items():
+                cubo = cubo[cubo[col] == valor]
+            return sorted(cubo[coluna].dropna().unique())
+
+        return self._memo("opcoes", spec, (coluna, tuple(sorted(restricoes.items()))), calcular)
+
+    # -----------------------------------------------------
+    # Visão Geral
+    # -----------------------------------------------------
+    def metricas_gerais(self, spec: tuple) -> dict:
+        def calcular():
+            cubo = self.cubo_filtrado(spec)
+            return {
+                "jogadores": self.linhas(spec)["ID Jogador"].nunique(),
+                "clubes_atuais": cubo["Clube Atual"].nunique(),
+                "clubes_reveladores": cubo["Clube Revelador"].nunique(),
+                "campeonatos": cubo["Campeonato"].nunique(),
+                "minutos": int(cubo["Minutos"].sum()),
+            }
+
+        return self._memo("metricas_gerais", spec, (), calcular)
+
+    def top_clubes_reveladores(self, spec: tuple, n: int = 15) -> pd.DataFrame:
+        """Clubes reveladores com mais minutos dos seus formados."""
+        return self._memo(
+            "top_clubes_reveladores", spec, (n,),
+            lambda: rollup(self.cubo_filtrado(spec), ["Clube Revelador"])
+            .sort_values("Minutos", ascending=False)
+            .head(n),
+        )
+
+    # -----------------------------------------------------
+    # Jogadores
+    # -----------------------------------------------------
+    def buscar_jogadores(self, spec: tuple, consulta: str, limite: int = 20) -> list:
+        """IDs de jogadores para a busca, apenas os que têm linhas nos filtros."""
+        def calcular():
+            pos_filtro = self.motor_linhas.posicoes(spec)
+            return self.indice.buscar(
+                consulta, limite=limite,
+                aceitar=lambda id_jog: len(self.indice.posicoes(id_jog, pos_filtro)) > 0,
+            )
+
+        return self._memo("buscar_jogadores", spec, (consulta.strip(), limite), calcular)
+
+    def resumo_jogador(self, spec: tuple, id_jog) -> dict:
+        """
+        Resumo de um jogador nos filtros: clube revelador, minutos totais,
+        minutos por ano e detalhamento. None se não houver linhas.
+        """
+        def calcular():
+            pos = self.indice.posicoes(id_jog, self.motor_linhas.posicoes(spec))
+            df_j = self.df_all.take(pos)
+            if df_j.empty:
+                return None
+            return resumir_jogador(self.indice.nomes[id_jog], df_j)
+
+        return self._memo("resumo_jogador", spec, (id_jog,), calcular)
+
+    # -----------------------------------------------------
+    # Clubes reveladores
+    # -----------------------------------------------------
+    def perfil_clube(self, spec: tuple, clube: str, pais_rev: str = TODOS) -> dict:
+        """
+        Perfil de um clube revelador nos filtros: país, métricas, minutos
+        por ano, posição nos campeonatos (None se não há ranking), jogadores
+        formados e clubes onde atuaram. None se não houver registros.
+        """
+        def calcular():
+            cubo = self.cubo_filtrado(spec, pais_rev)
+            cubo_c = cubo[cubo["Clube Revelador"] == clube]
+            if cubo_c.empty:
+                return None
+
+            # Linhas por jogador só do clube (contagem e lista de formados)
+            df_c = self.linhas(spec)
+            df_c = df_c[df_c["Clube Revelador"] == clube]
+            if pais_rev != TODOS:
+                df_c = df_c[df_c["pais_clube_revelador"] == pais_rev]
+
+            formados = (
+                df_c.groupby(["Nome Jogador", "Ano", "Campeonato", "Clube Atual"])["Minutos"]
+                .sum()
+                .reset_index()
+            )
+            return montar_perfil(
+                cubo_c, df_c["ID Jogador"].nunique(), formados, self.rankings(spec, pais_rev), clube
+            )
+
+        return self._memo("perfil_clube", spec, (clube, pais_rev), calcular)
+
+    def comparar_clubes(self, spec: tuple, clubes: tuple, pais_rev: str = TODOS) -> dict:
+        """
+        Comparação de vários clubes reveladores nos filtros, calculada para
+        todos de uma vez (ver montar_comparacao). None se nenhum tiver registros.
+        """
+        def calcular():
+            cubo = self.cubo_filtrado(spec, pais_rev)
+            cubo_c = cubo[cubo["Clube Revelador"].isin(clubes)]
+            if cubo_c.empty:
+                return None
+
+            df_c = self.linhas(spec)
+            df_c = df_c[df_c["Clube Revelador"].isin(clubes)]
+            if pais_rev != TODOS:
+                df_c = df_c[df_c["pais_clube_revelador"] == pais_rev]
+
+            pares = df_c[["Clube Revelador", "Ano", "ID Jogador"]].drop_duplicates()
+            return montar_comparacao(cubo_c, pares, self.rankings(spec, pais_rev), clubes)
+
+        return self._memo("comparar_clubes", spec, (tuple(clubes), pais_rev), calcular)
+
+    # -----------------------------------------------------
+    # Campeonatos
+    # -----------------------------------------------------
+    def resumo_campeonato(self, spec: tuple, campeonato: str, clube: str = TODOS) -> dict:
+        """
+        Métricas e detalhamento de um campeonato, opcionalmente só dos
+        formados em `clube`. None se não houver registros.
+        """
+        def calcular():
+            cubo = self.cubo_filtrado(spec)
+            cubo_camp = cubo[cubo["Campeonato"] == campeonato]
+            if clube != TODOS:
+                cubo_camp = cubo_camp[cubo_camp["Clube Revelador"] == clube]
+            if cubo_camp.empty:
+                return None
+
+            df_camp = self.linhas(spec)
+            df_camp = df_camp[df_camp["Campeonato"] == campeonato]
+            if clube != TODOS:
+                df_camp = df_camp[df_camp["Clube Revelador"] == clube]
+
+            return {
+                "minutos": int(cubo_camp["Minutos"].sum()),
+                "anos": cubo_camp["Ano"].nunique(),
+                "clubes_reveladores": cubo_camp["Clube Revelador"].nunique(),
+                "detalhe": df_camp[["Ano", "Clube Revelador", "Clube Atual", "Nome Jogador", "Minutos"]]
+                .sort_values(["Ano", "Clube Revelador", "Clube Atual", "Nome Jogador"])
+                .reset_index(drop=True),
+            }
+
+        return self._memo("resumo_campeonato", spec, (campeonato, clube), calcular)
@@ -0,0 +1,672 @@
+"""
+Carregamento e combinação das bases CSV do dashboard.
+
+O resultado final (df_all, j_clubes, c e o cubo de minutos) é gravado em um snapshot Parquet
+em disco, identificado pela assinatura (mtime + tamanho) dos três CSVs.
+Assim um cold start (restart do servidor, nova réplica, cache expirado)
+só precisa ler o snapshot, e qualquer alteração em um dos CSVs gera uma
+assinatura nova e força a reconstrução. Os snapshots compacto e não
+compacto da mesma assinatura convivem, cada um com seu manifesto.
+
+Quando só há linhas novas no fim dos CSVs (ex.: nova temporada em
+minutos.csv), o snapshot anterior é atualizado incrementalmente:
+apenas as linhas anexadas são lidas, enriquecidas e somadas ao cubo.
+
+A minutagem é ligada a jogadores e clubes por chave inteira (posição na
+dimensão), com takes em vez de merges; as colunas vindas das dimensões
+ficam categóricas e os nomes só viram texto no modo não compacto.
+Nomes de clubes e campeonatos passam antes pelos dicionários canônicos
+de normalizacao.py (espaços, acentos, caixa e aliases).
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+import normalizacao
+from agregacoes import atualizar_cubo, construir_cubo
+
+
+log = logging.getLogger(__name__)
+
+
+# Versão do formato do snapshot: incrementar sempre que o processamento
+# de carregar_dados mudar, para invalidar snapshots antigos.
+VERSAO_SNAPSHOT = 7
+
+DIR_SNAPSHOT = os.environ.get("DASH_DIR_SNAPSHOT", ".cache_dados")
+
+TABELAS_SNAPSHOT = ("df_all", "j_clubes", "c", "cubo", "memoria")
+
+# Manifesto do último snapshot gravado em cada modo (compacto ou não):
+# chave e estado (tamanho + hash) de cada CSV de origem, usado para
+# detectar linhas anexadas
+ARQUIVOS_MANIFESTO = {True: "manifesto_compacto.json", False: "manifesto.json"}
+FONTES = ("jogadores", "clubes", "minutos")
+
+# Colunas lidas de cada CSV e seus tipos (demais colunas são ignoradas).
+# Inteiros numpy: no parser C são bem mais rápidos que os anuláveis (Int64)
+# e, se houver vazio, a leitura cai para a inferência de tipos.
+ESQUEMAS = {
+    "jogadores": {"Jogador": "str", "ID": "int64", "Clube Revelador": "str"},
+    "clubes": {"Clube": "str", "País": "str"},
+    "minutos": {"Campeonato": "str", "Ano": "int64", "Jogador": "str", "ID": "int64",
+                "Clube": "str", "Minutos": "int64"},
+}
+
+# Parser dos CSVs: "c" (padrão) ou "pyarrow", que lê em várias threads e
+# compensa em máquinas com vários núcleos
+ENGINE_CSV = os.environ.get("DASH_ENGINE_CSV", "c")
+
+# Linhas por lote na leitura da minutagem em lotes (0 = arquivo inteiro)
+TAMANHO_LOTE = int(os.environ.get("DASH_TAMANHO_LOTE", "0"))
+
+# Colunas de clube que compartilham o mesmo dicionário de categorias
+COLUNAS_CLUBE = ["Clube Atual", "Clube Revelador"]
+COLUNAS_CATEGORIA = ["Campeonato", "Nome Jogador", "pais_clube_revelador", "pais_clube_atual"]
+
+
+# =========================================================
+# ASSINATURA DOS ARQUIVOS
+# =========================================================
+def assinatura_arquivos(*paths: str) -> str:
+    """
+    Retorna um hash curto com caminho, mtime e tamanho de cada arquivo.
+    Muda sempre que qualquer um dos arquivos (ou as tabelas de
+    normalizacao.py) for alterado.
+    """
+    partes = [f"v{VERSAO_SNAPSHOT}", normalizacao.ASSINATURA]
+    for path in paths:
+        st_arq = os.stat(path)
+        partes.append(f"{os.path.abspath(path)}|{st_arq.st_mtime_ns}|{st_arq.st_size}")
+    return hashlib.sha1("\n".join(partes).encode("utf-8")).hexdigest()[:16]
+
+
+# =========================================================
+# SNAPSHOT EM DISCO
+# =========================================================
+def _chave_snapshot(versao: str, compacto: bool) -> str:
+    """Chave do snapshot de uma assinatura: os dois modos convivem em disco."""
+    return f"{versao}c" if compacto else versao
+
+
+def _path_snapshot(versao: str, tabela: str, dir_snapshot: str) -> str:
+    return os.path.join(dir_snapshot, f"{versao}_{tabela}.parquet")
+
+
+def ler_snapshot(versao: str, dir_snapshot: str = DIR_SNAPSHOT):
+    """
+    Lê o snapshot da versão informada. Retorna None se não existir
+    ou se estiver incompleto/corrompido.
+    """
+    paths = [_path_snapshot(versao, t, dir_snapshot) for t in TABELAS_SNAPSHOT]
+    if not all(os.path.exists(p) for p in paths):
+        return None
+    try:
+        return tuple(pd.read_parquet(p) for p in paths)
+    except Exception:
+        return None
+
+
+def gravar_snapshot(versao: str, tabelas, dir_snapshot: str = DIR_SNAPSHOT, manifesto: dict = None,
+                    manter=()):
+    """
+    Grava as tabelas do snapshot de forma atômica (arquivo temporário +
+    rename), grava o manifesto do seu modo (se informado) e remove os
+    snapshots de outras versões, exceto as chaves em `manter` e as ainda
+    apontadas pelo manifesto de algum modo.
+    """
+    os.makedirs(dir_snapshot, exist_ok=True)
+
+    for nome, df in zip(TABELAS_SNAPSHOT, tabelas):
+        destino = _path_snapshot(versao, nome, dir_snapshot)
+        tmp = f"{destino}.{os.getpid()}.tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, destino)
+
+    if manifesto is not None:
+        destino = os.path.join(dir_snapshot, ARQUIVOS_MANIFESTO[manifesto["compacto"]])
+        tmp = f"{destino}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dict(manifesto, chave=versao), f)
+        os.replace(tmp, destino)
+
+    # Limpa snapshots antigos
+    vivas = {versao, *manter}
+    for compacto in ARQUIVOS_MANIFESTO:
+        anterior = _ler_manifesto(dir_snapshot, compacto)
+        if anterior is not None:
+            vivas.add(anterior.get("chave"))
+    arquivos_vivos = {f"{v}_{t}.parquet" for v in vivas for t in TABELAS_SNAPSHOT}
+    for arq in os.listdir(dir_snapshot):
+        if arq.endswith(".parquet") and arq not in arquivos_vivos:
+            try:
+                os.remove(os.path.join(dir_snapshot, arq))
+            except OSError:
+                pass
+
+
+# =========================================================
+# COMBINAÇÃO DAS BASES
+# =========================================================
+def _ler_csv(path_ou_buffer) -> pd.DataFrame:
+    df = pd.read_csv(path_ou_buffer)
+    # Remove colunas de índice que possam ter sido salvas
+    return df.loc[:, ~df.columns.str.contains(r"^Unnamed")]
+
+
+def _engine_csv() -> str:
+    if ENGINE_CSV == "pyarrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return "c"
+    return ENGINE_CSV
+
+
+def ler_csv_tipado(path_ou_buffer, fonte: str) -> pd.DataFrame:
+    """
+    Lê só as colunas de ESQUEMAS[fonte], já com os tipos finais, usando o
+    parser de ENGINE_CSV. Se o arquivo fugir do esquema
+    (coluna ausente, valor não numérico), volta para a leitura com
+    inferência de tipos.
+    """
+    esquema = ESQUEMAS[fonte]
+    try:
+        return pd.read_csv(path_ou_buffer, usecols=list(esquema), dtype=esquema, engine=_engine_csv())
+    except (ValueError, TypeError) as erro:
+        log.warning("%s fora do esquema (%s); lendo com inferência de tipos", fonte, erro)
+        if hasattr(path_ou_buffer, "seek"):
+            path_ou_buffer.seek(0)
+        return _ler_csv(path_ou_buffer)
+
+
+def ler_minutos_em_lotes(path: str, tamanho_lote: int):
+    """Itera a minutagem em DataFrames de até `tamanho_lote` linhas, já tipados."""
+    esquema = ESQUEMAS["minutos"]
+    yield from pd.read_csv(path, usecols=list(esquema), dtype=esquema, chunksize=tamanho_lote)
+
+
+def ler_bases(path_jogadores: str, path_clubes: str, path_minutos: str):
+    """Lê as três bases em paralelo (o parser libera o GIL): (jogadores, clubes, minutos)."""
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futuros = [
+            pool.submit(ler_csv_tipado, path, fonte)
+            for path, fonte in zip((path_jogadores, path_clubes, path_minutos), FONTES)
+        ]
+        return tuple(f.result() for f in futuros)
+
+
+def _codigos(valores, dimensao: pd.Index) -> np.ndarray:
+    """
+    Chave inteira (posição em `dimensao`) de cada valor, -1 se ausente.
+    Só os valores distintos passam pela tabela hash da dimensão; cada
+    linha custa um take.
+    """
+    codigos, distintos = pd.factorize(valores)
+    return _buscar(dimensao.get_indexer(distintos), codigos)
+
+
+def _buscar(tabela: np.ndarray, codigos: np.ndarray) -> np.ndarray:
+    """tabela[codigos], propagando o -1 das chaves ausentes."""
+    return np.append(tabela, -1)[codigos]
+
+
+def _categorica(dimensao: pd.Categorical, codigos: np.ndarray) -> pd.Categorical:
+    """Valores de `dimensao` nas posições `codigos`, sem materializar os nomes."""
+    return pd.Categorical.from_codes(_buscar(dimensao.codes, codigos), dtype=dimensao.dtype)
+
+
+def _sem_chaves_repetidas(df: pd.DataFrame, chave: str) -> pd.DataFrame:
+    repetidas = df[chave].duplicated()
+    if repetidas.any():
+        log.warning("%d linhas com %s repetido ignoradas (vale a primeira)", repetidas.sum(), chave)
+        df = df[~repetidas].reset_index(drop=True)
+    return df
+
+
+def preparar_dimensoes(df_jog: pd.DataFrame, df_clu: pd.DataFrame):
+    """
+    Monta as dimensões: clubes canônicos (chave = clube, com país; ver
+    normalizacao.clubes_canonicos) e jogadores (chave = ID) com clube
+    revelador canônico + país, buscados pela posição do clube no
+    dicionário. Retorna (j_clubes, c).
+    """
+    j = df_jog.rename(columns={
+        "Jogador": "nome_jogador",
+        "ID": "id_jogador",
+        "Clube Revelador": "clube_revelador"
+    })
+
+    c = df_clu.rename(columns={
+        "Clube": "clube",
+        "País": "pais"
+    })
+
+    j = _sem_chaves_repetidas(j, "id_jogador")
+    c = normalizacao.clubes_canonicos(_sem_chaves_repetidas(c, "clube"))
+
+    # Clube revelador + país pela posição do clube no dicionário canônico
+    clubes = normalizacao.dicionario_clubes(c)
+    cod_clube = clubes.ids(j["clube_revelador"])
+    j_clubes = j.assign(
+        clube_revelador=clubes.canonizar(j["clube_revelador"]).astype("str"),
+        clube=pd.api.extensions.take(c["clube"].array, cod_clube, allow_fill=True),
+        pais=pd.api.extensions.take(c["pais"].array, cod_clube, allow_fill=True),
+    )
+    return j_clubes, c
+
+
+def enriquecer_minutos(df_min: pd.DataFrame, j_clubes: pd.DataFrame, c: pd.DataFrame) -> pd.DataFrame:
+    """
+    Monta as linhas de df_all a partir da minutagem. Clube atual e
+    campeonato passam pelos dicionários canônicos. As junções com as
+    dimensões são por chave inteira: jogador e clube atual viram posições
+    nas dimensões e clube revelador e países saem de takes nesses códigos,
+    sem merge. Essas colunas ficam categóricas (códigos + dicionário da
+    dimensão); os nomes só são materializados em `como_texto`.
+    """
+    ids, dim_ids = df_min["ID"], pd.Index(j_clubes["id_jogador"])
+    if ids.dtype != dim_ids.dtype:
+        # Algum dos CSVs tem ID não numérico: compara como texto
+        ids, dim_ids = ids.astype(str), dim_ids.astype(str)
+    cod_jogador = _codigos(ids, dim_ids)
+
+    # Clube atual canônico e seu país: busca feita uma vez por clube distinto
+    atual = normalizacao.dicionario_clubes(c).canonizar(df_min["Clube"])
+    pais_clube = pd.Categorical(c["pais"])
+    pais_por_atual = _buscar(pais_clube.codes, pd.Index(c["clube"]).get_indexer(atual.categories))
+
+    minutos = df_min["Minutos"]
+    if not pd.api.types.is_integer_dtype(minutos):
+        minutos = pd.to_numeric(minutos, errors="coerce").fillna(0)
+
+    # Ano como inteiro (sem casas decimais)
+    ano = pd.to_numeric(df_min["Ano"], errors="coerce").round(0).astype("Int64")
+
+    return pd.DataFrame({
+        "Campeonato": normalizacao.dicionario_campeonatos().canonizar(df_min["Campeonato"]),
+        "Ano": ano.array,
+        "Nome Jogador": df_min["Jogador"].array,
+        "ID Jogador": df_min["ID"].array,
+        "Clube Atual": atual,
+        "Minutos": minutos.array,
+        "Clube Revelador": _categorica(pd.Categorical(j_clubes["clube_revelador"]), cod_jogador),
+        "pais_clube_revelador": _categorica(pd.Categorical(j_clubes["pais"]), cod_jogador),
+        "pais_clube_atual": pd.Categorical.from_codes(_buscar(pais_por_atual, atual.codes), dtype=pais_clube.dtype),
+    })
+
+
+def como_texto(df_all: pd.DataFrame) -> pd.DataFrame:
+    """df_all com as colunas categóricas materializadas como texto (modo não compacto)."""
+    df = df_all.copy(deep=False)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("str")
+    return df
+
+
+def combinar_bases(path_jogadores: str, path_clubes: str, path_minutos: str):
+    """
+    Carrega as três bases CSV, renomeia colunas, junta tudo e retorna:
+    - df_all: dataset final combinando tudo (colunas das dimensões categóricas)
+    - df_jogadores_clubes: tabela com jogador + clube revelador + país
+    - df_clubes: tabela de clubes originais
+    """
+    df_jog, df_clu, df_min = ler_bases(path_jogadores, path_clubes, path_minutos)
+    j_clubes, c = preparar_dimensoes(df_jog, df_clu)
+    df_all = enriquecer_minutos(df_min, j_clubes, c)
+    return df_all, j_clubes, c
+
+
+def combinar_bases_em_lotes(path_jogadores: str, path_clubes: str, path_minutos: str,
+                            tamanho_lote: int):
+    """
+    Como `combinar_bases` seguido de `compactar`, mas lendo a minutagem
+    em lotes: cada lote é enriquecido e compactado antes do próximo, e os
+    lotes são unidos pelas categorias. O pico de memória fica perto do
+    df_all compacto mais um lote. Retorna (df_all, j_clubes, c, memoria).
+    """
+    df_jog, df_clu = ler_csv_tipado(path_jogadores, "jogadores"), ler_csv_tipado(path_clubes, "clubes")
+    j_clubes, c = preparar_dimensoes(df_jog, df_clu)
+
+    partes, antes = [], None
+    for lote in ler_minutos_em_lotes(path_minutos, tamanho_lote):
+        df = enriquecer_minutos(lote, j_clubes, c)
+        uso = _memoria_como_texto(df)
+        antes = uso if antes is None else antes + uso
+        for col in COLUNAS_CLUBE + COLUNAS_CATEGORIA:
+            df[col] = df[col].astype("category")
+        partes.append(df)
+
+    # Categóricas unidas num dicionário só; as demais colunas via concat
+    categoricas = {
+        col: union_categoricals([p.pop(col) for p in partes], sort_categories=True)
+        for col in COLUNAS_CLUBE + COLUNAS_CATEGORIA
+    }
+    df_all = pd.concat(partes, ignore_index=True)
+    del partes
+    for col, valores in categoricas.items():
+        df_all[col] = valores
+    df_all = df_all[list(antes.index)]
+
+    df_all, memoria = compactar(df_all)
+    memoria["Antes (bytes)"] = antes.reindex(memoria["Coluna"]).values
+    return df_all, j_clubes, c, memoria
+
+
+# =========================================================
+# REPRESENTAÇÃO COMPACTA
+# =========================================================
+def _memoria_por_coluna(df: pd.DataFrame) -> pd.Series:
+    return df.memory_usage(deep=True, index=False)
+
+
+def _memoria_como_texto(df: pd.DataFrame) -> pd.Series:
+    """
+    Como `_memoria_por_coluna`, mas contando as categóricas como texto,
+    sem materializá-las: bytes UTF-8 + offset de 8 bytes por valor.
+    """
+    uso = _memoria_por_coluna(df)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            tamanhos = df[col].cat.categories.str.encode("utf-8").str.len().to_numpy()
+            por_linha = _buscar(tamanhos, df[col].cat.codes.to_numpy())
+            uso[col] = int(por_linha.clip(min=0).sum()) + 8 * len(df)
+    return uso
+
+
+def compactar(df_all: pd.DataFrame):
+    """
+    Converte df_all para uma representação compacta:
+    - Clube Atual e Clube Revelador como categorias com dicionário único
+    - demais dimensões de texto como categorias
+    - ID Jogador como int32 (mantém texto se houver ID não numérico)
+    - Minutos como int32 e Ano como Int16
+
+    Retorna (df_compacto, memoria), onde `memoria` traz os bytes por
+    coluna antes (com as categóricas contadas como texto) e depois.
+    """
+    antes = _memoria_como_texto(df_all)
+    # Cópia rasa: com copy-on-write as atribuições abaixo não tocam df_all
+    # e cada coluna é duplicada só quando convertida
+    df = df_all.copy(deep=False)
+
+    clubes = set().union(*(df[col].dropna().unique() for col in COLUNAS_CLUBE))
+    tipo_clube = pd.CategoricalDtype(sorted(clubes))
+    for col in COLUNAS_CLUBE:
+        df[col] = df[col].astype(tipo_clube)
+
+    for col in COLUNAS_CATEGORIA:
+        # As que vêm das dimensões já são categóricas: só descarta o que não aparece
+        df[col] = df[col].astype("category").cat.remove_unused_categories()
+
+    ids = pd.to_numeric(df["ID Jogador"], errors="coerce")
+    if ids.notna().all() and ids.between(0, np.iinfo(np.int32).max).all():
+        df["ID Jogador"] = ids.astype("int32")
+
+    df["Minutos"] = df["Minutos"].round(0).astype("int32")
+    df["Ano"] = df["Ano"].astype("Int16")
+
+    depois = _memoria_por_coluna(df)
+    memoria = pd.DataFrame({
+        "Coluna": antes.index,
+        "Antes (bytes)": antes.values,
+        "Depois (bytes)": depois.reindex(antes.index).values,
+    })
+    return df, memoria
+
+
+# =========================================================
+# INGESTÃO INCREMENTAL
+# =========================================================
+def _hash_arquivo(path: str, limite: int = None) -> str:
+    """sha1 dos primeiros `limite` bytes do arquivo (ou do arquivo todo)."""
+    h = hashlib.sha1()
+    restante = os.path.getsize(path) if limite is None else limite
+    with open(path, "rb") as f:
+        while restante > 0:
+            bloco = f.read(min(1 << 20, restante))
+            if not bloco:
+                break
+            h.update(bloco)
+            restante -= len(bloco)
+    return h.hexdigest()
+
+
+def estado_arquivos(path_jogadores: str, path_clubes: str, path_minutos: str) -> dict:
+    """Tamanho e hash de cada CSV, gravados no manifesto do snapshot."""
+    return {
+        fonte: {"tamanho": os.path.getsize(path), "sha1": _hash_arquivo(path)}
+        for fonte, path in zip(FONTES, (path_jogadores, path_clubes, path_minutos))
+    }
+
+
+def _ler_manifesto(dir_snapshot: str, compacto: bool):
+    try:
+        with open(os.path.join(dir_snapshot, ARQUIVOS_MANIFESTO[compacto]), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _linhas_anexadas(path: str, anterior: dict, fonte: str):
+    """
+    Compara o arquivo com o estado anterior. Retorna um DataFrame vazio
+    se não mudou, as linhas anexadas ao fim se só cresceu (lidas como na
+    carga completa, por `ler_csv_tipado`), ou None se o conteúdo anterior
+    foi alterado.
+    """
+    tamanho_ant = anterior["tamanho"]
+    tamanho = os.path.getsize(path)
+    if tamanho < tamanho_ant or _hash_arquivo(path, tamanho_ant) != anterior["sha1"]:
+        return None
+
+    with open(path, "rb") as f:
+        cabecalho = f.readline()
+        if tamanho == tamanho_ant:
+            return ler_csv_tipado(io.BytesIO(cabecalho), fonte)
+        f.seek(tamanho_ant - 1)
+        if f.read(1) != b"\n":
+            # A última linha antiga não terminava em quebra: foi estendida
+            return None
+        novas = f.read()
+    return ler_csv_tipado(io.BytesIO(cabecalho + novas), fonte)
+
+
+def _alinhar_categorias(antigo: pd.DataFrame, novo: pd.DataFrame):
+    """
+    Dá às colunas categóricas dos dois DataFrames o mesmo dicionário
+    (união ordenada), mantendo o dicionário único dos clubes, para que
+    o concat preserve as categorias.
+    """
+    grupos = [COLUNAS_CLUBE] + [[col] for col in COLUNAS_CATEGORIA]
+    for cols in grupos:
+        cols = [col for col in cols if col in antigo.columns]
+        if not cols or not isinstance(antigo[cols[0]].dtype, pd.CategoricalDtype):
+            continue
+        valores = set()
+        for df in (antigo, novo):
+            for col in cols:
+                valores.update(df[col].dropna().unique().tolist())
+        categorias = antigo[cols[0]].cat.categories
+        tipo = pd.CategoricalDtype(pd.Index(sorted(valores), dtype=categorias.dtype))
+        for df in (antigo, novo):
+            for col in cols:
+                df[col] = df[col].astype(tipo)
+    return antigo, novo
+
+
+def atualizar_incremental(path_jogadores: str, path_clubes: str, path_minutos: str,
+                          compacto: bool, dir_snapshot: str = DIR_SNAPSHOT):
+    """
+    Tenta atualizar o último snapshot só com as linhas anexadas aos CSVs.
+    Retorna (tabelas, estados) ou None quando é preciso reconstruir tudo:
+    sem snapshot anterior compatível, conteúdo antigo alterado, ou linhas
+    novas de jogadores/clubes que mudariam o enriquecimento de linhas já
+    existentes.
+    """
+    manifesto = _ler_manifesto(dir_snapshot, compacto)
+    if manifesto is None or manifesto.get("formato") != VERSAO_SNAPSHOT:
+        return None
+
+    tabelas = ler_snapshot(manifesto["chave"], dir_snapshot)
+    if tabelas is None:
+        return None
+    df_all, j_clubes, c, cubo, memoria = tabelas
+
+    paths = dict(zip(FONTES, (path_jogadores, path_clubes, path_minutos)))
+    novas = {}
+    for fonte, path in paths.items():
+        novas[fonte] = _linhas_anexadas(path, manifesto["arquivos"][fonte], fonte)
+        if novas[fonte] is None:
+            return None
+
+    # Dimensões: linhas novas só podem trazer chaves inéditas (após a
+    # normalização) e que não resolvem nomes ainda sem correspondência nas
+    # linhas já carregadas
+    if len(novas["clubes"]) or len(novas["jogadores"]):
+        j_novos, c_novos = preparar_dimensoes(novas["jogadores"], novas["clubes"])
+
+        chaves_c = set(c["clube"].dropna().map(normalizacao.chave))
+        if set(novas["clubes"]["Clube"].dropna().map(normalizacao.chave)) & chaves_c:
+            return None
+        # Seleções já conhecidas não são novas
+        c_novos = c_novos[~c_novos["clube"].map(normalizacao.chave).isin(chaves_c)]
+
+        sem_pais = set(df_all.loc[df_all["pais_clube_atual"].isna(), "Clube Atual"].dropna().astype(str))
+        sem_pais |= set(j_clubes.loc[j_clubes["pais"].isna(), "clube_revelador"].dropna())
+        if (normalizacao.dicionario_clubes(c_novos).ids(pd.Index(list(sem_pais), dtype=object)) >= 0).any():
+            return None
+
+        ids_novos = set(j_novos["id_jogador"])
+        ids_existentes = set(j_clubes["id_jogador"]) | set(df_all["ID Jogador"])
+        if ids_novos & ids_existentes:
+            return None
+
+        c = pd.concat([c, c_novos], ignore_index=True)
+        j_novos, _ = preparar_dimensoes(novas["jogadores"], c)
+        j_clubes = pd.concat([j_clubes, j_novos], ignore_index=True)
+
+    if len(novas["minutos"]):
+        df_novas = enriquecer_minutos(novas["minutos"], j_clubes, c)
+        if compacto:
+            df_novas, mem_novas = compactar(df_novas)
+            if df_novas["ID Jogador"].dtype != df_all["ID Jogador"].dtype:
+                return None
+            df_all, df_novas = _alinhar_categorias(df_all.copy(), df_novas)
+            cubo, _ = _alinhar_categorias(cubo.copy(), df_novas.copy())
+            memoria = memoria.copy()
+            memoria["Antes (bytes)"] += mem_novas["Antes (bytes)"].values
+        else:
+            df_novas = como_texto(df_novas)
+            memoria = memoria.copy()
+            memoria["Antes (bytes)"] += _memoria_por_coluna(df_novas).reindex(memoria["Coluna"]).values
+
+        df_all = pd.concat([df_all, df_novas], ignore_index=True)
+        cubo = atualizar_cubo(cubo, df_novas)
+        memoria["Depois (bytes)"] = _memoria_por_coluna(df_all).reindex(memoria["Coluna"]).values
+
+    log.info(
+        "Snapshot atualizado incrementalmente: +%d minutos, +%d jogadores, +%d clubes",
+        len(novas["minutos"]), len(novas["jogadores"]), len(novas["clubes"])
+    )
+    return (df_all, j_clubes, c, cubo, memoria), estado_arquivos(*paths.values())
+
+
+def anexar_delta_minutos(path_minutos: str, path_delta: str) -> int:
+    """
+    Anexa ao fim de `path_minutos` as linhas de um CSV delta com o mesmo
+    cabeçalho. No próximo carregamento elas entram pelo caminho
+    incremental. Retorna o número de linhas anexadas.
+    """
+    colunas = pd.read_csv(path_minutos, nrows=0).columns
+    delta = _ler_csv(path_delta).reindex(columns=colunas)
+
+    with open(path_minutos, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    delta.to_csv(path_minutos, mode="a", header=False, index=False)
+    return len(delta)
+
+
+# =========================================================
+# PONTO DE ENTRADA
+# =========================================================
+def carregar_dados(path_jogadores: str, path_clubes: str, path_minutos: str,
+                   versao: str = None, compacto: bool = True,
+                   dir_snapshot: str = DIR_SNAPSHOT, tamanho_lote: int = TAMANHO_LOTE):
+    """
+    Retorna (df_all, j_clubes, c, cubo, memoria), usando o snapshot em disco
+    quando a assinatura dos CSVs não mudou e reconstruindo-o caso contrário.
+
+    Com `compacto=True`, df_all usa categorias e inteiros estreitos
+    (ver `compactar`); `memoria` compara o uso de memória antes e depois.
+    Com `tamanho_lote`, a reconstrução compacta lê a minutagem em lotes
+    (ver `combinar_bases_em_lotes`).
+    """
+    if versao is None:
+        versao = assinatura_arquivos(path_jogadores, path_clubes, path_minutos)
+    chave = _chave_snapshot(versao, compacto)
+
+    tabelas = ler_snapshot(chave, dir_snapshot)
+    if tabelas is not None:
+        return tabelas
+
+    incremental = atualizar_incremental(path_jogadores, path_clubes, path_minutos, compacto, dir_snapshot)
+    if incremental is not None:
+        tabelas, estados = incremental
+    else:
+        if compacto and tamanho_lote:
+            df_all, j_clubes, c, memoria = combinar_bases_em_lotes(
+                path_jogadores, path_clubes, path_minutos, tamanho_lote
+            )
+        else:
+            df_all, j_clubes, c = combinar_bases(path_jogadores, path_clubes, path_minutos)
+            if compacto:
+                df_all, memoria = compactar(df_all)
+            else:
+                df_all = como_texto(df_all)
+                uso = _memoria_por_coluna(df_all)
+                memoria = pd.DataFrame({"Coluna": uso.index, "Antes (bytes)": uso.values, "Depois (bytes)": uso.values})
+
+        tabelas = (df_all, j_clubes, c, construir_cubo(df_all), memoria)
+        estados = estado_arquivos(path_jogadores, path_clubes, path_minutos)
+
+    manifesto = {"formato": VERSAO_SNAPSHOT, "compacto": compacto, "arquivos": estados}
+    try:
+        gravar_snapshot(chave, tabelas, dir_snapshot, manifesto,
+                        manter=(_chave_snapshot(versao, not compacto),))
+    except (OSError, ImportError):
+        # Sem permissão de escrita ou sem pyarrow: segue só com o cache em memória
+        pass
+    return tabelas
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Anexa um CSV delta à minutagem e atualiza o snapshot de forma incremental."
+    )
+    parser.add_argument("delta", help="CSV com as novas linhas (mesmo cabeçalho de minutos.csv)")
+    parser.add_argument("--jogadores", default="jogadores.csv")
+    parser.add_argument("--clubes", default="clubes.csv")
+    parser.add_argument("--minutos", default="minutos.csv")
+    parser.add_argument("--sem-compacto", action="store_true", help="snapshot sem o modo compacto")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    n = anexar_delta_minutos(args.minutos, args.delta)
+    print(f"{n} linhas anexadas a {args.minutos}")
+    carregar_dados(args.jogadores, args.clubes, args.minutos, compacto=not args.sem_compacto)
@@ -0,0 +1,109 @@
+"""
+Gerador de bases sintéticas (jogadores.csv, clubes.csv, minutos.csv) com o
+mesmo esquema das bases reais, para benchmarks em escala.
+
+As cardinalidades crescem com o número de linhas de minutagem a partir
+das proporções da base atual (~27 mil linhas, 10,6 mil jogadores,
+2,2 mil clubes, 11 campeonatos, 9 temporadas):
+- jogadores: ~2,6 linhas de minutagem por jogador
+- clubes e campeonatos: crescimento sublinear (raiz / raiz cúbica)
+- clubes reveladores e clubes atuais com distribuição de cauda longa
+  (poucas "academias" formam muitos jogadores)
+
+Uso:
+    python dados_sinteticos.py --linhas 1000000 --saida bench_1m
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+
+LINHAS_BASE = 27_290
+JOGADORES_BASE = 10_613
+CLUBES_BASE = 2_237
+CAMPEONATOS_BASE = 11
+ANOS_BASE = 9
+
+PAISES = [
+    "Brasil", "Argentina", "Portugal", "Espanha", "Inglaterra", "Alemanha", "França",
+    "Itália", "Holanda", "Bélgica", "Uruguai", "Colômbia", "Chile", "Paraguai", "México",
+    "Estados Unidos", "Japão", "Coreia do Sul", "Croácia", "Sérvia", "Suíça", "Áustria",
+    "Dinamarca", "Suécia", "Noruega", "Polônia", "República Tcheca", "Turquia", "Grécia",
+    "Escócia", "Nigéria", "Gana", "Senegal", "Costa do Marfim", "Marrocos", "Egito",
+    "Camarões", "Equador", "Peru", "Venezuela",
+]
+
+
+def _zipf(rng: np.random.Generator, n_itens: int, tamanho: int, a: float = 1.1) -> np.ndarray:
+    """Índices em [0, n_itens) com pesos ~ 1 / rank^a (cauda longa)."""
+    pesos = 1.0 / np.arange(1, n_itens + 1) ** a
+    pesos /= pesos.sum()
+    return rng.choice(n_itens, size=tamanho, p=pesos)
+
+
+def gerar_bases(n_linhas: int, seed: int = 42):
+    """Retorna (df_jogadores, df_clubes, df_minutos) com `n_linhas` de minutagem."""
+    rng = np.random.default_rng(seed)
+    escala = n_linhas / LINHAS_BASE
+
+    n_jogadores = max(100, int(JOGADORES_BASE * escala))
+    n_clubes = max(50, int(CLUBES_BASE * escala ** 0.5))
+    n_campeonatos = max(3, int(round(CAMPEONATOS_BASE * escala ** (1 / 3))))
+    n_anos = max(3, int(round(ANOS_BASE * escala ** 0.25)))
+
+    # Clubes
+    nomes_clubes = np.array([f"Clube {i:06d}" for i in range(n_clubes)], dtype=object)
+    df_clubes = pd.DataFrame({
+        "Clube": nomes_clubes,
+        "País": np.array(PAISES, dtype=object)[_zipf(rng, len(PAISES), n_clubes, a=0.8)],
+    })
+
+    # Jogadores (IDs únicos, não sequenciais)
+    ids = rng.choice(np.arange(1, max(3_000_000, n_jogadores * 3)), size=n_jogadores, replace=False)
+    df_jogadores = pd.DataFrame({
+        "Jogador": np.char.add("Jogador ", ids.astype(str)).astype(object),
+        "ID": ids,
+        "Clube Revelador": nomes_clubes[_zipf(rng, n_clubes, n_jogadores)],
+    })
+
+    # Minutagem
+    campeonatos = np.array([f"Liga {i:03d}" for i in range(n_campeonatos)], dtype=object)
+    anos = np.arange(2026 - n_anos, 2026)
+    idx_jog = rng.integers(0, n_jogadores, size=n_linhas)
+    df_minutos = pd.DataFrame({
+        "Campeonato": campeonatos[_zipf(rng, n_campeonatos, n_linhas, a=0.5)],
+        "Ano": rng.choice(anos, size=n_linhas),
+        "Jogador": df_jogadores["Jogador"].to_numpy()[idx_jog],
+        "ID": ids[idx_jog],
+        "Clube": nomes_clubes[_zipf(rng, n_clubes, n_linhas, a=0.9)],
+        "Minutos": rng.integers(0, 3421, size=n_linhas),
+    })
+
+    return df_jogadores, df_clubes, df_minutos
+
+
+def gravar_bases(n_linhas: int, saida: str, seed: int = 42) -> tuple:
+    """Gera e grava as três bases em `saida`; retorna os caminhos (jogadores, clubes, minutos)."""
+    os.makedirs(saida, exist_ok=True)
+    paths = tuple(os.path.join(saida, nome) for nome in ("jogadores.csv", "clubes.csv", "minutos.csv"))
+    for df, path in zip(gerar_bases(n_linhas, seed), paths):
+        df.to_csv(path, index=False)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera bases sintéticas com o esquema do dashboard.")
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="linhas de minutagem")
+    parser.add_argument("--saida", required=True, help="diretório de saída")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    paths = gravar_bases(args.linhas, args.saida, args.seed)
+    print("\n".join(paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Motor de filtros globais (barra lateral) baseado em índices de posição.
+
+Para cada coluna filtrável guardamos, por valor, o array ordenado das
+posições das linhas que têm aquele valor. Uma seleção vira a união dos
+arrays dos valores escolhidos, e as colunas são combinadas por
+interseção. O resultado é um array de posições (ou None quando nada é
+restringido), memoizado por seleção normalizada com descarte LRU.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+COLUNAS_FILTRO = ("Ano", "Campeonato", "pais_clube_revelador", "pais_clube_atual")
+
+# Colunas em que a opção "(Todos)" desliga o filtro
+COLUNAS_COM_TODOS = ("pais_clube_revelador", "pais_clube_atual")
+
+
+def normalizar_selecao(selecoes, valores_por_coluna: dict, tem_nulos: dict) -> tuple:
+    """
+    Converte as seleções da barra lateral (uma por coluna de COLUNAS_FILTRO)
+    em uma tupla hashable com um frozenset por coluna, ou None quando a
+    coluna não restringe nada (lista vazia, "(Todos)" ou todos os valores
+    sem nulos na coluna).
+    """
+    spec = []
+    for col, sel in zip(COLUNAS_FILTRO, selecoes):
+        if not sel or (col in COLUNAS_COM_TODOS and "(Todos)" in sel):
+            spec.append(None)
+            continue
+        valores = frozenset(sel)
+        if not tem_nulos[col] and valores.issuperset(valores_por_coluna[col]):
+            spec.append(None)
+        else:
+            spec.append(valores)
+    return tuple(spec)
+
+
+class MotorFiltros:
+    """
+    Índice valor -> posições para COLUNAS_FILTRO de um DataFrame imutável.
+    Pode ser compartilhado entre sessões (o cache LRU é protegido por lock).
+    """
+
+    def __init__(self, df: pd.DataFrame, max_entradas: int = 64):
+        self.n_linhas = len(df)
+        self.max_entradas = max_entradas
+        self._indices = {}
+        self._tem_nulos = {}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        for col in COLUNAS_FILTRO:
+            codigos, valores = pd.factorize(df[col], sort=True)
+            ordem = np.argsort(codigos, kind="stable").astype(np.int64)
+            limites = np.searchsorted(codigos[ordem], np.arange(len(valores) + 1))
+            self._indices[col] = {
+                valor: ordem[limites[i]:limites[i + 1]]
+                for i, valor in enumerate(valores.tolist())
+            }
+            self._tem_nulos[col] = bool((codigos < 0).any())
+
+    # -----------------------------------------------------
+    # Normalização da seleção
+    # -----------------------------------------------------
+    def normalizar(self, anos_sel, camp_sel, pais_rev_sel, pais_at_sel) -> tuple:
+        """Seleções da barra lateral -> spec hashable (ver `normalizar_selecao`)."""
+        return normalizar_selecao(
+            (anos_sel, camp_sel, pais_rev_sel, pais_at_sel),
+            {col: indice.keys() for col, indice in self._indices.items()},
+            self._tem_nulos,
+        )
+
+    # -----------------------------------------------------
+    # Consulta
+    # -----------------------------------------------------
+    def posicoes(self, spec: tuple):
+        """
+        Retorna o array ordenado de posições que atendem a `spec`
+        (ver `normalizar`), ou None se nenhuma coluna restringe.
+        """
+        if all(valores is None for valores in spec):
+            return None
+
+        with self._lock:
+            if spec in self._cache:
+                self._cache.move_to_end(spec)
+                return self._cache[spec]
+
+        por_coluna = []
+        for col, valores in zip(COLUNAS_FILTRO, spec):
+            if valores is None:
+                continue
+            indice = self._indices[col]
+            partes = [indice[v] for v in valores if v in indice]
+            por_coluna.append(np.sort(np.concatenate(partes)) if partes else np.empty(0, dtype=np.int64))
+
+        # Interseção começando pela coluna mais seletiva
+        por_coluna.sort(key=len)
+        pos = por_coluna[0]
+        for outra in por_coluna[1:]:
+            if len(pos) == 0:
+                break
+            pos = np.intersect1d(pos, outra, assume_unique=True)
+
+        with self._lock:
+            self._cache[spec] = pos
+            while len(self._cache) > self.max_entradas:
+                self._cache.popitem(last=False)
+        return pos
+
+    def aplicar(self, df: pd.DataFrame, spec: tuple) -> pd.DataFrame:
+        """
+        Aplica `spec` a `df` (o mesmo DataFrame usado na construção).
+        Sem restrição, devolve o próprio `df`, sem cópia.
+        """
+        pos = self.posicoes(spec)
+        if pos is None:
+            return df
+        return df.take(pos)
@@ -0,0 +1,203 @@
+"""
+Rede de fluxos de talentos entre clubes.
+
+Cada grupo do cubo liga um Clube Revelador a um Clube Atual, com peso em
+minutos. A rede guarda essas arestas uma única vez como uma matriz
+esparsa clube x clube (formato coordenado, ordenado por origem e
+destino) com o campeonato e o ano de cada entrada, mais:
+- ponteiros por origem (linhas, como CSR) e por destino (colunas, como
+  CSC), para "onde atuam os formados de X" e "de onde vêm os jogadores
+  de Y" sem percorrer a rede inteira
+- o par (origem, destino) de cada entrada, para os maiores fluxos com um
+  único bincount
+- um rollup esparso país x país por (campeonato, ano)
+
+Fatias por campeonato e ano são máscaras sobre as entradas já
+selecionadas; nenhuma consulta reagrupa as linhas originais.
+"""
+
+import numpy as np
+import pandas as pd
+
+from agregacoes import rollup
+
+
+def _ponteiros(chaves_ordenadas: np.ndarray, n: int) -> np.ndarray:
+    """Início de cada chave 0..n-1 em um vetor ordenado (n + 1 posições)."""
+    return np.searchsorted(chaves_ordenadas, np.arange(n + 1))
+
+
+class RedeFluxos:
+    """
+    Rede imutável construída a partir de um cubo com Campeonato, Ano,
+    Clube Revelador, pais_clube_revelador, Clube Atual, pais_clube_atual
+    e Minutos. Nos métodos, `campeonato=None` e `ano=None` não restringem.
+    """
+
+    def __init__(self, cubo: pd.DataFrame):
+        por = rollup(cubo, ["Clube Revelador", "Clube Atual", "Campeonato", "Ano"])
+
+        # Dimensão única de clubes (reveladores e atuais), em ordem alfabética
+        cod_rev, nomes_rev = pd.factorize(por["Clube Revelador"], sort=True)
+        cod_at, nomes_at = pd.factorize(por["Clube Atual"], sort=True)
+        nomes_rev, nomes_at = pd.Index(nomes_rev.astype(str)), pd.Index(nomes_at.astype(str))
+        self.clubes = nomes_rev.union(nomes_at)
+        origem = self.clubes.get_indexer(nomes_rev)[cod_rev].astype("int32")
+        destino = self.clubes.get_indexer(nomes_at)[cod_at].astype("int32")
+
+        cod_camp, campeonatos = pd.factorize(por["Campeonato"], sort=True)
+        cod_ano, anos = pd.factorize(por["Ano"].astype("int64"), sort=True)
+        self.campeonatos = pd.Index(campeonatos.astype(str))
+        self.anos = pd.Index(anos)
+
+        ordem = np.lexsort((cod_ano, cod_camp, destino, origem))
+        self._origem = origem[ordem]
+        self._destino = destino[ordem]
+        self._campeonato = cod_camp[ordem].astype("int16")
+        self._ano = cod_ano[ordem].astype("int16")
+        self._minutos = por["Minutos"].to_numpy(dtype="int64")[ordem]
+
+        n = len(self.clubes)
+        self._ptr_origem = _ponteiros(self._origem, n)
+        self._ordem_destino = np.argsort(self._destino, kind="stable")
+        self._ptr_destino = _ponteiros(self._destino[self._ordem_destino], n)
+
+        # Entradas do mesmo (origem, destino) são contíguas (cubo vazio: nenhum par)
+        novo_par = np.zeros(len(self._origem), dtype=bool)
+        novo_par[:1] = True
+        novo_par[1:] = (np.diff(self._origem) != 0) | (np.diff(self._destino) != 0)
+        self._par = np.cumsum(novo_par) - 1
+        self._par_origem = self._origem[novo_par]
+        self._par_destino = self._destino[novo_par]
+
+        self._montar_paises(cubo)
+
+    def _montar_paises(self, cubo: pd.DataFrame):
+        """País de cada clube e o rollup país x país por (campeonato, ano)."""
+        partes = [
+            cubo[[clube, pais]].dropna().drop_duplicates(clube).set_axis(["clube", "pais"], axis=1)
+            for clube, pais in [("Clube Revelador", "pais_clube_revelador"), ("Clube Atual", "pais_clube_atual")]
+        ]
+        paises = pd.concat(partes, ignore_index=True).astype(str).drop_duplicates("clube")
+        self.paises = pd.Index(sorted(paises["pais"].unique()))
+
+        self._pais_clube = np.full(len(self.clubes), -1, dtype="int32")
+        posicoes = self.clubes.get_indexer(paises["clube"])
+        achados = posicoes >= 0
+        self._pais_clube[posicoes[achados]] = self.paises.get_indexer(paises["pais"])[achados]
+
+        # Rollup esparso: uma entrada por (campeonato, ano, país de origem, país de destino)
+        p_orig, p_dest = self._pais_clube[self._origem], self._pais_clube[self._destino]
+        com_pais = (p_orig >= 0) & (p_dest >= 0)
+        n_paises, n_anos = len(self.paises), len(self.anos)
+        chave = (
+            (self._campeonato[com_pais].astype("int64") * n_anos + self._ano[com_pais]) * n_paises
+            + p_orig[com_pais]
+        ) * n_paises + p_dest[com_pais]
+        chaves, inverso = np.unique(chave, return_inverse=True)
+        self._paises_minutos = np.bincount(inverso, weights=self._minutos[com_pais]).astype("int64")
+        fatia, self._paises_destino = np.divmod(chaves, n_paises)
+        fatia, self._paises_origem = np.divmod(fatia, n_paises)
+        self._paises_campeonato, self._paises_ano = np.divmod(fatia, n_anos)
+
+    def __sizeof__(self) -> int:
+        return sum(v.nbytes for v in vars(self).values() if isinstance(v, np.ndarray))
+
+    def __len__(self) -> int:
+        return len(self._minutos)
+
+    # -----------------------------------------------------
+    # Fatias por campeonato e ano
+    # -----------------------------------------------------
+    def _codigo(self, dimensao: pd.Index, valor):
+        """Código de `valor` na dimensão; None se não restringe, -1 se não existe."""
+        if valor is None:
+            return None
+        return int(dimensao.get_indexer([valor])[0])
+
+    def _mascara(self, posicoes, campeonato, ano):
+        """Máscara das entradas `posicoes` (slice ou vetor) que caem na fatia."""
+        n = len(range(*posicoes.indices(len(self)))) if isinstance(posicoes, slice) else len(posicoes)
+        mascara = np.ones(n, dtype=bool)
+        for dimensao, valor, codigos in [
+            (self.campeonatos, campeonato, self._campeonato),
+            (self.anos, ano, self._ano),
+        ]:
+            codigo = self._codigo(dimensao, valor)
+            if codigo is not None:
+                mascara &= codigos[posicoes] == codigo
+        return mascara
+
+    def _somar(self, chaves: np.ndarray, minutos: np.ndarray, coluna: str) -> pd.DataFrame:
+        """Minutos por clube (`chaves`), com o país, do maior para o menor."""
+        unicos, inverso = np.unique(chaves, return_inverse=True)
+        soma = np.bincount(inverso, weights=minutos, minlength=len(unicos)).astype("int64")
+        pais = self._pais_clube[unicos]
+        df = pd.DataFrame({
+            coluna: self.clubes[unicos],
+            "País": np.where(pais >= 0, self.paises.to_numpy()[np.maximum(pais, 0)], None),
+            "Minutos": soma,
+        })
+        return df.sort_values(["Minutos", coluna], ascending=[False, True], kind="stable").reset_index(drop=True)
+
+    # -----------------------------------------------------
+    # Linhas e colunas
+    # -----------------------------------------------------
+    def destinos(self, clube: str, campeonato: str = None, ano: int = None) -> pd.DataFrame:
+        """Onde atuam os formados em `clube`: Clube Atual, País, Minutos."""
+        i = self.clubes.get_indexer([clube])[0]
+        linha = slice(self._ptr_origem[i], self._ptr_origem[i + 1]) if i >= 0 else slice(0, 0)
+        mascara = self._mascara(linha, campeonato, ano)
+        return self._somar(self._destino[linha][mascara], self._minutos[linha][mascara], "Clube Atual")
+
+    def origens(self, clube: str, campeonato: str = None, ano: int = None) -> pd.DataFrame:
+        """De onde vêm os jogadores de `clube`: Clube Revelador, País, Minutos."""
+        i = self.clubes.get_indexer([clube])[0]
+        coluna = self._ordem_destino[self._ptr_destino[i]:self._ptr_destino[i + 1]] if i >= 0 else np.array([], "int64")
+        mascara = self._mascara(coluna, campeonato, ano)
+        return self._somar(self._origem[coluna][mascara], self._minutos[coluna][mascara], "Clube Revelador")
+
+    # -----------------------------------------------------
+    # Maiores fluxos e países
+    # -----------------------------------------------------
+    def principais(self, k: int = 20, campeonato: str = None, ano: int = None,
+                   mesmo_clube: bool = True) -> pd.DataFrame:
+        """
+        Os k maiores fluxos (Clube Revelador, Clube Atual, Minutos) da
+        fatia; `mesmo_clube=False` ignora quem atua no próprio clube revelador.
+        """
+        mascara = self._mascara(slice(None), campeonato, ano)
+        soma = np.bincount(
+            self._par[mascara], weights=self._minutos[mascara], minlength=len(self._par_origem)
+        ).astype("int64")
+        if not mesmo_clube:
+            soma[self._par_origem == self._par_destino] = 0
+
+        candidatos = np.flatnonzero(soma > 0)
+        top = candidatos[np.argsort(-soma[candidatos], kind="stable")[:k]]
+        return pd.DataFrame({
+            "Clube Revelador": self.clubes[self._par_origem[top]],
+            "Clube Atual": self.clubes[self._par_destino[top]],
+            "Minutos": soma[top],
+        })
+
+    def matriz_paises(self, campeonato: str = None, ano: int = None) -> pd.DataFrame:
+        """Minutos por país do clube revelador (linhas) e do clube atual (colunas)."""
+        mascara = np.ones(len(self._paises_minutos), dtype=bool)
+        for dimensao, valor, codigos in [
+            (self.campeonatos, campeonato, self._paises_campeonato),
+            (self.anos, ano, self._paises_ano),
+        ]:
+            codigo = self._codigo(dimensao, valor)
+            if codigo is not None:
+                mascara &= codigos == codigo
+        n_paises = len(self.paises)
+        celulas = self._paises_origem[mascara] * n_paises + self._paises_destino[mascara]
+        soma = np.bincount(celulas, weights=self._paises_minutos[mascara], minlength=n_paises ** 2)
+        matriz = pd.DataFrame(
+            soma.astype("int64").reshape(n_paises, n_paises),
+            index=self.paises.rename("País revelador"),
+            columns=self.paises.rename("País atual"),
+        )
+        # Só os países que aparecem na fatia
+        return matriz.loc[matriz.sum(axis=1) > 0, matriz.sum(axis=0) > 0]
@@ -0,0 +1,139 @@
+"""
+Índice de jogadores para a visão Jogadores.
+
+- ID -> intervalo no vetor de posições ordenado por ID, para obter as
+  linhas de um jogador em tempo constante (mais um `take` do tamanho
+  da carreira dele)
+- nomes normalizados (sem acento, minúsculos) ordenados, para busca por
+  prefixo do nome completo ou de qualquer palavra via bisect
+- busca aproximada (difflib) como último recurso para erros de digitação
+"""
+
+import difflib
+import re
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+
+def normalizar_nome(texto) -> str:
+    """Remove acentos, caixa e espaços repetidos: "  João  Félix" -> "joao felix"."""
+    texto = unicodedata.normalize("NFKD", str(texto))
+    texto = "".join(ch for ch in texto if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", texto).strip().casefold()
+
+
+def _buscar_prefixo(chaves: list, ids: list, prefixo: str):
+    """Percorre, a partir do bisect, as chaves ordenadas que começam com `prefixo`."""
+    i = bisect_left(chaves, prefixo)
+    while i < len(chaves) and chaves[i].startswith(prefixo):
+        yield ids[i]
+        i += 1
+
+
+class IndiceJogadores:
+    """
+    Índice imutável construído uma vez por versão dos dados a partir de
+    df_all; as posições retornadas referem-se às linhas de df_all.
+    """
+
+    def __init__(self, df_all: pd.DataFrame):
+        ids = df_all["ID Jogador"].to_numpy()
+        self.ordem = np.argsort(ids, kind="stable")
+        ids_ordenados = ids[self.ordem]
+
+        # Fronteiras de cada ID no vetor ordenado
+        inicio = np.flatnonzero(np.r_[True, ids_ordenados[1:] != ids_ordenados[:-1]])
+        fim = np.r_[inicio[1:], len(ids_ordenados)]
+        chaves_id = ids_ordenados[inicio].tolist()
+        self._intervalos = dict(zip(chaves_id, zip(inicio.tolist(), fim.tolist())))
+        self._id_por_texto = {str(i): i for i in chaves_id}
+
+        # Nome de cada jogador (primeira linha em que aparece)
+        nomes = df_all["Nome Jogador"].to_numpy()[self.ordem[inicio]]
+        self.nomes = dict(zip(chaves_id, (str(n) for n in nomes)))
+
+        # Nome completo normalizado e cada palavra do nome, ordenados
+        completos, palavras = [], []
+        for id_jog, nome in self.nomes.items():
+            norm = normalizar_nome(nome)
+            completos.append((norm, id_jog))
+            palavras.extend((p, id_jog) for p in set(norm.split()))
+        completos.sort(key=lambda x: x[0])
+        palavras.sort(key=lambda x: x[0])
+
+        self._nomes_norm = [n for n, _ in completos]
+        self._ids_nomes = [i for _, i in completos]
+        self._palavras = [p for p, _ in palavras]
+        self._ids_palavras = [i for _, i in palavras]
+
+        self._ids_por_nome = {}
+        for norm, id_jog in completos:
+            self._ids_por_nome.setdefault(norm, []).append(id_jog)
+
+    def __len__(self) -> int:
+        return len(self.nomes)
+
+    def rotulo(self, id_jog) -> str:
+        return f"{self.nomes[id_jog]} (ID {id_jog})"
+
+    def posicoes(self, id_jog, pos_filtro=None) -> np.ndarray:
+        """
+        Posições (em df_all) das linhas do jogador. Se `pos_filtro` (array
+        ordenado de posições do motor de filtros) for informado, mantém
+        apenas as linhas que passam nos filtros globais.
+        """
+        intervalo = self._intervalos.get(id_jog)
+        if intervalo is None:
+            return np.empty(0, dtype=np.int64)
+        pos = np.sort(self.ordem[intervalo[0]:intervalo[1]])
+        if pos_filtro is not None:
+            if len(pos_filtro) == 0:
+                return pos[:0]
+            idx = np.minimum(np.searchsorted(pos_filtro, pos), len(pos_filtro) - 1)
+            pos = pos[pos_filtro[idx] == pos]
+        return pos
+
+    def buscar(self, consulta: str, limite: int = 20, aceitar=None) -> list:
+        """
+        Retorna até `limite` IDs para a consulta, nesta ordem de prioridade:
+        ID exato, prefixo do nome completo, prefixo de uma palavra do nome
+        e, se nada for encontrado, nomes parecidos (difflib).
+        `aceitar(id)` permite descartar jogadores fora dos filtros.
+        """
+        consulta = consulta.strip()
+        if not consulta:
+            return []
+
+        norm = normalizar_nome(consulta)
+        fontes = []
+        if consulta in self._id_por_texto:
+            fontes.append([self._id_por_texto[consulta]])
+        fontes.append(_buscar_prefixo(self._nomes_norm, self._ids_nomes, norm))
+        if " " not in norm:
+            fontes.append(_buscar_prefixo(self._palavras, self._ids_palavras, norm))
+
+        resultado, vistos = [], set()
+
+        def adicionar(ids):
+            for id_jog in ids:
+                if id_jog in vistos or (aceitar is not None and not aceitar(id_jog)):
+                    continue
+                vistos.add(id_jog)
+                resultado.append(id_jog)
+                if len(resultado) >= limite:
+                    return True
+            return False
+
+        for ids in fontes:
+            if adicionar(ids):
+                return resultado
+
+        if not resultado:
+            parecidos = difflib.get_close_matches(norm, self._ids_por_nome.keys(), n=limite, cutoff=0.75)
+            for nome in parecidos:
+                if adicionar(self._ids_por_nome[nome]):
+                    break
+        return resultado
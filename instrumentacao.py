@@ -0,0 +1,175 @@
+"""
+Instrumentação opcional do tempo de cada seção do dashboard.
+
+Ativada pelo checkbox "⏱️ Instrumentação" da barra lateral, pela variável
+de ambiente DASH_INSTRUMENTACAO=1 ou pelo parâmetro ?debug=1 na URL.
+Cada execução (rerun completo ou de fragmento) vira um registro com o
+tempo de cada seção nomeada e eventos como cache hit/miss, guardado em um
+buffer circular por sessão. O painel mostra p50/p95 por seção e exporta
+o buffer em JSON lines.
+
+Desativada, `secao()` devolve um context manager vazio compartilhado:
+o custo é uma consulta ao session_state por seção.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+CHAVE_ATIVO = "instrumentacao"
+CHAVE_BUFFER = "_instrumentacao_buffer"
+CHAVE_ATUAL = "_instrumentacao_atual"
+TAMANHO_BUFFER = 200
+
+_NULO = contextlib.nullcontext()
+
+
+def ativo() -> bool:
+    # Fora de uma execução do script (ex.: thread de aquecimento) não há sessão
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return False
+    if CHAVE_ATIVO not in st.session_state:
+        st.session_state[CHAVE_ATIVO] = (
+            os.environ.get("DASH_INSTRUMENTACAO") == "1"
+            or st.query_params.get("debug") == "1"
+        )
+    return st.session_state[CHAVE_ATIVO]
+
+
+# =========================================================
+# REGISTRO DAS EXECUÇÕES
+# =========================================================
+def iniciar_execucao(tipo: str = "completa"):
+    """Abre o registro de uma execução (chamar no topo do script)."""
+    if not ativo():
+        return
+    st.session_state[CHAVE_ATUAL] = {
+        "inicio": datetime.now().isoformat(timespec="milliseconds"),
+        "tipo": tipo,
+        "secoes": {},
+        "eventos": {},
+        "_t0": time.perf_counter(),
+    }
+
+
+def finalizar_execucao():
+    """Fecha o registro atual e o guarda no buffer circular da sessão."""
+    registro = st.session_state.pop(CHAVE_ATUAL, None)
+    if registro is None:
+        return
+    registro["secoes"]["total"] = (time.perf_counter() - registro.pop("_t0")) * 1000
+    if CHAVE_BUFFER not in st.session_state:
+        st.session_state[CHAVE_BUFFER] = deque(maxlen=TAMANHO_BUFFER)
+    st.session_state[CHAVE_BUFFER].append(registro)
+
+
+@contextlib.contextmanager
+def _cronometro(registro: dict, nome: str):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        decorrido = (time.perf_counter() - inicio) * 1000
+        registro["secoes"][nome] = registro["secoes"].get(nome, 0.0) + decorrido
+
+
+def secao(nome: str):
+    """
+    Context manager que soma o tempo do bloco à seção `nome` da execução
+    atual. Sem instrumentação ativa, não faz nada.
+    """
+    registro = st.session_state.get(CHAVE_ATUAL) if ativo() else None
+    if registro is None:
+        return _NULO
+    return _cronometro(registro, nome)
+
+
+def evento(nome: str, valor):
+    """Registra um evento da execução atual (ex.: "carregar_dados" -> "miss")."""
+    registro = st.session_state.get(CHAVE_ATUAL) if ativo() else None
+    if registro is not None:
+        registro["eventos"][nome] = valor
+
+
+def instrumentar_visao(nome: str):
+    """
+    Decorador para as visões (fragmentos). Mede o tempo total da visão e,
+    quando ela é reexecutada sozinha (rerun do fragmento), abre e fecha um
+    registro próprio.
+    """
+    def decorador(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ativo():
+                return func(*args, **kwargs)
+            isolada = CHAVE_ATUAL not in st.session_state
+            if isolada:
+                iniciar_execucao(f"fragmento: {nome}")
+            try:
+                with secao(f"{nome}: total"):
+                    return func(*args, **kwargs)
+            finally:
+                if isolada:
+                    finalizar_execucao()
+        return wrapper
+    return decorador
+
+
+# =========================================================
+# PAINEL
+# =========================================================
+def resumo_percentis(registros) -> pd.DataFrame:
+    """p50/p95 (ms) e número de amostras por seção."""
+    tempos = {}
+    for registro in registros:
+        for nome, ms in registro["secoes"].items():
+            tempos.setdefault(nome, []).append(ms)
+    linhas = [
+        {
+            "Seção": nome,
+            "p50 (ms)": round(float(np.percentile(valores, 50)), 1),
+            "p95 (ms)": round(float(np.percentile(valores, 95)), 1),
+            "Amostras": len(valores),
+        }
+        for nome, valores in tempos.items()
+    ]
+    return pd.DataFrame(linhas, columns=["Seção", "p50 (ms)", "p95 (ms)", "Amostras"]).sort_values(
+        "p50 (ms)", ascending=False
+    )
+
+
+def painel():
+    """Checkbox de ativação e, se ativo, o painel de p50/p95 na barra lateral."""
+    st.sidebar.checkbox("⏱️ Instrumentação", key=CHAVE_ATIVO)
+    if not ativo():
+        return
+
+    registros = list(st.session_state.get(CHAVE_BUFFER, []))
+    with st.sidebar.expander(f"⏱️ Tempos por seção ({len(registros)} execuções)", expanded=True):
+        if not registros:
+            st.caption("Sem execuções registradas ainda.")
+            return
+
+        st.dataframe(resumo_percentis(registros), use_container_width=True, hide_index=True)
+
+        eventos = pd.DataFrame([r["eventos"] for r in registros])
+        for col in eventos.columns:
+            contagem = eventos[col].value_counts().to_dict()
+            st.caption(f"{col}: " + ", ".join(f"{k}={v}" for k, v in contagem.items()))
+
+        st.download_button(
+            "Exportar (JSON lines)",
+            "\n".join(json.dumps(r, ensure_ascii=False) for r in registros),
+            file_name="instrumentacao.jsonl",
+            mime="application/jsonl",
+        )
@@ -0,0 +1,300 @@
+"""
+Normalização das chaves de clubes e campeonatos na ingestão.
+
+Os CSVs nem sempre escrevem o mesmo clube (ou campeonato) da mesma forma:
+espaços sobrando ("Bundesliga "), acentos e caixa ("Sampaio Corrêa" x
+"Sampaio Correa"), apóstrofos diferentes e nomes alternativos ("SC Braga"
+x "Sporting Braga"). Sem tratamento, a junção com clubes.csv deixa o país
+vazio e as linhas somem dos filtros de país e dos rankings, e variantes
+do mesmo nome viram categorias diferentes.
+
+Cada dimensão tem um dicionário canônico (DicionarioCanonico): os nomes
+canônicos e um índice hash chave normalizada -> ID canônico, montado uma
+vez com os próprios nomes e a tabela curada de aliases. Na junção só os
+valores distintos passam pelo índice; cada linha custa um take.
+
+- clubes: os de clubes.csv, mais as seleções (cada país da base, quando
+  não há clube com o mesmo nome), e ALIASES_CLUBES
+- países: a grafia mais frequente de cada país em clubes.csv e ALIASES_PAISES
+- campeonatos: CAMPEONATOS e ALIASES_CAMPEONATOS
+
+Valores sem correspondência seguem com o nome limpo (sem espaços
+sobrando) e o país vazio. `relatorio_juncoes` mostra a cobertura de cada
+junção e as chaves sem correspondência:
+
+    python normalizacao.py [--jogadores ...] [--clubes ...] [--minutos ...]
+"""
+
+import hashlib
+import logging
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+log = logging.getLogger(__name__)
+
+
+# Campeonatos canônicos (como aparecem no dashboard)
+CAMPEONATOS = (
+    "Brasileirão",
+    "Brasileiro Série B",
+    "Bundesliga",
+    "Copa do Mundo",
+    "Copa do Mundo de Clubes",
+    "Italiano Seria A",
+    "La Liga",
+    "Liga Portuguesa",
+    "Ligue 1",
+    "Paulista A1",
+    "Premier League",
+)
+
+# Alias -> nome canônico. Espaços, caixa, acentos e apóstrofos já são
+# tratados pela chave normalizada; aqui ficam só os nomes alternativos.
+ALIASES_CAMPEONATOS = {
+    "Brasileiro Série A": "Brasileirão",
+    "Italiano Serie A": "Italiano Seria A",
+}
+
+ALIASES_CLUBES = {
+    # Alemanha
+    "1. FC Heidenheim 1846": "Heidenheim",
+    "1. FC Union Berlin": "Union Berlin",
+    "FC St. Pauli": "St. Pauli",
+    "Hertha BSC": "Hertha Berlin",
+    "Holstein Kiel": "Holsten Kiel",
+    "SC Freiburg": "Freiburg",
+    "VfL Bochum": "Bochum",
+    # Brasil
+    "EC Água Santa": "Água Santa",
+    # Espanha
+    "Athletic": "Athletic Bilbao",
+    "Atlético de Madrid": "Atlético Madrid",
+    "Celta de Vigo": "Celta",
+    "FC Barcelona": "Barcelona",
+    # França
+    "AC Ajaccio": "Ajaccio",
+    "Paris SG": "PSG",
+    # Inglaterra
+    "AFC Bournemouth": "Bournemouth",
+    # Itália
+    "Como 1907": "Como",
+    # Portugal
+    "Casa Pia AC": "Casa Pia",
+    "Est. Amadora": "Estrela Amadora",
+    "FC Famalicão": "Famalicão",
+    "SC Braga": "Sporting Braga",
+    "Vitória SC": "Vitória de Guimarães",
+    # Outros (Copa do Mundo de Clubes e seleções)
+    "Inter Miami CF": "Inter Miami",
+    "Sundowns": "Mamelodi Sundowns",
+    "Bósnia-Herzgovina": "Bósnia",
+}
+
+ALIASES_PAISES = {
+    "Belarus": "Bielorrússia",
+}
+
+# Entra na assinatura dos dados: editar as tabelas acima invalida os snapshots
+ASSINATURA = hashlib.sha1(
+    repr((
+        CAMPEONATOS, sorted(ALIASES_CAMPEONATOS.items()), sorted(ALIASES_CLUBES.items()), sorted(ALIASES_PAISES.items())
+    )).encode("utf-8")
+).hexdigest()[:8]
+
+# Formas de correspondência de cada valor (ver DicionarioCanonico.resolver)
+SEM_CORRESPONDENCIA, EXATA, NORMALIZADA, ALIAS = -1, 0, 1, 2
+FORMAS = {EXATA: "Exatas", NORMALIZADA: "Normalizadas", ALIAS: "Por alias", SEM_CORRESPONDENCIA: "Sem correspondência"}
+
+_APOSTROFOS = str.maketrans({"´": "'", "`": "'", "‘": "'", "’": "'"})
+
+
+# =========================================================
+# CHAVES
+# =========================================================
+def limpar(valor) -> str:
+    """Nome sem espaços nas pontas e com espaços internos simples."""
+    return " ".join(str(valor).split())
+
+
+def chave(valor) -> str:
+    """Chave de comparação: nome limpo, sem acentos, em caixa baixa e com apóstrofo único."""
+    decomposto = unicodedata.normalize("NFKD", limpar(valor).translate(_APOSTROFOS))
+    return "".join(ch for ch in decomposto if not unicodedata.combining(ch)).casefold()
+
+
+def _por_linha(tabela, codigos: np.ndarray) -> np.ndarray:
+    """tabela[codigos] com -1 (valor nulo no factorize) levando ao último item, o de ausência."""
+    return np.asarray(tabela)[codigos]
+
+
+# =========================================================
+# DICIONÁRIO CANÔNICO
+# =========================================================
+class DicionarioCanonico:
+    """
+    Nomes canônicos (ID = posição em `nomes`) e o índice
+    chave normalizada -> ID, com os nomes e os `aliases` (alias -> nome
+    canônico). Em chaves repetidas vale o primeiro nome; aliases nunca
+    sobrepõem um nome canônico.
+    """
+
+    def __init__(self, nomes, aliases: dict = None):
+        self.nomes = pd.Index(nomes)
+        self._exatos, self._indice = {}, {}
+        for i, nome in enumerate(self.nomes):
+            self._exatos.setdefault(nome, i)
+            self._indice.setdefault(chave(nome), (i, NORMALIZADA))
+        for alias, canonico in (aliases or {}).items():
+            alvo = self._indice.get(chave(canonico))
+            if alvo is None:
+                log.debug("Alias %r aponta para %r, que não está no dicionário", alias, canonico)
+                continue
+            self._indice.setdefault(chave(alias), (alvo[0], ALIAS))
+
+    def __len__(self) -> int:
+        return len(self.nomes)
+
+    def _resolver_distintos(self, distintos) -> tuple:
+        """(IDs, formas) de valores distintos: busca exata, depois pela chave."""
+        ids = np.full(len(distintos) + 1, -1, dtype="int64")
+        formas = np.full(len(distintos) + 1, SEM_CORRESPONDENCIA, dtype="int8")
+        for j, valor in enumerate(distintos):
+            if valor in self._exatos:
+                ids[j], formas[j] = self._exatos[valor], EXATA
+            else:
+                ids[j], formas[j] = self._indice.get(chave(valor), (-1, SEM_CORRESPONDENCIA))
+        return ids, formas
+
+    def resolver(self, valores) -> tuple:
+        """
+        (IDs, formas) por valor: ID canônico (-1 sem correspondência) e
+        como foi encontrado (EXATA, NORMALIZADA, ALIAS ou SEM_CORRESPONDENCIA).
+        """
+        codigos, distintos = pd.factorize(valores)
+        ids, formas = self._resolver_distintos(distintos)
+        return _por_linha(ids, codigos), _por_linha(formas, codigos)
+
+    def ids(self, valores) -> np.ndarray:
+        """ID canônico de cada valor, -1 sem correspondência."""
+        return self.resolver(valores)[0]
+
+    def canonizar(self, valores) -> pd.Categorical:
+        """
+        Nome canônico de cada valor (categórico). Sem correspondência, o
+        valor segue só limpo; nulos seguem nulos.
+        """
+        codigos, distintos = pd.factorize(valores)
+        ids, _ = self._resolver_distintos(distintos)
+        saida = pd.Categorical([
+            self.nomes[i] if i >= 0 else limpar(valor) for valor, i in zip(distintos, ids)
+        ])
+        return pd.Categorical.from_codes(_por_linha(np.append(saida.codes, -1), codigos), dtype=saida.dtype)
+
+
+def dicionario_paises(paises: pd.Series) -> DicionarioCanonico:
+    """
+    Dicionário dos países: a grafia mais frequente de cada chave (empate:
+    ordem alfabética) e ALIASES_PAISES. Nomes que são alias ficam de fora.
+    """
+    frequencia = paises.dropna().map(limpar).value_counts()
+    aliases = {chave(alias) for alias in ALIASES_PAISES}
+    nomes = {}
+    for pais in sorted(frequencia.index, key=lambda p: (-frequencia[p], p)):
+        if chave(pais) not in aliases:
+            nomes.setdefault(chave(pais), pais)
+    return DicionarioCanonico(list(nomes.values()), ALIASES_PAISES)
+
+
+def clubes_canonicos(c: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tabela de clubes (clube, pais) canônica: nomes de clube limpos, uma
+    linha por chave (vale a primeira), países canônicos e uma seleção por
+    país sem clube homônimo.
+    """
+    c = c.assign(
+        clube=c["clube"].map(limpar, na_action="ignore"),
+        pais=dicionario_paises(c["pais"]).canonizar(c["pais"]).astype("str"),
+    )
+    chaves = c["clube"].map(chave, na_action="ignore")
+    repetidas = chaves.duplicated() & chaves.notna()
+    if repetidas.any():
+        log.warning("%d clubes repetidos após normalizar o nome ignorados (vale o primeiro)", repetidas.sum())
+        c, chaves = c[~repetidas], chaves[~repetidas]
+
+    existentes = set(chaves.dropna())
+    selecoes = [pais for pais in c["pais"].dropna().unique() if chave(pais) not in existentes]
+    if not selecoes:
+        return c.reset_index(drop=True)
+    return pd.concat([c, pd.DataFrame({"clube": selecoes, "pais": selecoes})], ignore_index=True)
+
+
+def dicionario_clubes(c: pd.DataFrame) -> DicionarioCanonico:
+    """Dicionário dos clubes de `c` (já canônica) com ALIASES_CLUBES."""
+    return DicionarioCanonico(c["clube"], ALIASES_CLUBES)
+
+
+def dicionario_campeonatos() -> DicionarioCanonico:
+    return DicionarioCanonico(CAMPEONATOS, ALIASES_CAMPEONATOS)
+
+
+# =========================================================
+# RELATÓRIO DAS JUNÇÕES
+# =========================================================
+def _cobertura(juncao: str, valores: pd.Series, dicionario: DicionarioCanonico) -> tuple:
+    """Linha de cobertura da junção e as chaves sem correspondência (com o nº de linhas)."""
+    ids, formas = dicionario.resolver(valores)
+    presentes = valores.notna().to_numpy()
+    linha = {"Junção": juncao, "Linhas": int(presentes.sum())}
+    for forma, rotulo in FORMAS.items():
+        linha[rotulo] = int(((formas == forma) & presentes).sum())
+    linha["Cobertura (%)"] = round(100 * (1 - linha["Sem correspondência"] / max(linha["Linhas"], 1)), 2)
+
+    faltantes = valores[(ids < 0) & presentes].map(limpar).value_counts()
+    linha["Chaves sem correspondência"] = len(faltantes)
+    faltantes = faltantes.rename_axis("Valor").rename("Linhas").reset_index()
+    faltantes.insert(0, "Junção", juncao)
+    return linha, faltantes
+
+
+def relatorio_juncoes(df_jog: pd.DataFrame, df_clu: pd.DataFrame, df_min: pd.DataFrame) -> tuple:
+    """
+    Cobertura das junções das bases lidas (colunas originais dos CSVs):
+    - cobertura: por junção, linhas com correspondência exata, pela chave
+      normalizada, por alias e sem correspondência, e a cobertura (%)
+    - sem_correspondencia: Junção, Valor e Linhas de cada chave não
+      encontrada, da mais frequente para a menos
+    """
+    c = clubes_canonicos(df_clu.rename(columns={"Clube": "clube", "País": "pais"}))
+    clubes = dicionario_clubes(c)
+    partes = [
+        _cobertura("clubes: País -> países", df_clu["País"], dicionario_paises(df_clu["País"])),
+        _cobertura("jogadores: Clube Revelador -> clubes", df_jog["Clube Revelador"], clubes),
+        _cobertura("minutos: Clube -> clubes", df_min["Clube"], clubes),
+        _cobertura("minutos: Campeonato -> campeonatos", df_min["Campeonato"], dicionario_campeonatos()),
+    ]
+    cobertura = pd.DataFrame([linha for linha, _ in partes])
+    sem_correspondencia = pd.concat([faltantes for _, faltantes in partes], ignore_index=True)
+    return cobertura, sem_correspondencia
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import dados
+
+    parser = argparse.ArgumentParser(description="Cobertura das junções e chaves sem correspondência.")
+    parser.add_argument("--jogadores", default="jogadores.csv")
+    parser.add_argument("--clubes", default="clubes.csv")
+    parser.add_argument("--minutos", default="minutos.csv")
+    parser.add_argument("--limite", type=int, default=30, help="chaves sem correspondência listadas por junção")
+    args = parser.parse_args()
+
+    cobertura, sem_correspondencia = relatorio_juncoes(*dados.ler_bases(args.jogadores, args.clubes, args.minutos))
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(cobertura.to_string(index=False))
+        for juncao, df in sem_correspondencia.groupby("Junção", sort=False):
+            print(f"\n{juncao}: {len(df)} chaves sem correspondência")
+            print(df.head(args.limite).drop(columns="Junção").to_string(index=False))
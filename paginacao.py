@@ -0,0 +1,138 @@
+"""
+Tabelas paginadas para os detalhamentos grandes do dashboard.
+
+Ordenação, recorte e projeção de colunas são feitos no servidor, sobre o
+DataFrame já calculado (e guardado no cache) pela camada de consultas:
+só a página visível (e só as categorias que aparecem nela) é serializada
+em Arrow e enviada ao navegador. Um estilo, quando houver, é aplicado
+apenas às linhas da página.
+
+A permutação de cada ordenação fica guardada junto ao objeto de DataFrame
+(por referência fraca), então trocar de página não reordena a tabela
+inteira, e as permutações somem quando o cache da camada de consultas
+descarta a tabela.
+"""
+
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+TAMANHOS_PAGINA = [25, 50, 100, 250]
+TAMANHO_PADRAO = 50
+ORDEM_ORIGINAL = "(ordem original)"
+
+# id(tabela) -> (referência fraca à tabela, {(coluna, sentido): permutação}).
+# Não segura a tabela: a entrada é removida quando ela é coletada, então
+# o limite de memória do Armazem vale também para as permutações
+_ordens = {}
+_trava = threading.Lock()
+
+
+def _descartar(chave: int) -> None:
+    with _trava:
+        _ordens.pop(chave, None)
+
+
+# =========================================================
+# ORDENAÇÃO E RECORTE
+# =========================================================
+def _ordem(df: pd.DataFrame, coluna: str, crescente: bool) -> np.ndarray:
+    """Posições de df ordenado por `coluna` (ordenação estável, nulos no fim)."""
+    with _trava:
+        item = _ordens.get(id(df))
+        # Confere a identidade: o id pode ter sido reaproveitado
+        if item is not None and item[0]() is df:
+            ordem = item[1].get((coluna, crescente))
+            if ordem is not None:
+                return ordem
+
+    ordem = (
+        df[coluna].reset_index(drop=True)
+        .sort_values(ascending=crescente, na_position="last", kind="stable")
+        .index.to_numpy()
+    )
+    with _trava:
+        item = _ordens.get(id(df))
+        if item is None or item[0]() is not df:
+            item = _ordens[id(df)] = (weakref.ref(df), {})
+            weakref.finalize(df, _descartar, id(df))
+        item[1][(coluna, crescente)] = ordem
+    return ordem
+
+
+def recortar(df: pd.DataFrame, pagina: int, tamanho: int, coluna: str = None,
+             crescente: bool = True, colunas: list = None) -> pd.DataFrame:
+    """
+    Linhas da página `pagina` (a partir de 1) de df ordenado por `coluna`
+    (ou na ordem original), só com as `colunas` pedidas.
+    """
+    inicio = (pagina - 1) * tamanho
+    if coluna is None:
+        recorte = df.iloc[inicio:inicio + tamanho]
+    else:
+        recorte = df.iloc[_ordem(df, coluna, crescente)[inicio:inicio + tamanho]]
+    if colunas is not None:
+        recorte = recorte[colunas]
+
+    # O Arrow serializa o dicionário inteiro de cada categórica: a página
+    # leva só as categorias que aparecem nela
+    categoricas = [col for col in recorte.columns if isinstance(recorte[col].dtype, pd.CategoricalDtype)]
+    if categoricas:
+        recorte = recorte.assign(**{col: recorte[col].cat.remove_unused_categories() for col in categoricas})
+    return recorte
+
+
+# =========================================================
+# COMPONENTE
+# =========================================================
+def tabela_paginada(df: pd.DataFrame, chave: str, colunas: list = None, estilo=None):
+    """
+    Mostra df em páginas, com ordenação por coluna escolhida na tela.
+
+    - chave: prefixo das chaves dos widgets (único por tabela)
+    - colunas: projeção das colunas exibidas (padrão: todas)
+    - estilo: função que recebe o Styler da página e devolve o Styler
+
+    Tabelas que cabem na menor página são mostradas direto, sem controles.
+    """
+    colunas = list(df.columns) if colunas is None else colunas
+    total = len(df)
+
+    if total <= TAMANHOS_PAGINA[0]:
+        _mostrar(recortar(df, 1, total, colunas=colunas), estilo)
+        return
+
+    col_ord, col_sentido, col_tam, col_pag = st.columns([2, 1, 1, 1])
+    coluna = col_ord.selectbox("Ordenar por", [ORDEM_ORIGINAL] + colunas, key=f"{chave}_ordem")
+    decrescente = col_sentido.toggle("Decrescente", key=f"{chave}_decrescente")
+    tamanho = col_tam.selectbox(
+        "Linhas por página", TAMANHOS_PAGINA,
+        index=TAMANHOS_PAGINA.index(TAMANHO_PADRAO), key=f"{chave}_tamanho"
+    )
+
+    n_paginas = -(-total // tamanho)
+    chave_pagina = f"{chave}_pagina"
+    # A tabela pode ter encolhido (outro filtro, página maior) desde a última execução
+    if st.session_state.get(chave_pagina, 1) > n_paginas:
+        st.session_state[chave_pagina] = n_paginas
+    pagina = col_pag.number_input(
+        f"Página (de {n_paginas})", min_value=1, max_value=n_paginas, step=1, key=chave_pagina
+    )
+
+    recorte = recortar(
+        df, int(pagina), tamanho,
+        coluna=None if coluna == ORDEM_ORIGINAL else coluna,
+        crescente=not decrescente,
+        colunas=colunas,
+    )
+    inicio = (int(pagina) - 1) * tamanho
+    st.caption(f"Linhas {inicio + 1}–{inicio + len(recorte)} de {total}")
+    _mostrar(recorte, estilo)
+
+
+def _mostrar(recorte: pd.DataFrame, estilo):
+    st.dataframe(recorte if estilo is None else estilo(recorte.style), use_container_width=True)
@@ -0,0 +1,148 @@
+"""
+Geração em lote (sem Streamlit) de todos os relatórios do dashboard.
+
+Usa o mesmo carregamento (dados.carregar_dados, com snapshot) e as mesmas
+agregações (agregacoes) do app2.py e grava, em Parquet ou CSV:
+
+    <saida>/rankings/<campeonato>.<ext>          ranking anual com Δ Posição
+    <saida>/top5/<campeonato>.<ext>              Top 5 consolidado por ano
+    <saida>/perfis/<tabela>/parte-<n>.<ext>      perfis dos clubes reveladores
+
+O trabalho é distribuído em um pool de processos: uma tarefa por
+campeonato e uma por lote de clubes reveladores. Cada processo carrega o
+snapshot uma única vez.
+
+Uso:
+    python relatorios.py --saida relatorios --processos 8 --formato parquet
+"""
+
+import argparse
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import dados
+from agregacoes import perfis_clubes_reveladores, ranking_clubes_reveladores, top_k_consolidado
+
+
+# Estado de cada processo do pool (preenchido pelo initializer)
+_BASE = {}
+
+
+def nome_arquivo(texto: str) -> str:
+    """Nome seguro para arquivo: sem acentos, espaços viram "_"."""
+    texto = unicodedata.normalize("NFKD", str(texto).strip())
+    texto = "".join(ch for ch in texto if not unicodedata.combining(ch))
+    return re.sub(r"[^\w.-]+", "_", texto).strip("_") or "sem_nome"
+
+
+def _gravar(df, path: str, formato: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df = df.reset_index(drop=True)
+    if formato == "csv":
+        df.to_csv(f"{path}.csv", index=False)
+    else:
+        df.to_parquet(f"{path}.parquet", index=False)
+
+
+# =========================================================
+# PROCESSOS DO POOL
+# =========================================================
+def _iniciar_processo(paths: tuple, compacto: bool):
+    df_all, _, _, cubo, _ = dados.carregar_dados(*paths, compacto=compacto)
+    _BASE.update(df_all=df_all, cubo=cubo, ranking=None)
+
+
+def _ranking_global():
+    if _BASE["ranking"] is None:
+        _BASE["ranking"] = ranking_clubes_reveladores(_BASE["cubo"])
+    return _BASE["ranking"]
+
+
+def tarefa_campeonato(campeonato: str, saida: str, formato: str) -> str:
+    """Ranking anual e Top 5 consolidado de um campeonato."""
+    cubo = _BASE["cubo"]
+    cubo_camp = cubo[cubo["Campeonato"] == campeonato]
+    arquivo = nome_arquivo(campeonato)
+
+    ranking = ranking_clubes_reveladores(cubo_camp)
+    _gravar(ranking, os.path.join(saida, "rankings", arquivo), formato)
+
+    for camp, tabela in top_k_consolidado(cubo_camp, k=5).items():
+        _gravar(tabela, os.path.join(saida, "top5", nome_arquivo(camp)), formato)
+
+    return f"campeonato {campeonato}"
+
+
+def tarefa_perfis(n_lote: int, clubes: list, saida: str, formato: str) -> str:
+    """Perfis de um lote de clubes reveladores, uma parte por tabela."""
+    perfis = perfis_clubes_reveladores(_BASE["cubo"], _BASE["df_all"], _ranking_global(), clubes)
+    for tabela, df in perfis.items():
+        _gravar(df, os.path.join(saida, "perfis", tabela, f"parte-{n_lote:04d}"), formato)
+    return f"lote {n_lote} ({len(clubes)} clubes)"
+
+
+# =========================================================
+# EXECUÇÃO
+# =========================================================
+def gerar_relatorios(path_jogadores: str, path_clubes: str, path_minutos: str,
+                     saida: str = "relatorios", formato: str = "parquet",
+                     processos: int = None, tamanho_lote: int = 200,
+                     compacto: bool = True, verbose: bool = True) -> int:
+    """
+    Gera todos os relatórios em `saida` e retorna o número de tarefas.
+    O snapshot é montado (ou validado) antes de abrir o pool, para que os
+    processos apenas o leiam.
+    """
+    paths = (path_jogadores, path_clubes, path_minutos)
+    _, _, _, cubo, _ = dados.carregar_dados(*paths, compacto=compacto)
+
+    campeonatos = sorted(cubo["Campeonato"].dropna().astype(str).unique())
+    clubes = sorted(cubo["Clube Revelador"].dropna().astype(str).unique())
+    lotes = [clubes[i:i + tamanho_lote] for i in range(0, len(clubes), tamanho_lote)]
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=processos,
+        initializer=_iniciar_processo,
+        initargs=(paths, compacto),
+    ) as pool:
+        futuros = [pool.submit(tarefa_campeonato, camp, saida, formato) for camp in campeonatos]
+        futuros += [pool.submit(tarefa_perfis, n, lote, saida, formato) for n, lote in enumerate(lotes)]
+
+        for futuro in as_completed(futuros):
+            descricao = futuro.result()
+            if verbose:
+                print(f"[{time.perf_counter() - inicio:6.2f}s] {descricao}")
+
+    return len(futuros)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera em lote os rankings, Top 5 e perfis de clubes reveladores.")
+    parser.add_argument("--jogadores", default="jogadores.csv")
+    parser.add_argument("--clubes", default="clubes.csv")
+    parser.add_argument("--minutos", default="minutos.csv")
+    parser.add_argument("--saida", default="relatorios", help="diretório de saída")
+    parser.add_argument("--formato", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--processos", type=int, default=None, help="tamanho do pool (padrão: nº de CPUs)")
+    parser.add_argument("--lote", type=int, default=200, help="clubes reveladores por tarefa")
+    parser.add_argument("--sem-compacto", action="store_true", help="não usar o modo compacto")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    n = gerar_relatorios(
+        args.jogadores, args.clubes, args.minutos,
+        saida=args.saida,
+        formato=args.formato,
+        processos=args.processos,
+        tamanho_lote=args.lote,
+        compacto=not args.sem_compacto,
+    )
+    print(f"{n} tarefas concluídas em {time.perf_counter() - inicio:.2f}s -> {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
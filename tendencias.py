@@ -0,0 +1,200 @@
+"""
+Índice de tendências plurianuais dos clubes reveladores.
+
+Para cada campeonato (e para o conjunto de todos) guarda uma matriz
+clubes x anos com os minutos acumulados (soma de prefixos) ao longo de
+um eixo contínuo de anos. A soma de qualquer intervalo de anos é a
+diferença de duas colunas, então janelas móveis de N temporadas,
+acumulados desde um ano e rankings sobre um intervalo qualquer custam
+O(clubes), sem reagrupar o cubo.
+
+Os clubes de cada matriz ficam em ordem alfabética: uma ordenação
+estável por minutos desempata pelo nome, como nos rankings anuais.
+"""
+
+import numpy as np
+import pandas as pd
+
+from agregacoes import rollup
+
+
+class IndiceTendencias:
+    """
+    Índice imutável construído a partir de um cubo com Campeonato, Ano,
+    Clube Revelador, pais_clube_revelador e Minutos (ou um cubo mais
+    fino). `campeonato=None` nos métodos consulta todos os campeonatos.
+    """
+
+    def __init__(self, cubo: pd.DataFrame):
+        por = rollup(cubo, ["Campeonato", "Clube Revelador", "Ano"])
+        anos = por["Ano"].astype("int64").to_numpy()
+        self.anos = np.arange(anos.min(), anos.max() + 1) if len(anos) else np.array([], dtype="int64")
+        pos_ano = anos - self.anos[0] if len(anos) else anos
+
+        # Códigos inteiros em ordem alfabética (sem comparar textos por campeonato)
+        codigos, nomes = pd.factorize(por["Clube Revelador"], sort=True)
+        self._nomes = np.asarray(nomes.astype(str), dtype=object)
+        codigos_camp, campeonatos = pd.factorize(por["Campeonato"], sort=True)
+        minutos = por["Minutos"].to_numpy(dtype="int64")
+
+        self._prefixos = {None: self._acumular(codigos, pos_ano, minutos)}
+        self._anos_presentes = {None: self.anos[np.unique(pos_ano)]}
+        for i, camp in enumerate(campeonatos.astype(str)):
+            linhas = codigos_camp == i
+            self._prefixos[camp] = self._acumular(codigos[linhas], pos_ano[linhas], minutos[linhas])
+            self._anos_presentes[camp] = self.anos[np.unique(pos_ano[linhas])]
+
+        # País de cada clube para os rótulos "Clube (País)"
+        paises = cubo[["Clube Revelador", "pais_clube_revelador"]].dropna(subset=["Clube Revelador"])
+        paises = paises.drop_duplicates("Clube Revelador")
+        self.paises = dict(zip(paises["Clube Revelador"].astype(str), paises["pais_clube_revelador"]))
+
+    def _acumular(self, codigos: np.ndarray, pos_ano: np.ndarray, minutos: np.ndarray):
+        """
+        (clubes, minutos, presença): nomes dos clubes presentes e as
+        matrizes clubes x (anos + 1) de somas de prefixos dos minutos e do
+        número de anos com registro, com a coluna 0 zerada. A presença
+        mantém nos rankings os clubes com registros de zero minuto.
+        """
+        usados, linhas = np.unique(codigos, return_inverse=True)
+        forma = (len(usados), len(self.anos) + 1)
+        prefixo = np.zeros(forma, dtype="int64")
+        presenca = np.zeros(forma, dtype="int32")
+        np.add.at(prefixo, (linhas, pos_ano + 1), minutos)
+        np.add.at(presenca, (linhas, pos_ano + 1), 1)
+        np.cumsum(prefixo, axis=1, out=prefixo)
+        np.cumsum(presenca, axis=1, out=presenca)
+        return self._nomes[usados], prefixo, presenca
+
+    def __sizeof__(self) -> int:
+        return sum(sum(m.nbytes for m in matrizes) for matrizes in self._prefixos.values())
+
+    def anos_presentes(self, campeonato: str = None) -> np.ndarray:
+        """Anos com registros no campeonato (ou em qualquer um)."""
+        return self._anos_presentes.get(campeonato, np.array([], dtype="int64"))
+
+    def _coluna(self, ano: int) -> int:
+        """Coluna da matriz de prefixos que acumula até `ano` (inclusive)."""
+        return int(np.clip(ano - self.anos[0] + 1, 0, len(self.anos))) if len(self.anos) else 0
+
+    # -----------------------------------------------------
+    # Somas por intervalo
+    # -----------------------------------------------------
+    def soma(self, campeonato: str, ano_ini: int, ano_fim: int) -> pd.Series:
+        """Minutos entre ano_ini e ano_fim (inclusive) dos clubes com registros no intervalo."""
+        if campeonato not in self._prefixos:
+            return pd.Series([], index=pd.Index([], name="Clube Revelador"), name="Minutos", dtype="int64")
+        nomes, prefixo, presenca = self._prefixos[campeonato]
+        ini, fim = self._coluna(ano_ini - 1), self._coluna(ano_fim)
+        presentes = presenca[:, fim] > presenca[:, ini]
+        total = prefixo[presentes, fim] - prefixo[presentes, ini]
+        return pd.Series(total, index=pd.Index(nomes[presentes], name="Clube Revelador"), name="Minutos")
+
+    def ranking(self, campeonato: str, ano_ini: int, ano_fim: int) -> pd.DataFrame:
+        """
+        Ranking dos clubes com registros entre ano_ini e ano_fim: Posição,
+        Clube Revelador, Minutos e Clube Revelador (País).
+        """
+        soma = self.soma(campeonato, ano_ini, ano_fim).sort_values(ascending=False, kind="stable")
+        ranking = soma.reset_index()
+        ranking.insert(0, "Posição", np.arange(1, len(ranking) + 1))
+        ranking["Clube Revelador (País)"] = self._rotulos(ranking["Clube Revelador"])
+        return ranking
+
+    def _rotulos(self, clubes) -> list:
+        rotulos = []
+        for clube in clubes:
+            pais = self.paises.get(clube)
+            rotulos.append(clube if pais is None or pd.isna(pais) else f"{clube} ({pais})")
+        return rotulos
+
+    # -----------------------------------------------------
+    # Séries por ano
+    # -----------------------------------------------------
+    def janelas(self, campeonato: str, janela: int):
+        """
+        (clubes, minutos, presentes): matrizes clubes x anos com os minutos
+        das `janela` temporadas terminadas em cada ano do eixo e se o clube
+        tem registros nelas.
+        """
+        nomes, prefixo, presenca = self._prefixos[campeonato]
+        fim = np.arange(1, len(self.anos) + 1)
+        inicio = np.maximum(fim - janela, 0)
+        return nomes, prefixo[:, fim] - prefixo[:, inicio], presenca[:, fim] > presenca[:, inicio]
+
+    def acumulado(self, campeonato: str, desde: int):
+        """(clubes, matriz clubes x anos) com os minutos acumulados desde `desde`."""
+        nomes, prefixo, _ = self._prefixos[campeonato]
+        base = prefixo[:, [self._coluna(desde - 1)]]
+        acumulado = prefixo[:, 1:] - base
+        acumulado[:, self.anos < desde] = 0
+        return nomes, acumulado
+
+    @staticmethod
+    def posicoes(minutos: np.ndarray, presentes: np.ndarray) -> np.ndarray:
+        """
+        Posição de cada clube (linha) em cada ano (coluna) entre os clubes
+        presentes; NaN onde o clube não está presente.
+        """
+        # Ausentes vão para o fim; empates ficam na ordem alfabética das linhas
+        chave = np.where(presentes, -minutos, 1)
+        ordem = np.argsort(chave, axis=0, kind="stable")
+        posicoes = np.empty(minutos.shape, dtype="float64")
+        np.put_along_axis(posicoes, ordem, np.arange(1, minutos.shape[0] + 1, dtype="float64")[:, None], axis=0)
+        posicoes[~presentes] = np.nan
+        return posicoes
+
+    def trajetorias(self, campeonato: str, janela: int, clubes=None, desde: int = None) -> pd.DataFrame:
+        """
+        Tabela longa Clube Revelador, Ano, Minutos (na janela), Posição
+        (entre todos os clubes do campeonato) e Acumulado (desde `desde`,
+        padrão: primeiro ano), só nos anos presentes do campeonato.
+        `clubes=None` traz todos os clubes.
+        """
+        colunas = ["Clube Revelador", "Ano", "Minutos", "Posição", "Acumulado"]
+        if campeonato not in self._prefixos:
+            return pd.DataFrame(columns=colunas)
+
+        nomes, minutos, presentes = self.janelas(campeonato, janela)
+        posicoes = self.posicoes(minutos, presentes)
+        _, acumulado = self.acumulado(campeonato, self.anos[0] if desde is None else desde)
+
+        linhas = np.arange(len(nomes)) if clubes is None else np.flatnonzero(np.isin(nomes, list(clubes)))
+        anos = np.searchsorted(self.anos, self.anos_presentes(campeonato))
+        grade_l, grade_a = np.meshgrid(linhas, anos, indexing="ij")
+        grade_l, grade_a = grade_l.ravel(), grade_a.ravel()
+
+        tabela = pd.DataFrame({
+            "Clube Revelador": nomes[grade_l],
+            "Ano": self.anos[grade_a],
+            "Minutos": minutos[grade_l, grade_a],
+            "Posição": pd.array(posicoes[grade_l, grade_a], dtype="Int64"),
+            "Acumulado": acumulado[grade_l, grade_a],
+        })
+        tabela["Ano_str"] = tabela["Ano"].astype(str)
+        return tabela
+
+    def rankings_por_ano(self, campeonato: str, janela: int) -> dict:
+        """
+        Ano -> ranking das `janela` temporadas terminadas naquele ano, com
+        as colunas de agregacoes.ranking_clubes_reveladores (Posição,
+        Clube Revelador, Minutos, Pos_ant, Δ Posição e o rótulo com país).
+        Pos_ant vem do ano anterior presente no campeonato.
+        """
+        tabela = self.trajetorias(campeonato, janela)
+        if tabela.empty:
+            return {}
+
+        anos = self.anos_presentes(campeonato)
+        anterior = tabela[["Clube Revelador", "Ano", "Posição"]].rename(columns={"Posição": "Pos_ant"})
+        anterior["Ano"] = anterior["Ano"].map(dict(zip(anos[:-1], anos[1:])))
+        tabela = tabela.merge(anterior.dropna(subset=["Ano"]), on=["Clube Revelador", "Ano"], how="left")
+
+        tabela = tabela.dropna(subset=["Posição"]).sort_values(["Ano", "Posição"], kind="stable")
+        tabela["Δ Posição"] = (tabela["Pos_ant"] - tabela["Posição"]).astype("Int64")
+        tabela["Clube Revelador (País)"] = self._rotulos(tabela["Clube Revelador"])
+        colunas = ["Posição", "Clube Revelador", "Minutos", "Pos_ant", "Δ Posição", "Clube Revelador (País)"]
+        return {
+            int(ano): df[colunas].reset_index(drop=True)
+            for ano, df in tabela.groupby("Ano", sort=True)
+        }